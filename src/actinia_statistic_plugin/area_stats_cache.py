@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed result cache of the area statistics resources
+
+The results are stored in the kvdb of actinia. The cache key is computed
+from the canonicalized GeoJSON definition, the project, the user group, the
+fully qualified raster map layer name and the modification time of the
+raster map layer, so that the results of a modified raster map layer are
+never answered from the cache.
+The number of cache entries is bounded, the least recently used entries are
+evicted first.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+import valkey
+from actinia_core.core.common.config import global_config
+from actinia_core.core.common.kvdb_base import KvdbBaseInterface
+from actinia_core.core.logging_interface import log
+from actinia_core.models.response_models import create_response_from_model
+from .config import AREA_STATS_CACHE_SIZE
+from .geojson_utils import load_geojson
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class AreaStatsCacheInterface(KvdbBaseInterface):
+    """
+    The kvdb interface of the area statistics result cache
+    """
+
+    # The results are stored as JSON with the cache prefix, the sorted set
+    # with the LRU key stores the last access time of each cache key
+    cache_prefix = "STATISTIC-AREA-STATS-CACHE::"
+    lru_key = "STATISTIC-AREA-STATS-CACHE-LRU"
+
+    def __init__(self, max_entries=AREA_STATS_CACHE_SIZE):
+        KvdbBaseInterface.__init__(self)
+        self.max_entries = max_entries
+
+    def get(self, cache_key):
+        """Return the cached results and mark them as recently used
+
+        Args:
+            cache_key (str): The cache key
+
+        Returns:
+            list: The cached results or None
+        """
+        data = self.kvdb_server.get(self.cache_prefix + cache_key)
+        if data is None:
+            return None
+        self.kvdb_server.zadd(self.lru_key, {cache_key: time.time()})
+        return json.loads(data)
+
+    def set(self, cache_key, results):
+        """Store results in the cache and evict the least recently used
+        entries if the cache is full
+
+        Args:
+            cache_key (str): The cache key
+            results (list): The JSON serializable results
+        """
+        pipeline = self.kvdb_server.pipeline()
+        pipeline.set(self.cache_prefix + cache_key, json.dumps(results))
+        pipeline.zadd(self.lru_key, {cache_key: time.time()})
+        pipeline.execute()
+
+        num_entries = self.kvdb_server.zcard(self.lru_key)
+        if num_entries <= self.max_entries:
+            return
+        evicted = self.kvdb_server.zrange(
+            self.lru_key, 0, num_entries - self.max_entries - 1
+        )
+        pipeline = self.kvdb_server.pipeline()
+        for key in evicted:
+            pipeline.delete(self.cache_prefix + key.decode())
+        pipeline.zrem(self.lru_key, *evicted)
+        pipeline.execute()
+
+
+# The cache interface is connected once per process
+_cache_interface = None
+
+
+def _get_cache_interface():
+    global _cache_interface
+    if _cache_interface is None:
+        cache_interface = AreaStatsCacheInterface()
+        cache_interface.connect(
+            host=global_config.KVDB_SERVER_URL,
+            port=global_config.KVDB_SERVER_PORT,
+            password=global_config.KVDB_SERVER_PW,
+        )
+        _cache_interface = cache_interface
+    return _cache_interface
+
+
+def _canonicalize(value):
+    """Convert integer numbers into floats, so that 630000 and 630000.0 are
+    the same coordinate"""
+    if isinstance(value, dict):
+        return {key: _canonicalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_canonicalize(item) for item in value]
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def get_raster_mtime(rdc, mapset_name, raster_name):
+    """Return the last modification time of the files of a raster map layer
+    in the user or the global GRASS GIS database
+
+    Args:
+        rdc (ResourceDataContainer): The resource data container
+        mapset_name (str): The mapset of the raster map layer
+        raster_name (str): The name of the raster map layer
+
+    Returns:
+        float: The modification time or None if the raster map layer does
+               not exist
+    """
+    mapset_paths = [
+        os.path.join(
+            rdc.grass_user_data_base,
+            rdc.user_group,
+            rdc.project_name,
+            mapset_name,
+        ),
+        os.path.join(rdc.grass_data_base, rdc.project_name, mapset_name),
+    ]
+    for mapset_path in mapset_paths:
+        cellhd = os.path.join(mapset_path, "cellhd", raster_name)
+        if not os.path.isfile(cellhd):
+            continue
+        mtimes = []
+        for element in ["cellhd", "cell", "fcell", "cats", "cell_misc"]:
+            path = os.path.join(mapset_path, element, raster_name)
+            if os.path.exists(path):
+                mtimes.append(os.path.getmtime(path))
+        return max(mtimes)
+    return None
+
+
+def create_cache_key(rdc, endpoint, options=None):
+    """Compute the cache key of an area statistics request
+
+    The key contains the project and the user group, so that projects and
+    tenants with identical mapset and raster map names do not share cache
+    entries.
+
+    Args:
+        rdc (ResourceDataContainer): The resource data container with the
+                                     GeoJSON definition as request data
+        endpoint (str): The name of the statistics endpoint
+        options (dict): Request options that change the results
+
+    Returns:
+        str: The cache key or None if the request can not be cached
+    """
+    if AREA_STATS_CACHE_SIZE <= 0:
+        return None
+    geojson = load_geojson(rdc.request_data)
+    if geojson is None:
+        return None
+    mtime = get_raster_mtime(rdc, rdc.mapset_name, rdc.map_name)
+    if mtime is None:
+        return None
+
+    content = json.dumps(
+        {
+            "endpoint": endpoint,
+            "geojson": _canonicalize(geojson),
+            "project": rdc.project_name,
+            "user_group": rdc.user_group,
+            "raster": "%s@%s" % (rdc.map_name, rdc.mapset_name),
+            "mtime": mtime,
+            "options": options or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def answer_from_cache(resource, cache_key, response_model_class):
+    """Answer a request from the cache
+
+    On a cache hit the finished response is committed as the status of the
+    resource, so that no job has to be enqueued.
+
+    Args:
+        resource (ResourceBase): The resource that was preprocessed
+        cache_key (str): The cache key or None
+        response_model_class (class): The response model of the results
+
+    Returns:
+        bool: True on a cache hit
+    """
+    if cache_key is None:
+        return False
+    try:
+        results = _get_cache_interface().get(cache_key)
+    except valkey.exceptions.ValkeyError as e:
+        log.error("Unable to read the area statistics cache: %s" % str(e))
+        return False
+    if results is None:
+        return False
+
+    http_code, response_model = pickle.loads(
+        create_response_from_model(
+            response_model_class,
+            status="finished",
+            user_id=resource.user_id,
+            resource_id=resource.resource_id,
+            queue=resource.queue,
+            iteration=resource.iteration,
+            process_log=[],
+            results=results,
+            message="Processing successfully finished",
+            http_code=200,
+            orig_time=resource.orig_time,
+            orig_datetime=resource.orig_datetime,
+            status_url=resource.status_url,
+            api_info=resource.api_info,
+        )
+    )
+    response_model["cache_status"] = "hit"
+    resource.response_data = pickle.dumps([http_code, response_model])
+    resource.resource_logger.commit(
+        resource.user_id,
+        resource.resource_id,
+        resource.iteration,
+        resource.response_data,
+    )
+    return True
+
+
+def cache_finished_response(document, cache_key):
+    """Store the results of a finished response document in the cache and
+    report the cache miss in the document
+
+    Args:
+        document (bytes): The pickled response document of the processor
+        cache_key (str): The cache key or None
+
+    Returns:
+        bytes: The pickled response document
+    """
+    if cache_key is None:
+        return document
+    http_code, response_model = pickle.loads(document)
+    if response_model.get("status") != "finished":
+        return document
+    try:
+        _get_cache_interface().set(
+            cache_key, response_model.get("process_results")
+        )
+    except valkey.exceptions.ValkeyError as e:
+        log.error("Unable to write the area statistics cache: %s" % str(e))
+        return document
+    response_model["cache_status"] = "miss"
+    return pickle.dumps([http_code, response_model])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Configuration of the actinia statistic plugin
+
+The defaults can be changed with environment variables of the actinia server
+and worker processes.
+"""
+
+import os
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+# The engines to compute categorical area statistics of raster map layers:
+# "r.stats" runs GRASS GIS modules, "numpy" computes the statistics in the
+# worker process, "index" sums the precomputed tile histograms of the raster
+# map layer and falls back to "numpy" if there is no index
+AREA_STATS_ENGINES = ["r.stats", "numpy", "index"]
+AREA_STATS_ENGINE = os.environ.get(
+    "ACTINIA_STATISTIC_AREA_STATS_ENGINE", "r.stats"
+)
+
+# The engines to compute univariate area statistics of raster map layers:
+# "v.rast.stats" stores the statistics in the attribute table of the polygon
+# map, "r.univar" computes them for a zone raster of the polygons without
+# attribute table writes
+AREA_STATS_UNIVAR_ENGINES = ["v.rast.stats", "r.univar"]
+AREA_STATS_UNIVAR_ENGINE = os.environ.get(
+    "ACTINIA_STATISTIC_AREA_STATS_UNIVAR_ENGINE", "v.rast.stats"
+)
+
+# The engines to sample space-time raster datasets at points:
+# "t.rast.sample" samples each raster map layer with a separate module run,
+# "r.what" converts the points to cells of each cell grid once and queries
+# batches of raster map layers sharing the grid with a single r.what run
+STRDS_SAMPLING_ENGINES = ["t.rast.sample", "r.what"]
+STRDS_SAMPLING_ENGINE = os.environ.get(
+    "ACTINIA_STATISTIC_STRDS_SAMPLING_ENGINE", "t.rast.sample"
+)
+
+# STRDS with at least two times this number of raster map layers are split
+# into contiguous time chunks that are sampled by parallel t.rast.sample
+# processes, at most this number of processes are used per request
+STRDS_SAMPLING_CHUNK_MAPS = int(
+    os.environ.get("ACTINIA_STATISTIC_STRDS_SAMPLING_CHUNK_MAPS", "100")
+)
+STRDS_SAMPLING_PARALLEL_NPROCS = int(
+    os.environ.get(
+        "ACTINIA_STATISTIC_STRDS_SAMPLING_PARALLEL_NPROCS",
+        os.cpu_count() or 1,
+    )
+)
+
+# The approximate univariate area statistics scan the raster map layer in
+# row bands of at most this number of cells and approximate the quantiles
+# with a histogram sketch of at most this number of bins per feature
+AREA_STATS_SKETCH_BAND_CELLS = int(
+    os.environ.get(
+        "ACTINIA_STATISTIC_AREA_STATS_SKETCH_BAND_CELLS", "10000000"
+    )
+)
+AREA_STATS_SKETCH_BINS = int(
+    os.environ.get("ACTINIA_STATISTIC_AREA_STATS_SKETCH_BINS", "4096")
+)
+
+# The maximum number of entries of the area statistics result cache in the
+# kvdb of actinia, the least recently used entries are evicted. The cache is
+# disabled by default (0).
+AREA_STATS_CACHE_SIZE = int(
+    os.environ.get("ACTINIA_STATISTIC_AREA_STATS_CACHE_SIZE", "0")
+)
+
+# The maximum number of temporal indexes of STRDS that are kept in each
+# actinia process, the least recently used indexes are evicted
+TEMPORAL_INDEX_CACHE_SIZE = int(
+    os.environ.get("ACTINIA_STATISTIC_TEMPORAL_INDEX_CACHE_SIZE", "256")
+)
+
+# Categorical area statistics of regions with at least this number of cells
+# are computed in row bands by parallel r.stats processes
+AREA_STATS_PARALLEL_CELLS = int(
+    os.environ.get("ACTINIA_STATISTIC_AREA_STATS_PARALLEL_CELLS", "50000000")
+)
+AREA_STATS_PARALLEL_NPROCS = int(
+    os.environ.get(
+        "ACTINIA_STATISTIC_AREA_STATS_PARALLEL_NPROCS", os.cpu_count() or 1
+    )
+)
+
+# The number of rows and columns of the tiles of the precomputed category
+# histogram index of raster map layers
+AREA_STATS_INDEX_TILE_SIZE = int(
+    os.environ.get("ACTINIA_STATISTIC_AREA_STATS_INDEX_TILE_SIZE", "256")
+)
@@ -6,14 +6,24 @@ Actinia statistic plugin endpoint definitions
 from .ephemeral_strds_area_stats_univar import (
     AsyncEphemeralSTRDSAreaStatsUnivarResource,
     SyncEphemeralSTRDSAreaStatsUnivarResource,
+    AsyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
+    SyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
 )
 from .ephemeral_strds_area_stats import (
     AsyncEphemeralSTRDSAreaStatsResource,
     SyncEphemeralSTRDSAreaStatsResource,
+    AsyncEphemeralSTRDSAreaStatsTimeSeriesResource,
+    SyncEphemeralSTRDSAreaStatsTimeSeriesResource,
 )
 from .ephemeral_raster_area_stats import (
     AsyncEphemeralRasterAreaStatsResource,
     SyncEphemeralRasterAreaStatsResource,
+    AsyncEphemeralRasterAreaStatsBatchResource,
+    SyncEphemeralRasterAreaStatsBatchResource,
+)
+from .raster_area_stats_index import (
+    AsyncRasterAreaStatsIndexResource,
+    SyncRasterAreaStatsIndexResource,
 )
 from .ephemeral_raster_area_stats_univar import (
     AsyncEphemeralRasterAreaStatsUnivarResource,
@@ -35,6 +45,7 @@ from .vector_sampling import (
     AsyncEphemeralVectorSamplingResource,
     SyncEphemeralVectorSamplingResource,
 )
+from .sampling_results import SamplingResultNDJSONResource
 
 from actinia_core.endpoints import get_endpoint_class_name
 
@@ -74,6 +85,26 @@ def create_project_endpoints(flask_api, projects_url_part="projects"):
             SyncEphemeralSTRDSAreaStatsUnivarResource, projects_url_part
         ),
     )
+    flask_api.add_resource(
+        AsyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/strds/<string:strds_name>"
+        "/area_stats_univar_async",
+        endpoint=get_endpoint_class_name(
+            AsyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
+            projects_url_part,
+        ),
+    )
+    flask_api.add_resource(
+        SyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/strds/<string:strds_name>"
+        "/area_stats_univar_sync",
+        endpoint=get_endpoint_class_name(
+            SyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource,
+            projects_url_part,
+        ),
+    )
     flask_api.add_resource(
         AsyncEphemeralSTRDSAreaStatsResource,
         f"/{projects_url_part}/<string:project_name>/mapsets/"
@@ -92,6 +123,22 @@ def create_project_endpoints(flask_api, projects_url_part="projects"):
             SyncEphemeralSTRDSAreaStatsResource, projects_url_part
         ),
     )
+    flask_api.add_resource(
+        AsyncEphemeralSTRDSAreaStatsTimeSeriesResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/strds/<string:strds_name>/area_stats_async",
+        endpoint=get_endpoint_class_name(
+            AsyncEphemeralSTRDSAreaStatsTimeSeriesResource, projects_url_part
+        ),
+    )
+    flask_api.add_resource(
+        SyncEphemeralSTRDSAreaStatsTimeSeriesResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/strds/<string:strds_name>/area_stats_sync",
+        endpoint=get_endpoint_class_name(
+            SyncEphemeralSTRDSAreaStatsTimeSeriesResource, projects_url_part
+        ),
+    )
     flask_api.add_resource(
         AsyncEphemeralRasterAreaStatsResource,
         f"/{projects_url_part}/<string:project_name>/mapsets/"
@@ -110,6 +157,40 @@ def create_project_endpoints(flask_api, projects_url_part="projects"):
             SyncEphemeralRasterAreaStatsResource, projects_url_part
         ),
     )
+    flask_api.add_resource(
+        AsyncEphemeralRasterAreaStatsBatchResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/raster_layers/area_stats_batch_async",
+        endpoint=get_endpoint_class_name(
+            AsyncEphemeralRasterAreaStatsBatchResource, projects_url_part
+        ),
+    )
+    flask_api.add_resource(
+        SyncEphemeralRasterAreaStatsBatchResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/raster_layers/area_stats_batch_sync",
+        endpoint=get_endpoint_class_name(
+            SyncEphemeralRasterAreaStatsBatchResource, projects_url_part
+        ),
+    )
+    flask_api.add_resource(
+        AsyncRasterAreaStatsIndexResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/raster_layers/"
+        "<string:raster_name>/area_stats_index_async",
+        endpoint=get_endpoint_class_name(
+            AsyncRasterAreaStatsIndexResource, projects_url_part
+        ),
+    )
+    flask_api.add_resource(
+        SyncRasterAreaStatsIndexResource,
+        f"/{projects_url_part}/<string:project_name>/mapsets/"
+        "<string:mapset_name>/raster_layers/"
+        "<string:raster_name>/area_stats_index_sync",
+        endpoint=get_endpoint_class_name(
+            SyncRasterAreaStatsIndexResource, projects_url_part
+        ),
+    )
     flask_api.add_resource(
         AsyncEphemeralRasterAreaStatsUnivarResource,
         f"/{projects_url_part}/<string:project_name>/mapsets/"
@@ -209,3 +290,8 @@ def create_endpoints(flask_api):
     # add deprecated location and project endpoints
     create_project_endpoints(flask_api)
     create_project_endpoints(flask_api, projects_url_part="locations")
+
+    flask_api.add_resource(
+        SamplingResultNDJSONResource,
+        "/sampling_results/<string:user_id>/<string:resource_id>/ndjson",
+    )
@@ -1,27 +1,80 @@
 # -*- coding: utf-8 -*-
 """
-Compute areal categorical statistics on a raster map layer based on an input
-polygon.
+Compute areal categorical statistics on a raster map layer or a list of raster
+map layers based on an input polygon.
 """
 
-from flask import jsonify, make_response
+from flask import jsonify, make_response, request
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.kvdb_interface import enqueue_job
-from flask.json import dumps
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.grass_init import GrassInitError
+import numpy as np
+import os
 import pickle
+import re
 import tempfile
 from copy import deepcopy
-from flask_restful_swagger_2 import swagger
+from flask_restful_swagger_2 import swagger, Schema
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
 from .response_models import (
     CategoricalStatisticsResultModel,
     RasterAreaStatsResponseModel,
+    RasterAreaStatsBatchResultModel,
+    RasterAreaStatsBatchResponseModel,
+    RasterAreaZonalStatsResponseModel,
+    ZonalCategoricalStatisticsResultModel,
+)
+from .area_stats_cache import (
+    answer_from_cache,
+    cache_finished_response,
+    create_cache_key,
+)
+from .config import (
+    AREA_STATS_ENGINE,
+    AREA_STATS_ENGINES,
+    AREA_STATS_PARALLEL_CELLS,
+    AREA_STATS_PARALLEL_NPROCS,
+)
+from .geojson_utils import (
+    create_geojson_import_pc,
+    get_bbox,
+    get_feature_fid,
+    get_features,
+    get_geojson_epsg,
+    get_polygon_rings,
+    iter_feature_coverage,
+    rasterize_features,
+)
+from .raster_utils import (
+    align_region,
+    check_raster_name,
+    get_project_epsg,
+    get_project_meters,
+    grid_key,
+    read_raster_cats,
+    read_raster_header,
+    split_raster_name,
+)
+from .tile_index import (
+    classify_tiles,
+    get_header_grid,
+    get_raster_data_mtime,
+    get_tile_index_path,
+    get_tile_window,
+    get_tiles_region,
+    merge_histograms,
+    read_tile_index,
+    sum_tile_histograms,
+)
+from actinia_core.models.response_models import (
+    ProcessingErrorResponseModel,
+    ProcessLogModel,
 )
-from actinia_core.models.response_models import ProcessingErrorResponseModel
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -30,6 +83,9 @@ __maintainer__ = "Sören Gebbert"
 __email__ = "soerengebbert@googlemail.com"
 
 
+# The value of NULL cells in raster windows read by the numpy engine
+NULL_CELL = -2147483648
+
 SCHEMA_DOC = {
     "tags": ["Raster Statistics"],
     "description": "Compute areal categorical statistics on a raster map layer"
@@ -38,7 +94,21 @@ SCHEMA_DOC = {
     "be present in the GeoJSON definition. For each category the size of the "
     "occupied area, the number of pixel of the area and the percentage of the "
     "area size in relation to all other categories inclusive NULL data are "
-    "computed. Minimum required user role: user.",
+    "computed. In zonal mode the statistics are computed for each feature of "
+    "the GeoJSON FeatureCollection separately in a single raster scan; the "
+    "percentage then refers to the area of the feature. The numpy engine "
+    "counts a cell covered by overlapping features for each of them, the "
+    "r.stats engine rasterizes the features into a single zone raster and "
+    "counts such a cell for only one of the overlapping features. The "
+    "statistics are computed either with GRASS GIS modules (engine r.stats) "
+    "or in the worker process (engine numpy). The numpy engine requires an "
+    "integer raster map layer in a projected coordinate reference system and "
+    "a GeoJSON definition in the coordinate reference system of the project, "
+    "otherwise r.stats is used. The index engine sums the precomputed tile "
+    "histograms of the raster map layer and reads only the tiles crossed by "
+    "the polygon boundary, it uses the numpy engine for zonal statistics "
+    "and raster map layers without up-to-date index. r.stats computes very "
+    "large regions in parallel row bands. Minimum required user role: user.",
     "consumes": ["application/json"],
     "parameters": [
         {
@@ -72,6 +142,33 @@ SCHEMA_DOC = {
             "in": "body",
             "schema": {"type": "string"},
         },
+        {
+            "name": "zonal",
+            "description": "Set to true to compute the statistics for each "
+                           "feature of the GeoJSON FeatureCollection "
+                           "separately. The result is a list of features, "
+                           "each with its categorical statistics "
+                           "(RasterAreaZonalStatsResponseModel). Cells of "
+                           "overlapping features are counted for each "
+                           "feature only by the numpy engine.",
+            "required": False,
+            "in": "query",
+            "type": "boolean",
+            "default": False,
+        },
+        {
+            "name": "engine",
+            "description": "The engine to compute the statistics with: "
+                           "r.stats runs GRASS GIS modules, numpy rasterizes "
+                           "the polygon and counts the categories in the "
+                           "worker process, index uses the tile histogram "
+                           "index of the raster map layer. The default is "
+                           "set in the plugin configuration.",
+            "required": False,
+            "in": "query",
+            "type": "string",
+            "enum": AREA_STATS_ENGINES,
+        },
     ],
     "responses": {
         "200": {
@@ -88,6 +185,107 @@ SCHEMA_DOC = {
 }
 
 
+class RasterAreaStatsBatchModel(Schema):
+    """This schema defines the JSON input of the batch raster area stats
+    resource"""
+
+    type = "object"
+    properties = {
+        "rasters": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "A list of raster map layer names. Names without "
+            "mapset are located in the mapset of the request URL.",
+        },
+        "geojson": {
+            "type": "object",
+            "description": "GeoJSON definition of the polygon to compute the "
+            "statistics for.",
+        },
+    }
+    example = {
+        "rasters": ["landuse96_28m", "basin_50K@PERMANENT"],
+        "geojson": {
+            "type": "FeatureCollection",
+            "crs": {
+                "type": "name",
+                "properties": {"name": "urn:ogc:def:crs:EPSG::3358"},
+            },
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"fid": "swwake_10m.0"},
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [
+                                [630000.0, 215000.0],
+                                [630000.0, 228500.0],
+                                [645000.0, 228500.0],
+                                [645000.0, 215000.0],
+                                [630000.0, 215000.0],
+                            ]
+                        ],
+                    },
+                }
+            ],
+        },
+    }
+    required = ["rasters", "geojson"]
+
+
+BATCH_SCHEMA_DOC = {
+    "tags": ["Raster Statistics"],
+    "description": "Compute areal categorical statistics on a list of raster "
+    "map layers based on a single input polygon. The polygon is imported "
+    "only once and the polygon mask is reused for all raster map layers that "
+    "share the same cell grid. The input polygon must be provided as GeoJSON "
+    "content together with the list of raster map layers in the request "
+    "body. A correct coordinate reference system must be present in the "
+    "GeoJSON definition. For each raster map layer a list of categorical "
+    "statistics is computed. Minimum required user role: user.",
+    "consumes": ["application/json"],
+    "parameters": [
+        {
+            "name": "project_name",
+            "description": "The project name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the required "
+                           "raster map layers",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "rasters",
+            "description": "The list of raster map layers and the GeoJSON "
+                           "definition of the polygon to compute the "
+                           "statistics for.",
+            "required": True,
+            "in": "body",
+            "schema": RasterAreaStatsBatchModel,
+        },
+    ],
+    "responses": {
+        "200": {
+            "description": "The result of the areal raster statistical "
+                           "computation for each raster map layer",
+            "schema": RasterAreaStatsBatchResponseModel,
+        },
+        "400": {
+            "description": "The error message and a detailed log why raster"
+                           " statistic did not succeeded",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
 class AsyncEphemeralRasterAreaStatsResource(ResourceBase):
     """
     Compute areal categorical statistics on a raster map layer based on an
@@ -98,6 +296,14 @@ class AsyncEphemeralRasterAreaStatsResource(ResourceBase):
 
     def _execute(self, project_name, mapset_name, raster_name):
 
+        engine = request.args.get("engine", AREA_STATS_ENGINE)
+        if engine not in AREA_STATS_ENGINES:
+            self.create_error_response(
+                message="Unknown engine <%s>, supported engines are: %s"
+                % (engine, ", ".join(AREA_STATS_ENGINES))
+            )
+            return None
+
         rdc = self.preprocess(
             has_json=True,
             has_xml=False,
@@ -106,7 +312,19 @@ class AsyncEphemeralRasterAreaStatsResource(ResourceBase):
             map_name=raster_name,
         )
         if rdc:
-            enqueue_job(self.job_timeout, start_job, rdc)
+            zonal = request.args.get("zonal", "false").lower() == "true"
+            cache_key = create_cache_key(
+                rdc, "area_stats", {"zonal": zonal, "engine": engine}
+            )
+            rdc.set_user_data(
+                {"zonal": zonal, "engine": engine, "cache_key": cache_key}
+            )
+            if zonal is True:
+                response_model_class = RasterAreaZonalStatsResponseModel
+            else:
+                response_model_class = RasterAreaStatsResponseModel
+            if not answer_from_cache(self, cache_key, response_model_class):
+                enqueue_job(self.job_timeout, start_job, rdc)
 
         return rdc
 
@@ -145,31 +363,490 @@ class SyncEphemeralRasterAreaStatsResource(
         return make_response(jsonify(response_model), http_code)
 
 
+class AsyncEphemeralRasterAreaStatsBatchResource(ResourceBase):
+    """
+    Compute areal categorical statistics on a list of raster map layers
+    based on an input polygon, asynchronous call
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    def _execute(self, project_name, mapset_name):
+
+        rdc = self.preprocess(
+            has_json=True,
+            has_xml=False,
+            project_name=project_name,
+            mapset_name=mapset_name,
+        )
+        if rdc:
+            enqueue_job(self.job_timeout, start_batch_job, rdc)
+
+        return rdc
+
+    @swagger.doc(deepcopy(BATCH_SCHEMA_DOC))
+    def post(self, project_name, mapset_name):
+        """
+        Compute areal categorical statistics on a list of raster map layers
+        based on an input polygon asynchronously
+        """
+        self._execute(project_name, mapset_name)
+        html_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), html_code)
+
+
+class SyncEphemeralRasterAreaStatsBatchResource(
+    AsyncEphemeralRasterAreaStatsBatchResource
+):
+    """
+    Compute areal categorical statistics on a list of raster map layers
+    based on an input polygon, synchronous call
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    @swagger.doc(deepcopy(BATCH_SCHEMA_DOC))
+    def post(self, project_name, mapset_name):
+        """
+        Compute areal categorical statistics on a list of raster map layers
+        based on an input polygon synchronously
+        """
+        check = self._execute(project_name, mapset_name)
+        if check is not None:
+            http_code, response_model = self.wait_until_finish()
+        else:
+            http_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), http_code)
+
+
 def start_job(*args):
     processing = AsyncEphemeralRasterAreaStats(*args)
     processing.run()
 
 
+def _category_sort_key(cat):
+    """Sort r.stats categories like r.stats, NULL cells last, floating point
+    ranges by their lower bound"""
+    if cat == "*":
+        return (1, 0.0)
+    match = re.match(r"-?[0-9.]+(?:[eE][-+]?[0-9]+)?", cat)
+    return (0, float(match.group(0)) if match else 0.0)
+
+
 class AsyncEphemeralRasterAreaStats(EphemeralProcessing):
     def __init__(self, *args):
         EphemeralProcessing.__init__(self, *args)
         self.response_model_class = RasterAreaStatsResponseModel
 
-    def _execute(self):
+    def _send_to_database(self, document, final=False):
+        """Store the final results in the area statistics cache"""
+        if final is True and self.rdc.user_data:
+            document = cache_finished_response(
+                document, self.rdc.user_data.get("cache_key")
+            )
+        EphemeralProcessing._send_to_database(self, document, final)
 
-        self._setup()
+    def _import_polygon(self, geojson):
+        """Import the GeoJSON definition as vector map layer *polygon* into
+        the temporary GRASS environment
 
-        raster_name = self.map_name
-        self.required_mapsets.append(self.mapset_name)
-        gml_file = tempfile.NamedTemporaryFile(
+        Args:
+            geojson (dict): The GeoJSON definition of the polygon
+        """
+        import_pc, _ = create_geojson_import_pc(
+            geojson,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "polygon",
+            "v_import_1",
+        )
+        pc = {"list": [import_pc], "version": "1"}
+
+        # Run the import, ignore region settings
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+    def _create_region_pc(self, raster_name, region_id):
+        """Create the process chain entry that sets the region to the polygon
+        aligned to the raster map layer
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            region_id (str): The process id of the g.region call
+
+        Returns:
+            dict: The process chain entry
+        """
+        return {
+            "id": region_id,
+            "module": "g.region",
+            "inputs": [
+                {
+                    "param": "vector",
+                    "value": "polygon"
+                },
+                {
+                    "param": "align",
+                    "value": raster_name
+                }
+            ],
+            "flags": "p",
+            "superquiet": True
+        }
+
+    def _create_mask_pc_list(self, raster_name, region_id, mask_id):
+        """Create the process chain entries that set the region to the
+        polygon aligned to the raster map layer and create the polygon mask
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            region_id (str): The process id of the g.region call
+            mask_id (str): The process id of the r.mask call
+
+        Returns:
+            list: The process chain entries
+        """
+        return [
+            self._create_region_pc(raster_name, region_id),
+            {
+                "id": mask_id,
+                "module": "r.mask",
+                "inputs": [
+                    {
+                        "param": "vector",
+                        "value": "polygon"
+                    }
+                ],
+                "overwrite": True,
+                "superquiet": True
+            },
+        ]
+
+    def _create_r_stats_pc(self, raster_name, result_file_name, stats_id):
+        """Create the r.stats process chain entry that computes the
+        categorical statistics of the raster map layer
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            result_file_name (str): The output file of r.stats
+            stats_id (str): The process id of the r.stats call
+
+        Returns:
+            dict: The process chain entry
+        """
+        return {
+            "id": stats_id,
+            "module": "r.stats",
+            "inputs": [
+                {
+                    "param": "input",
+                    "value": raster_name
+                },
+                {
+                    "param": "separator",
+                    "value": "|"
+                }
+            ],
+            "outputs": [
+                {
+                    "param": "output",
+                    "value": result_file_name
+                }
+            ],
+            "flags": "acpl",
+            "superquiet": True
+        }
+
+    def _run_area_stats_pc(self, pc):
+        """Run the area statistics and check for correct region settings"""
+        self.skip_region_check = False
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+    def _read_region(self):
+        """Read the current computational region
+
+        Returns:
+            dict: The g.region -g output
+        """
+        try:
+            _, stdout_buff, _ = self.ginit.run_module("g.region", ["-g"])
+        except GrassInitError as e:
+            raise AsyncProcessError(
+                "Unable to read the computational region: %s" % str(e)
+            )
+        region = {}
+        for line in stdout_buff.split():
+            if "=" in line:
+                key, value = line.split("=", 1)
+                region[key] = value
+        return region
+
+    def _compute_r_stats(self, raster_name, stats_id):
+        """Compute the categorical statistics of the raster map layer in the
+        current region with the current mask
+
+        Regions with at least AREA_STATS_PARALLEL_CELLS cells are split into
+        row bands that are computed in parallel.
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            stats_id (str): The process id of the r.stats call
+
+        Returns:
+            list: A list of CategoricalStatisticsResultModel
+        """
+        region = self._read_region()
+        nprocs = min(AREA_STATS_PARALLEL_NPROCS, int(region["rows"]))
+        if int(region["cells"]) >= AREA_STATS_PARALLEL_CELLS and nprocs > 1:
+            return self._compute_parallel_r_stats(
+                raster_name, stats_id, region, nprocs
+            )
+
+        result_file = tempfile.NamedTemporaryFile(
             dir=self.temp_file_path, delete=False
         )
+        pc = {
+            "list": [
+                self._create_r_stats_pc(
+                    raster_name, result_file.name, stats_id
+                )
+            ],
+            "version": "1",
+        }
+        self._run_area_stats_pc(pc)
+        output_list = self._parse_r_stats(result_file.name)
+        result_file.close()
+
+        return output_list
+
+    def _compute_parallel_r_stats(self, raster_name, stats_id, region, nprocs):
+        """Split the current region into row bands and run r.stats -acl for
+        each band in a parallel process
+
+        Each band is stored as named region and selected with WIND_OVERRIDE.
+        The cell counts and areas of the bands are merged and the percentage
+        is computed from the merged total.
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            stats_id (str): The prefix of the band process ids
+            region (dict): The current region from _read_region()
+            nprocs (int): The number of bands
+
+        Returns:
+            list: A list of CategoricalStatisticsResultModel
+        """
+        # Check the region against the cell limit of the user
+        self.skip_region_check = False
+        self._check_reset_region()
 
-        tmp_file = open(gml_file.name, "w")
+        north = float(region["n"])
+        nsres = float(region["nsres"])
+        rows = np.linspace(0, int(region["rows"]), nprocs + 1).round()
 
-        data = dumps(self.request_data)
-        tmp_file.write(data)
-        tmp_file.close()
+        wind_override = os.environ.get("WIND_OVERRIDE")
+        bands = []
+        try:
+            for band in range(nprocs):
+                band_id = "%s_band_%i" % (stats_id, band + 1)
+                try:
+                    self.ginit.run_module(
+                        "g.region",
+                        [
+                            "n=%.17g" % (north - rows[band] * nsres),
+                            "s=%.17g" % (north - rows[band + 1] * nsres),
+                            "save=" + band_id,
+                            "-u",
+                            "--o",
+                        ],
+                    )
+                except GrassInitError as e:
+                    raise AsyncProcessError(
+                        "Unable to create the region of band <%s>: %s"
+                        % (band_id, str(e))
+                    )
+
+                result_file = tempfile.NamedTemporaryFile(
+                    dir=self.temp_file_path, delete=False
+                )
+                log_file = tempfile.TemporaryFile(dir=self.temp_file_path)
+                parameter = [
+                    "input=" + raster_name,
+                    "separator=|",
+                    "output=" + result_file.name,
+                    "-acl",
+                    "--o",
+                    "--q",
+                ]
+                os.environ["WIND_OVERRIDE"] = band_id
+                proc = self.ginit.run_module(
+                    "r.stats",
+                    parameter,
+                    raw=True,
+                    stdout=log_file,
+                    stderr=log_file,
+                )
+                bands.append((band_id, proc, parameter, result_file, log_file))
+        except Exception:
+            for _, proc, _, _, _ in bands:
+                proc.kill()
+            raise
+        finally:
+            if wind_override is None:
+                os.environ.pop("WIND_OVERRIDE", None)
+            else:
+                os.environ["WIND_OVERRIDE"] = wind_override
+
+        categories = {}
+        try:
+            for band_id, proc, parameter, result_file, log_file in bands:
+                run_time = self._wait_for_process(
+                    "r.stats", parameter, proc, 0.05
+                )
+                proc.wait()
+                log_file.seek(0)
+                log = log_file.read().decode()
+                log_file.close()
+                self.module_output_log.append(
+                    ProcessLogModel(
+                        id=band_id,
+                        executable="r.stats",
+                        parameter=parameter,
+                        return_code=proc.returncode,
+                        stdout="",
+                        stderr=log.split("\n"),
+                        run_time=run_time,
+                    )
+                )
+                if proc.returncode != 0:
+                    raise AsyncProcessError(
+                        "Error while running executable <r.stats> for band "
+                        "<%s>" % band_id
+                    )
+
+                for line in open(result_file.name, "r").readlines():
+                    cat, name, area, cell_count = line.strip().split("|")
+                    entry = categories.setdefault(cat, [name, 0.0, 0])
+                    entry[1] += float(area)
+                    entry[2] += int(cell_count)
+                result_file.close()
+        except Exception:
+            for _, proc, _, _, _ in bands:
+                if proc.poll() is None:
+                    proc.kill()
+            raise
+
+        total = sum([entry[2] for entry in categories.values()])
+        output_list = []
+        for cat in sorted(categories, key=_category_sort_key):
+            name, area, cell_count = categories[cat]
+            output_list.append(
+                CategoricalStatisticsResultModel(
+                    cat=cat,
+                    name=name,
+                    area=area,
+                    cell_count=cell_count,
+                    percent=100.0 * cell_count / total,
+                )
+            )
+
+        return output_list
+
+    @staticmethod
+    def _parse_zonal_r_stats(result_file_name, features):
+        """Parse the r.stats -acl output file of the zones and the raster map
+        layer and group the categorical statistics by zone
+
+        The percentage of each category is computed in relation to the number
+        of cells of the zone.
+
+        Args:
+            result_file_name (str): The output file of r.stats
+            features (list): The GeoJSON features, the zone category n
+                             refers to the feature n - 1
+
+        Returns:
+            list: A list of ZonalCategoricalStatisticsResultModel
+        """
+        result = open(result_file_name, "r").readlines()
+
+        zones = {}
+        for line in result:
+            stat_list = line.strip().split("|")
+            zone = stat_list[0]
+            # Cells outside of all features
+            if zone == "*":
+                continue
+            zones.setdefault(zone, []).append(stat_list[2:])
+
+        output_list = []
+        for zone in sorted(zones, key=int):
+            stats = zones[zone]
+            total = sum([int(stat_list[3]) for stat_list in stats])
+            statistics = []
+            for stat_list in stats:
+                cell_count = int(stat_list[3])
+                statistics.append(
+                    CategoricalStatisticsResultModel(
+                        cat=stat_list[0],
+                        name=stat_list[1],
+                        area=float(stat_list[2]),
+                        cell_count=cell_count,
+                        percent=100.0 * cell_count / total,
+                    )
+                )
+
+            entry = {"cat": zone, "statistics": statistics}
+            fid = get_feature_fid(features, zone)
+            if fid is not None:
+                entry["fid"] = fid
+            output_list.append(ZonalCategoricalStatisticsResultModel(**entry))
+
+        return output_list
+
+    @staticmethod
+    def _parse_r_stats(result_file_name):
+        """Parse the r.stats -acpl output file
+
+        Args:
+            result_file_name (str): The output file of r.stats
+
+        Returns:
+            list: A list of CategoricalStatisticsResultModel
+        """
+        result = open(result_file_name, "r").readlines()
+
+        output_list = []
+        for line in result:
+            stat_list = line.strip().split("|")
+
+            output_list.append(
+                CategoricalStatisticsResultModel(
+                    cat=stat_list[0],
+                    name=stat_list[1],
+                    area=float(stat_list[2]),
+                    cell_count=int(stat_list[3]),
+                    percent=float(stat_list[4].split("%")[0]),
+                )
+            )
+
+        return output_list
+
+    def _execute_zonal(self, raster_name):
+        """Compute the categorical statistics for each feature of the
+        imported polygon map with a single r.stats run of the zone raster
+        and the raster map layer
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+        """
+        self.response_model_class = RasterAreaZonalStatsResponseModel
 
         result_file = tempfile.NamedTemporaryFile(
             dir=self.temp_file_path, delete=False
@@ -177,25 +854,57 @@ class AsyncEphemeralRasterAreaStats(EphemeralProcessing):
 
         pc = {
             "list": [
+                self._create_region_pc(raster_name, "g_region_2"),
                 {
-                    "id": "v_import_1",
-                    "module": "v.import",
-                    "inputs": [{"param": "input", "value": gml_file.name}],
-                    "outputs": [{"param": "output", "value": "polygon"}],
+                    "id": "v_to_rast_3",
+                    "module": "v.to.rast",
+                    "inputs": [
+                        {"param": "input", "value": "polygon"},
+                        {"param": "type", "value": "area"},
+                        {"param": "use", "value": "cat"},
+                    ],
+                    "outputs": [{"param": "output", "value": "zones"}],
+                    "superquiet": True
+                },
+                {
+                    "id": "r_stats_4",
+                    "module": "r.stats",
+                    "inputs": [
+                        {"param": "input", "value": "zones," + raster_name},
+                        {"param": "separator", "value": "|"},
+                    ],
+                    "outputs": [
+                        {"param": "output", "value": result_file.name}
+                    ],
+                    "flags": "acl",
                     "superquiet": True
                 },
             ],
             "version": "1",
         }
+        self._run_area_stats_pc(pc)
 
-        # Run the import, ignore region settings
-        self.skip_region_check = True
-        process_list = (
-            self._create_temporary_grass_environment_and_process_list(
-                process_chain=pc, skip_permission_check=True
-            )
+        features = self.request_data.get("features", [self.request_data])
+        self.module_results = self._parse_zonal_r_stats(
+            result_file.name, features
+        )
+
+        result_file.close()
+
+    def _read_raster_window(self, raster_name, region):
+        """Read the cells of the raster map layer in the region into a numpy
+        array, NULL cells are set to NULL_CELL
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            region (dict): The region from align_region()
+
+        Returns:
+            numpy.ndarray: The int32 cell array of shape (rows, cols)
+        """
+        output_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=False
         )
-        self._execute_process_list(process_list)
 
         pc = {
             "list": [
@@ -203,79 +912,442 @@ class AsyncEphemeralRasterAreaStats(EphemeralProcessing):
                     "id": "g_region_2",
                     "module": "g.region",
                     "inputs": [
-                        {
-                            "param": "vector",
-                            "value": "polygon"
-                        },
-                        {
-                            "param": "align",
-                            "value": raster_name + "@" + self.mapset_name
-                        }
+                        {"param": "n", "value": repr(region["north"])},
+                        {"param": "s", "value": repr(region["south"])},
+                        {"param": "e", "value": repr(region["east"])},
+                        {"param": "w", "value": repr(region["west"])},
+                        {"param": "nsres", "value": repr(region["nsres"])},
+                        {"param": "ewres", "value": repr(region["ewres"])},
                     ],
-                    "flags": "p",
                     "superquiet": True
                 },
                 {
-                    "id": "r_mask_3",
-                    "module": "r.mask",
-                    "inputs": [
-                        {
-                            "param": "vector",
-                            "value": "polygon"
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "r_stats_4",
-                    "module": "r.stats",
+                    "id": "r_out_bin_3",
+                    "module": "r.out.bin",
                     "inputs": [
-                        {
-                            "param": "input",
-                            "value": raster_name + "@" + self.mapset_name
-                        },
-                        {
-                            "param": "separator",
-                            "value": "|"
-                        }
+                        {"param": "input", "value": raster_name},
+                        {"param": "null", "value": str(NULL_CELL)},
+                        {"param": "bytes", "value": "4"},
                     ],
                     "outputs": [
-                        {
-                            "param": "output",
-                            "value": result_file.name
-                        }
+                        {"param": "output", "value": output_file.name}
                     ],
-                    "flags": "acpl",
+                    "overwrite": True,
                     "superquiet": True
                 },
             ],
             "version": "1",
         }
+        self._run_area_stats_pc(pc)
 
-        # Run the area statistics and check for correct region settings
-        self.skip_region_check = False
-        process_list = self._validate_process_chain(
-            process_chain=pc, skip_permission_check=True
-        )
-        self._execute_process_list(process_list)
+        values = np.fromfile(output_file.name, dtype=np.int32)
+        output_file.close()
 
-        result = open(result_file.name, "r").readlines()
+        return values.reshape(region["rows"], region["cols"])
 
-        output_list = []
-        for line in result:
-            stat_list = line.strip().split("|")
+    @staticmethod
+    def _count_categories(values):
+        """Count the cells of each category with bincount, NULL cells are
+        counted separately
+
+        Args:
+            values (numpy.ndarray): The cell values
+
+        Returns:
+            tuple: (categories, counts, null_count)
+        """
+        valid = values[values != NULL_CELL].astype(np.int64)
+        null_count = values.size - valid.size
+        if valid.size == 0:
+            return np.array([], dtype=np.int64), np.array([]), null_count
 
+        minimum = valid.min()
+        value_range = valid.max() - minimum + 1
+        # Sparse categories with a huge value range would need a huge
+        # bincount array
+        if value_range > max(valid.size, 1 << 20):
+            categories, counts = np.unique(valid, return_counts=True)
+            return categories, counts, null_count
+
+        counts = np.bincount(valid - minimum, minlength=value_range)
+        categories = np.flatnonzero(counts)
+        return categories + minimum, counts[categories], null_count
+
+    @staticmethod
+    def _create_numpy_statistics(
+        categories, counts, null_count, total, cell_area, labels
+    ):
+        """Create the categorical statistics from the category cell counts
+        in the order of r.stats with NULL cells last
+
+        Args:
+            categories (numpy.ndarray): The categories
+            counts (numpy.ndarray): The number of cells of each category
+            null_count (int): The number of NULL cells
+            total (int): The number of cells the percentage refers to
+            cell_area (float): The area of a single cell in square meters
+            labels (dict): The category labels
+
+        Returns:
+            list: A list of CategoricalStatisticsResultModel
+        """
+        categories = [(str(cat), labels.get(cat, "")) for cat in categories]
+        counts = [int(count) for count in counts]
+        if null_count > 0:
+            categories.append(("*", "no data"))
+            counts.append(int(null_count))
+
+        output_list = []
+        for (cat, name), cell_count in zip(categories, counts):
             output_list.append(
                 CategoricalStatisticsResultModel(
-                    cat=stat_list[0],
-                    name=stat_list[1],
-                    area=float(stat_list[2]),
-                    cell_count=int(stat_list[3]),
-                    percent=float(stat_list[4].split("%")[0]),
+                    cat=cat,
+                    name=name,
+                    area=cell_count * cell_area,
+                    cell_count=cell_count,
+                    percent=100.0 * cell_count / total,
                 )
             )
 
+        return output_list
+
+    def _check_numpy_support(self, header, name, mapset, engine):
+        """Check if the raster map layer and the GeoJSON definition can be
+        processed in the worker process
+
+        Args:
+            header (dict): The raster header from read_raster_header()
+            name (str): The name of the raster map layer
+            mapset (str): The mapset of the raster map layer
+            engine (str): The name of the engine for the log message
+
+        Returns:
+            bool: False if r.stats must be used
+        """
+        geojson_epsg = get_geojson_epsg(self.request_data)
+        project_epsg = get_project_epsg(self.temp_project_path)
+        # Latitude-longitude cells have no constant area, floating point
+        # maps have no categories and a different GeoJSON crs needs
+        # v.import for reprojection
+        if (
+            header["proj"] == 3
+            or header["format"] < 0
+            or geojson_epsg is None
+            or geojson_epsg != project_epsg
+        ):
+            self.message_logger.info(
+                "The %s engine does not support raster map layer <%s@%s>"
+                " with GeoJSON crs EPSG:%s, using r.stats"
+                % (engine, name, mapset, geojson_epsg)
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _get_feature_rings(features):
+        """Return the rings of each feature
+
+        Raises:
+            AsyncProcessError: If the features contain no polygon
+        """
+        feature_rings = [
+            get_polygon_rings(feature.get("geometry")) for feature in features
+        ]
+        if get_bbox(feature_rings) is None:
+            raise AsyncProcessError(
+                "The GeoJSON definition contains no polygon"
+            )
+        return feature_rings
+
+    def _execute_numpy(self, name, mapset, zonal):
+        """Compute the categorical statistics in the worker process
+
+        The aligned raster window is read into a numpy array, the polygon is
+        rasterized in memory and the categories are counted with numpy.
+
+        Args:
+            name (str): The name of the raster map layer
+            mapset (str): The mapset of the raster map layer
+            zonal (bool): Compute the statistics for each feature
+
+        Returns:
+            bool: False if the numpy engine can not be used for the raster
+                  map layer and the GeoJSON definition
+        """
+        header = read_raster_header(self.temp_project_path, mapset, name)
+        if not self._check_numpy_support(header, name, mapset, "numpy"):
+            return False
+
+        features = get_features(self.request_data)
+        feature_rings = self._get_feature_rings(features)
+        region = align_region(header, get_bbox(feature_rings))
+        num_cells = region["rows"] * region["cols"]
+        if num_cells > self.cell_limit:
+            raise AsyncProcessError(
+                "Region too large for the numpy engine [num_cells: %d, "
+                "cell limit: %d]" % (num_cells, self.cell_limit)
+            )
+
+        values = self._read_raster_window(name + "@" + mapset, region)
+
+        cell_area = (
+            region["nsres"]
+            * region["ewres"]
+            * get_project_meters(self.temp_project_path) ** 2
+        )
+        labels = read_raster_cats(self.temp_project_path, mapset, name)
+
+        if zonal is False:
+            # Cells outside of the polygon are NULL like with r.mask
+            zones = rasterize_features(feature_rings, region)
+            values[zones == 0] = NULL_CELL
+            categories, counts, null_count = self._count_categories(values)
+            self.module_results = self._create_numpy_statistics(
+                categories, counts, null_count, values.size, cell_area, labels
+            )
+            return True
+
+        self.response_model_class = RasterAreaZonalStatsResponseModel
+        # Each feature is counted with its own coverage, so cells of
+        # overlapping features are counted for all of them
+        output_list = []
+        for zone, row_offset, col_offset, coverage in iter_feature_coverage(
+            feature_rings, region
+        ):
+            zone_values = values[
+                row_offset:row_offset + coverage.shape[0],
+                col_offset:col_offset + coverage.shape[1],
+            ][coverage]
+            if zone_values.size == 0:
+                continue
+            categories, counts, null_count = self._count_categories(
+                zone_values
+            )
+            statistics = self._create_numpy_statistics(
+                categories,
+                counts,
+                null_count,
+                zone_values.size,
+                cell_area,
+                labels,
+            )
+            entry = {"cat": str(zone), "statistics": statistics}
+            fid = get_feature_fid(features, zone)
+            if fid is not None:
+                entry["fid"] = fid
+            output_list.append(ZonalCategoricalStatisticsResultModel(**entry))
+
         self.module_results = output_list
+        return True
 
-        gml_file.close()
-        result_file.close()
+    def _execute_index(self, name, mapset):
+        """Compute the categorical statistics from the tile index of the
+        raster map layer
+
+        The histograms of the tiles that are completely inside of the
+        polygon are summed up, only the cells of the tiles crossed by the
+        polygon boundary are counted. The boundary tiles are read with a
+        single r.out.bin call.
+
+        Args:
+            name (str): The name of the raster map layer
+            mapset (str): The mapset of the raster map layer
+
+        Returns:
+            bool: False if the raster map layer has no up-to-date tile index
+                  or if the index engine can not be used for the raster map
+                  layer and the GeoJSON definition
+        """
+        header = read_raster_header(self.temp_project_path, mapset, name)
+        if not self._check_numpy_support(header, name, mapset, "index"):
+            return False
+
+        mapset_path = os.path.join(self.temp_project_path, mapset)
+        index = read_tile_index(
+            get_tile_index_path(
+                self.config.GRASS_RESOURCE_DIR,
+                self.user_group,
+                self.project_name,
+                mapset,
+                name,
+            ),
+            get_header_grid(header),
+            get_raster_data_mtime(mapset_path, name),
+        )
+        if index is None:
+            self.message_logger.info(
+                "Raster map layer <%s@%s> has no up-to-date tile index, "
+                "using the numpy engine" % (name, mapset)
+            )
+            return False
+
+        feature_rings = self._get_feature_rings(
+            get_features(self.request_data)
+        )
+        region = align_region(header, get_bbox(feature_rings))
+        window = get_tile_window(index, region)
+        inside, boundary = classify_tiles(feature_rings, index, window)
+
+        categories, counts = sum_tile_histograms(index, window, inside)
+        categories_list = [categories]
+        counts_list = [counts]
+
+        boundary_region, boundary_cells = get_tiles_region(
+            index, window, boundary
+        )
+        if boundary_region is not None:
+            num_cells = boundary_region["rows"] * boundary_region["cols"]
+            if num_cells > self.cell_limit:
+                raise AsyncProcessError(
+                    "Region too large for the index engine [num_cells: %d, "
+                    "cell limit: %d]" % (num_cells, self.cell_limit)
+                )
+            values = self._read_raster_window(
+                name + "@" + mapset, boundary_region
+            )
+            zones = rasterize_features(feature_rings, boundary_region)
+            categories, counts, _ = self._count_categories(
+                values[boundary_cells & (zones > 0)]
+            )
+            categories_list.append(categories)
+            counts_list.append(counts)
+
+        categories, counts = merge_histograms(categories_list, counts_list)
+        # Cells of the region outside of the polygon are NULL like with
+        # r.mask
+        total = region["rows"] * region["cols"]
+        cell_area = (
+            region["nsres"]
+            * region["ewres"]
+            * get_project_meters(self.temp_project_path) ** 2
+        )
+        self.module_results = self._create_numpy_statistics(
+            categories,
+            counts,
+            total - int(counts.sum()),
+            total,
+            cell_area,
+            read_raster_cats(self.temp_project_path, mapset, name),
+        )
+        return True
+
+    def _execute(self):
+
+        self._setup()
+
+        raster_name = self.map_name
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+
+        user_data = self.rdc.user_data or {}
+        zonal = user_data.get("zonal") is True
+        engine = user_data.get("engine", AREA_STATS_ENGINE)
+
+        # The tile index has no zones, zonal statistics use the numpy engine
+        if engine == "index" and zonal is False:
+            if self._execute_index(raster_name, self.mapset_name):
+                return
+        if engine in ["numpy", "index"]:
+            if self._execute_numpy(raster_name, self.mapset_name, zonal):
+                return
+
+        self._import_polygon(self.request_data)
+
+        if zonal is True:
+            self._execute_zonal(raster_name + "@" + self.mapset_name)
+            return
+
+        raster_name = raster_name + "@" + self.mapset_name
+        pc = {
+            "list": self._create_mask_pc_list(
+                raster_name, "g_region_2", "r_mask_3"
+            ),
+            "version": "1",
+        }
+        self._run_area_stats_pc(pc)
+
+        self.module_results = self._compute_r_stats(raster_name, "r_stats_4")
+
+
+def start_batch_job(*args):
+    processing = AsyncEphemeralRasterAreaStatsBatch(*args)
+    processing.run()
+
+
+class AsyncEphemeralRasterAreaStatsBatch(AsyncEphemeralRasterAreaStats):
+    """
+    Compute areal categorical statistics on a list of raster map layers
+    based on a single imported polygon.
+
+    The polygon mask is computed only once for all raster map layers that
+    share the same cell grid.
+    """
+
+    def __init__(self, *args):
+        AsyncEphemeralRasterAreaStats.__init__(self, *args)
+        self.response_model_class = RasterAreaStatsBatchResponseModel
+
+    def _execute(self):
+
+        self._setup()
+
+        rasters = self.request_data.get("rasters")
+        geojson = self.request_data.get("geojson")
+
+        if not rasters:
+            raise AsyncProcessError("Empty raster map layer list")
+        if not geojson:
+            raise AsyncProcessError("Missing GeoJSON polygon definition")
+
+        # The raster map layers are identified by their fully qualified
+        # names, the same name can exist in different mapsets
+        raster_list = []
+        for raster in rasters:
+            name, mapset = split_raster_name(raster, self.mapset_name)
+            check_raster_name(name, mapset)
+            if mapset not in self.required_mapsets:
+                self.required_mapsets.append(mapset)
+            raster_list.append((raster, name, mapset))
+
+        self._create_temporary_grass_environment()
+        self._import_polygon(geojson)
+
+        # Group the raster map layers by cell grid, so that region and mask
+        # are computed only once per grid
+        grids = {}
+        for name, mapset in dict.fromkeys(
+            (name, mapset) for _, name, mapset in raster_list
+        ):
+            header = read_raster_header(self.temp_project_path, mapset, name)
+            grids.setdefault(grid_key(header), []).append((name, mapset))
+
+        statistics = {}
+        count = 1
+        for grid_rasters in grids.values():
+            name, mapset = grid_rasters[0]
+            pc = {
+                "list": self._create_mask_pc_list(
+                    name + "@" + mapset,
+                    "g_region_%i" % (count + 1),
+                    "r_mask_%i" % (count + 2),
+                ),
+                "version": "1",
+            }
+            self._run_area_stats_pc(pc)
+            count += 2
+            for name, mapset in grid_rasters:
+                count += 1
+                statistics[name + "@" + mapset] = self._compute_r_stats(
+                    name + "@" + mapset, "r_stats_%i" % count
+                )
+
+        output_list = []
+        for raster, name, mapset in raster_list:
+            output_list.append(
+                RasterAreaStatsBatchResultModel(
+                    raster_name=raster,
+                    statistics=statistics[name + "@" + mapset],
+                )
+            )
+
+        self.module_results = output_list
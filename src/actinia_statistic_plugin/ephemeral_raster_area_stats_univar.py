@@ -4,11 +4,11 @@ Compute areal univariate statistics on a raster map layer based on an input
 polygon.
 """
 
-from flask.json import dumps
+import numpy as np
 import pickle
 import tempfile
 from copy import deepcopy
-from flask import jsonify, make_response
+from flask import jsonify, make_response, request
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
@@ -17,10 +17,49 @@ from actinia_core.core.common.kvdb_interface import enqueue_job
 from flask_restful_swagger_2 import swagger
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.core.grass_init import GrassInitError
 from .response_models import (
     AreaUnivarResultModel,
     RasterAreaUnivarStatsResponseModel,
 )
+from .area_stats_cache import (
+    answer_from_cache,
+    cache_finished_response,
+    create_cache_key,
+)
+from .config import (
+    AREA_STATS_SKETCH_BAND_CELLS,
+    AREA_STATS_SKETCH_BINS,
+    AREA_STATS_UNIVAR_ENGINE,
+    AREA_STATS_UNIVAR_ENGINES,
+)
+from .geojson_utils import (
+    create_geojson_import_pc,
+    get_bbox,
+    get_feature_fid,
+    get_features,
+    get_geojson_epsg,
+    get_polygon_rings,
+    iter_feature_coverage,
+    load_geojson,
+)
+from .moments import MomentAccumulator
+from .quantile_sketch import QuantileSketch
+from .raster_utils import (
+    align_region,
+    get_project_epsg,
+    read_raster_header,
+    split_raster_name,
+)
+from .univar_methods import (
+    R_UNIVAR_COLUMNS,
+    UNIVAR_METHODS,
+    UNIVAR_QUERY_PARAMETERS,
+    format_percentile,
+    parse_univar_options,
+    plan_univar,
+)
 from actinia_core.models.response_models import ProcessingErrorResponseModel
 
 __license__ = "GPLv3"
@@ -35,7 +74,14 @@ SCHEMA_DOC = {
     "description": "Compute areal univariate statistics on a raster map layer "
     "based on an input polygon. The input polygon must be provided as GeoJSON "
     "content in the request body. A correct coordinate reference system must "
-    "be present in the GeoJSON definition. Minimum required user role: user.",
+    "be present in the GeoJSON definition. The statistics are computed "
+    "either with v.rast.stats in the attribute table of the polygon map "
+    "(engine v.rast.stats) or with r.univar for a zone raster of the "
+    "polygons (engine r.univar), which avoids the attribute table writes. "
+    "Overlapping polygons are only supported by v.rast.stats. Only the "
+    "requested methods are computed, the cell values are sorted only if "
+    "order statistics like the median are requested. "
+    "Minimum required user role: user.",
     "consumes": ["application/json"],
     "parameters": [
         {
@@ -69,7 +115,20 @@ SCHEMA_DOC = {
             "in": "body",
             "schema": {"type": "string"},
         },
-    ],
+        {
+            "name": "engine",
+            "description": "The engine to compute the statistics with: "
+                           "v.rast.stats writes the statistics into the "
+                           "attribute table of the polygon map, r.univar "
+                           "computes them for a zone raster of the polygons. "
+                           "The default is set in the plugin configuration.",
+            "required": False,
+            "in": "query",
+            "type": "string",
+            "enum": AREA_STATS_UNIVAR_ENGINES,
+        },
+    ]
+    + deepcopy(UNIVAR_QUERY_PARAMETERS),
     "responses": {
         "200": {
             "description": "The result of the areal raster statistical "
@@ -92,6 +151,19 @@ class AsyncEphemeralRasterAreaStatsUnivarResource(ResourceBase):
 
     def _execute(self, project_name, mapset_name, raster_name):
 
+        engine = request.args.get("engine", AREA_STATS_UNIVAR_ENGINE)
+        if engine not in AREA_STATS_UNIVAR_ENGINES:
+            self.create_error_response(
+                message="Unknown engine <%s>, supported engines are: %s"
+                % (engine, ", ".join(AREA_STATS_UNIVAR_ENGINES))
+            )
+            return None
+        try:
+            options = parse_univar_options(request.args)
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return None
+
         rdc = self.preprocess(
             has_json=True,
             has_xml=False,
@@ -100,6 +172,16 @@ class AsyncEphemeralRasterAreaStatsUnivarResource(ResourceBase):
             map_name=raster_name,
         )
         if rdc:
+            cache_key = create_cache_key(
+                rdc, "area_stats_univar", dict(options, engine=engine)
+            )
+            rdc.set_user_data(
+                dict(options, engine=engine, cache_key=cache_key)
+            )
+            if answer_from_cache(
+                self, cache_key, RasterAreaUnivarStatsResponseModel
+            ):
+                return rdc
             # # for debugging
             # processing = AsyncEphemeralRasterAreaStatsUnivar(rdc)
             # processing.run()
@@ -149,23 +231,31 @@ class AsyncEphemeralRasterAreaStatsUnivar(EphemeralProcessing):
         EphemeralProcessing.__init__(self, *args)
         self.response_model_class = RasterAreaUnivarStatsResponseModel
 
-    def _execute(self):
+    def _send_to_database(self, document, final=False):
+        """Store the final results in the area statistics cache"""
+        if final is True and self.rdc.user_data:
+            document = cache_finished_response(
+                document, self.rdc.user_data.get("cache_key")
+            )
+        EphemeralProcessing._send_to_database(self, document, final)
 
-        self._setup()
+    def _compute_r_univar(self, raster_name, features, methods):
+        """Compute the univariate statistics of each polygon with a zonal
+        r.univar run of the polygon zone raster, the polygon categories are
+        the zones
 
-        raster_name = self.map_name
-        self.required_mapsets.append(self.mapset_name)
-        gml_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
-        )
+        The extended r.univar computation that sorts all cell values is only
+        used if order statistics are requested.
 
-        tmp_file = open(gml_file.name, "w")
-        if isinstance(self.request_data, str):
-            tmp_file.write(str(self.request_data).strip())
-        else:
-            tmp_file.write(dumps(self.request_data))
-        tmp_file.close()
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            features (list): The GeoJSON features, the polygon category n
+                             refers to the feature n - 1
+            methods (list): The requested univariate statistics methods
 
+        Returns:
+            list: A list of AreaUnivarResultModel
+        """
         result_file = tempfile.NamedTemporaryFile(
             dir=self.temp_file_path, delete=True
         )
@@ -173,35 +263,356 @@ class AsyncEphemeralRasterAreaStatsUnivar(EphemeralProcessing):
         pc = {
             "list": [
                 {
-                    "id": "v_import_1",
-                    "module": "v.import",
+                    "id": "g_region_2",
+                    "module": "g.region",
                     "inputs": [
-                        {
-                            "param": "input",
-                            "value": gml_file.name,
-                        },
+                        {"param": "vector", "value": "polygon"},
+                        {"param": "align", "value": raster_name},
+                    ],
+                    "superquiet": True
+                },
+                {
+                    "id": "v_to_rast_3",
+                    "module": "v.to.rast",
+                    "inputs": [
+                        {"param": "input", "value": "polygon"},
+                        {"param": "type", "value": "area"},
+                        {"param": "use", "value": "cat"},
+                    ],
+                    "outputs": [{"param": "output", "value": "zones"}],
+                    "superquiet": True
+                },
+                {
+                    "id": "r_univar_4",
+                    "module": "r.univar",
+                    "inputs": [
+                        {"param": "map", "value": raster_name},
+                        {"param": "zones", "value": "zones"},
+                        {"param": "separator", "value": "pipe"},
                     ],
                     "outputs": [
-                        {
-                            "param": "output",
-                            "value": "polygon",
-                        }
+                        {"param": "output", "value": result_file.name}
                     ],
+                    "flags": plan_univar(methods),
                     "superquiet": True
                 },
             ],
             "version": "1",
         }
 
+        # Run the area statistics and check for correct region settings
+        self.skip_region_check = False
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        # zone|label|non_null_cells|null_cells|min|max|range|mean|
+        # mean_of_abs|stddev|variance|coeff_var|sum|sum_abs|first_quart|
+        # median|third_quart|perc_90
+        # 1||20000|0|103.7|138.2685|34.5685|122.2349|122.2349|...
+        result = open(result_file.name, "r").readlines()
+        result_file.close()
+
+        keys = result[0].strip().split("|") if result else []
+        output_list = []
+        for line in result[1:]:
+            values = dict(zip(keys, line.strip().split("|")))
+            entry = {"cat": values["zone"]}
+            fid = get_feature_fid(features, values["zone"])
+            if fid is not None:
+                entry["fid"] = fid
+            for method in methods:
+                entry["raster_" + method] = float(
+                    values[R_UNIVAR_COLUMNS[method]]
+                )
+            output_list.append(AreaUnivarResultModel(**entry))
+
+        return output_list
+
+    def _read_raster_range(self, raster_name):
+        """Read the minimum and maximum of a raster map layer from its range
+        file
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+
+        Returns:
+            tuple: (minimum, maximum) or None if all cells are NULL
+        """
+        try:
+            _, stdout_buff, _ = self.ginit.run_module(
+                "r.info", ["map=" + raster_name, "-r"]
+            )
+        except GrassInitError as e:
+            raise AsyncProcessError(
+                "Unable to read the range of raster map layer <%s>: %s"
+                % (raster_name, str(e))
+            )
+        raster_range = {}
+        for line in stdout_buff.split():
+            if "=" in line:
+                key, value = line.split("=", 1)
+                raster_range[key] = value
+        try:
+            return float(raster_range["min"]), float(raster_range["max"])
+        except (KeyError, ValueError):
+            return None
+
+    def _read_raster_band(self, raster_name, region, null_value):
+        """Read the cells of the raster map layer in the region as double
+        values, NULL cells are set to null_value
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            region (dict): The region of the band
+            null_value (float): The value of NULL cells
+
+        Returns:
+            numpy.ndarray: The float64 cell array of shape (rows, cols)
+        """
+        output_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=True
+        )
+        pc = {
+            "list": [
+                {
+                    "id": "g_region_2",
+                    "module": "g.region",
+                    "inputs": [
+                        {"param": "n", "value": "%.17g" % region["north"]},
+                        {"param": "s", "value": "%.17g" % region["south"]},
+                        {"param": "e", "value": "%.17g" % region["east"]},
+                        {"param": "w", "value": "%.17g" % region["west"]},
+                        {"param": "nsres", "value": "%.17g" % region["nsres"]},
+                        {"param": "ewres", "value": "%.17g" % region["ewres"]},
+                    ],
+                    "superquiet": True
+                },
+                {
+                    "id": "r_out_bin_3",
+                    "module": "r.out.bin",
+                    "inputs": [
+                        {"param": "input", "value": raster_name},
+                        {"param": "null", "value": "%.17g" % null_value},
+                        {"param": "bytes", "value": "8"},
+                    ],
+                    "outputs": [
+                        {"param": "output", "value": output_file.name}
+                    ],
+                    "flags": "f",
+                    "overwrite": True,
+                    "superquiet": True
+                },
+            ],
+            "version": "1",
+        }
+        self.skip_region_check = False
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        values = np.fromfile(output_file.name, dtype=np.float64)
+        output_file.close()
+        return values.reshape(region["rows"], region["cols"])
+
+    def _iter_feature_cells(self, raster_name, feature_rings, region,
+                            null_value):
+        """Scan the raster map layer in row bands of at most
+        AREA_STATS_SKETCH_BAND_CELLS cells and yield the cells of each
+        feature in each band
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            feature_rings (list): For each feature a list of rings
+            region (dict): The region of all features from align_region()
+            null_value (float): The value of NULL cells
+
+        Yields:
+            tuple: (zone, cells) with the non NULL cells of the feature, the
+                   zone of the n-th feature is n
+        """
+        rows_per_band = max(1, AREA_STATS_SKETCH_BAND_CELLS // region["cols"])
+        for first_row in range(0, region["rows"], rows_per_band):
+            end_row = min(first_row + rows_per_band, region["rows"])
+            band_region = dict(
+                region,
+                north=region["north"] - first_row * region["nsres"],
+                south=region["north"] - end_row * region["nsres"],
+                rows=end_row - first_row,
+            )
+            values = self._read_raster_band(
+                raster_name, band_region, null_value
+            )
+            for zone, row_offset, col_offset, coverage in (
+                iter_feature_coverage(feature_rings, band_region)
+            ):
+                cells = values[
+                    row_offset:row_offset + coverage.shape[0],
+                    col_offset:col_offset + coverage.shape[1],
+                ][coverage]
+                cells = cells[cells != null_value]
+                if cells.size > 0:
+                    yield zone, cells
+
+    def _compute_approximate(self, raster_name, features, options):
+        """Compute the univariate statistics of each feature in a single
+        scan of the raster map layer in row bands
+
+        The moments are merged exactly, the median and the percentiles
+        are approximated with a QuantileSketch of each feature. Overlapping
+        features keep all their cells like with v.rast.stats.
+
+        Args:
+            raster_name (str): The fully qualified raster map layer name
+            features (list): The GeoJSON features
+            options (dict): The options from parse_univar_options()
+
+        Returns:
+            list: A list of AreaUnivarResultModel or None if the GeoJSON
+                  definition is not in the coordinate reference system of
+                  the project
+        """
+        name, mapset = split_raster_name(raster_name, self.mapset_name)
+        geojson_epsg = get_geojson_epsg(self.request_data)
+        if geojson_epsg != get_project_epsg(self.temp_project_path):
+            self.message_logger.info(
+                "Approximate statistics require a GeoJSON definition in the "
+                "crs of the project, computing the exact statistics"
+            )
+            return None
+
+        header = read_raster_header(self.temp_project_path, mapset, name)
+        feature_rings = [
+            get_polygon_rings(feature.get("geometry")) for feature in features
+        ]
+        bbox = get_bbox(feature_rings)
+        if bbox is None:
+            raise AsyncProcessError(
+                "The GeoJSON definition contains no polygon"
+            )
+        region = align_region(header, bbox)
+        num_cells = region["rows"] * region["cols"]
+        if num_cells > self.cell_limit:
+            raise AsyncProcessError(
+                "Region too large [num_cells: %d, cell limit: %d]"
+                % (num_cells, self.cell_limit)
+            )
+
+        raster_range = self._read_raster_range(raster_name)
+        # The partial results of the row bands are reduced into the moments
+        # and the sketch of each feature
+        moments = {}
+        sketches = {}
+        if raster_range is not None:
+            raster_min, raster_max = raster_range
+            null_value = raster_min - max(1.0, abs(raster_min))
+            for zone, cells in self._iter_feature_cells(
+                raster_name, feature_rings, region, null_value
+            ):
+                if zone not in moments:
+                    moments[zone] = MomentAccumulator()
+                    sketches[zone] = QuantileSketch(
+                        raster_min,
+                        raster_max,
+                        AREA_STATS_SKETCH_BINS,
+                        integer=header["format"] >= 0,
+                    )
+                moments[zone].add(cells)
+                sketches[zone].add(cells)
+
+        output_list = []
+        for zone in range(1, len(features) + 1):
+            entry = {"cat": str(zone)}
+            fid = get_feature_fid(features, zone)
+            if fid is not None:
+                entry["fid"] = fid
+            if zone not in moments:
+                if "number" in options["methods"]:
+                    entry["raster_number"] = 0.0
+                output_list.append(AreaUnivarResultModel(**entry))
+                continue
+
+            sketch = sketches[zone]
+            statistics = moments[zone].get_statistics()
+            statistics["median"] = sketch.quantile(0.5)
+            for method in options["methods"]:
+                entry["raster_" + method] = statistics[method]
+            if options["percentiles"]:
+                entry["raster_percentiles"] = {
+                    format_percentile(percentile): sketch.quantile(
+                        percentile / 100.0
+                    )
+                    for percentile in options["percentiles"]
+                }
+            entry["raster_quantile_error"] = sketch.error_bound
+            output_list.append(AreaUnivarResultModel(**entry))
+
+        return output_list
+
+    def _execute(self):
+
+        self._setup()
+
+        raster_name = self.map_name
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+
+        user_data = self.rdc.user_data or {}
+        engine = user_data.get("engine", AREA_STATS_UNIVAR_ENGINE)
+        methods = user_data.get("methods", UNIVAR_METHODS)
+
+        features = get_features(load_geojson(self.request_data) or {})
+        if user_data.get("approximate") is True:
+            output_list = self._compute_approximate(
+                raster_name + "@" + self.mapset_name, features, user_data
+            )
+            if output_list is not None:
+                self.module_results = output_list
+                return
+
+        import_pc, ascii_import = create_geojson_import_pc(
+            self.request_data,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "polygon",
+            "v_import_1",
+        )
+        pc = {"list": [import_pc], "version": "1"}
+        if ascii_import is True and engine == "v.rast.stats":
+            # v.in.ascii creates no attribute table for v.rast.stats
+            pc["list"].append(
+                {
+                    "id": "v_db_addtable_1",
+                    "module": "v.db.addtable",
+                    "inputs": [
+                        {
+                            "param": "map",
+                            "value": "polygon",
+                        },
+                    ],
+                    "superquiet": True
+                }
+            )
+
         # Run the selected modules
         self.skip_region_check = True
-        process_list = (
-            self._create_temporary_grass_environment_and_process_list(
-                process_chain=pc, skip_permission_check=True
-            )
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
         )
         self._execute_process_list(process_list)
 
+        if engine == "r.univar":
+            self.module_results = self._compute_r_univar(
+                raster_name + "@" + self.mapset_name, features, methods
+            )
+            return
+
+        result_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=True
+        )
+
         pc = {
             "list": [
                 {
@@ -225,8 +636,7 @@ class AsyncEphemeralRasterAreaStatsUnivar(EphemeralProcessing):
                         },
                         {
                             "param": "method",
-                            "value": "number,minimum,maximum,range,average,"
-                                     "median,stddev,sum,variance,coeff_var",
+                            "value": ",".join(methods),
                         },
                         {
                             "param": "raster",
@@ -293,9 +703,12 @@ class AsyncEphemeralRasterAreaStatsUnivar(EphemeralProcessing):
                 else:
                     result[key] = float(values[i])
                 i += 1
+            if ascii_import is True and not result.get("fid"):
+                fid = get_feature_fid(features, result["cat"])
+                if fid is not None:
+                    result["fid"] = fid
             output_list.append(AreaUnivarResultModel(**result))
 
         self.module_results = output_list
 
-        gml_file.close()
         result_file.close()
@@ -8,8 +8,7 @@ import pickle
 import tempfile
 from datetime import datetime
 from copy import deepcopy
-from flask import jsonify, make_response
-from flask.json import dumps
+from flask import jsonify, make_response, request
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
@@ -22,7 +21,22 @@ from actinia_core.core.common.api_logger import log_api_call
 from .response_models import (
     CategoricalStatisticsResultModel,
     RasterAreaStatsResponseModel,
+    STRDSAreaStatsTimeSeriesResponseModel,
+    STRDSAreaStatsTimeSeriesResultModel,
 )
+from .ephemeral_raster_area_stats import AsyncEphemeralRasterAreaStats
+from .geojson_utils import create_geojson_import_pc
+from .raster_utils import get_project_epsg
+from .strds_utils import (
+    TIMESTAMP_FORMAT,
+    TIME_RANGE_QUERY_PARAMETERS,
+    create_t_rast_list_pc,
+    create_time_range_where,
+    create_timestamp_where,
+    parse_raster_map_list,
+    parse_time_range,
+)
+from .temporal_index import get_strds_temporal_index, select_time_range
 from actinia_core.models.response_models import ProcessingErrorResponseModel
 
 
@@ -106,6 +120,72 @@ SCHEMA_DOC = {
 }
 
 
+SCHEMA_DOC_TIME_SERIES = {
+    "tags": ["STRDS Statistics"],
+    "description": "Compute areal categorical statistics on all raster map "
+    "layers of a space-time raster dataset with a start time in a time range "
+    "based on an input polygon. The raster map layers are selected once, the "
+    "polygon is imported and rasterized once as mask and the statistics are "
+    "computed for each raster map layer in the order of the start time. The "
+    "mask is aligned to the first raster map layer. "
+    "The input polygon must be provided as GeoJSON content"
+    " in the request body. A correct "
+    "coordinate reference system must be present in the GeoJSON definition. "
+    "For each category the "
+    "size of the occupied area, the number of pixel of the area and the "
+    "percentage of the area size "
+    "in relation to all other categories inclusive NULL data are computed. "
+    "Minimum required user role: user.",
+    "consumes": ["application/json"],
+    "parameters": [
+        {
+            "name": "project_name",
+            "description": "The project name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the required "
+            "space-time raster dataset",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "strds_name",
+            "description": "The name of the space-time raster dataset to "
+            "select the raster map layers from",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "shape",
+            "description": "GeoJSON definition of the polygon to compute the "
+            "statistics for.",
+            "required": True,
+            "in": "body",
+            "schema": {"type": "string"},
+        },
+    ]
+    + deepcopy(TIME_RANGE_QUERY_PARAMETERS),
+    "responses": {
+        "200": {
+            "description": "The result of the areal raster statistical "
+            "computation for each raster map layer",
+            "schema": STRDSAreaStatsTimeSeriesResponseModel,
+        },
+        "400": {
+            "description": "The error message and a detailed log why raster "
+            "statistic did not succeeded",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
 class AsyncEphemeralSTRDSAreaStatsResource(ResourceBase):
     """
     Compute area statistics based on a vector map for a single raster layer
@@ -139,7 +219,24 @@ class AsyncEphemeralSTRDSAreaStatsResource(ResourceBase):
             map_name=strds_name,
         )
         if rdc:
-            rdc.set_user_data(timestamp)
+            user_data = {"timestamp": timestamp}
+            index = get_strds_temporal_index(rdc)
+            if index is not None:
+                raster_name = index.find(
+                    datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+                )
+                # Time stamps outside of the temporal extent or in a gap of
+                # the STRDS are rejected without a job
+                if raster_name is None:
+                    # preprocess() committed the accepted status, the error
+                    # response replaces it in the resource logger
+                    self.get_error_response(
+                        message="No raster maps found for timestamp: "
+                        + timestamp
+                    )
+                    return None
+                user_data["raster_name"] = raster_name
+            rdc.set_user_data(user_data)
             enqueue_job(self.job_timeout, start_job, rdc)
 
         return rdc
@@ -208,155 +305,51 @@ class AsyncEphemeralSTRDSAreaStats(EphemeralProcessing):
         self._setup()
 
         strds_name = self.map_name
-        timestamp = self.rdc.user_data
+        timestamp = self.rdc.user_data["timestamp"]
+        raster_name = self.rdc.user_data.get("raster_name")
 
         self.required_mapsets.append(self.mapset_name)
-        gml_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
+        self._create_temporary_grass_environment()
+
+        import_pc, ascii_import = create_geojson_import_pc(
+            self.request_data,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "polygon",
+            "v_import_1",
         )
 
-        tmp_file = open(gml_file.name, "w")
-        tmp_file.write(dumps(self.request_data))
-        tmp_file.close()
-
-        pc = {
-            "list": [
-                {
-                    "id": "v_import_1",
-                    "module": "v.import",
-                    "inputs": [
-                        {
-                            "param": "input",
-                            "value": gml_file.name,
-                        }
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "polygon",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_create_2",
-                    "module": "t.create",
-                    "inputs": [
-                        {
-                            "param": "type",
-                            "value": "stvds",
-                        },
-                        {
-                            "param": "temporaltype",
-                            "value": "absolute",
-                        },
-                        {
-                            "param": "semantictype",
-                            "value": "mean",
-                        },
-                        {
-                            "param": "title",
-                            "value": "Polygon",
-                        },
-                        {
-                            "param": "description",
-                            "value": "Polygon",
-                        },
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "polygon_stvds",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_register_3",
-                    "module": "t.register",
-                    "inputs": [
-                        {
-                            "param": "type",
-                            "value": "vector",
-                        },
-                        {
-                            "param": "input",
-                            "value": "polygon_stvds",
-                        },
-                        {
-                            "param": "maps",
-                            "value": "polygon",
-                        },
-                        {
-                            "param": "start",
-                            "value": timestamp,
-                        },
-                        {
-                            "param": "increment",
-                            "value": "1 second",
-                        },
-                    ],
-                    "flags": "i",
-                    "superquiet": True
-                },
-                {
-                    "id": "t_sample_4",
-                    "module": "t.sample",
-                    "inputs": [
-                        {
-                            "param": "sample",
-                            "value": "polygon_stvds",
-                        },
-                        {
-                            "param": "inputs",
-                            "value": strds_name + "@" + self.mapset_name,
-                        },
-                        {
-                            "param": "samtype",
-                            "value": "stvds",
-                        },
-                        {
-                            "param": "intype",
-                            "value": "strds",
-                        },
-                    ],
-                    "superquiet": True
-                },
-            ],
-            "version": "1",
-        }
+        pc = {"list": [import_pc], "version": "1"}
+        if raster_name is None:
+            # Look up the raster map layer that is valid at the time stamp in
+            # the temporal database, no temporary space-time datasets are
+            # created
+            pc["list"].append(
+                create_t_rast_list_pc(
+                    strds_name + "@" + self.mapset_name,
+                    create_timestamp_where(timestamp),
+                    "t_rast_list_2",
+                )
+            )
 
-        # Setup the grass environment, check the process chain and run the
-        # modules
+        # Check the process chain and run the modules
         self.skip_region_check = True
-        process_list = (
-            self._create_temporary_grass_environment_and_process_list(
-                process_chain=pc, skip_permission_check=True
-            )
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
         )
         self._execute_process_list(process_list)
 
-        gml_file.close()
-
-        # Extract raster name
-        map_list = self.module_output_log[3]["stdout"]
-
-        self.message_logger.debug("Maplist: " + str(map_list))
-        # Check if a map was found
-        try:
-            raster_name = map_list.split("|")[1]
-            # Select the first raster name from a list of names
-            if "," in raster_name:
-                raster_name = raster_name.split(",")[0]
-        except Exception:
-            raise AsyncProcessError(
-                "No raster maps found for timestamp: " + timestamp
-            )
-
-        if raster_name == "None":
-            raise AsyncProcessError(
-                "No raster maps found for timestamp: " + timestamp
+        if raster_name is None:
+            map_list = parse_raster_map_list(
+                self.module_output_dict["t_rast_list_2"]["stdout"]
             )
+            self.message_logger.debug("Maplist: " + str(map_list))
+            # Select the first raster map layer if several are valid
+            if not map_list:
+                raise AsyncProcessError(
+                    "No raster maps found for timestamp: " + timestamp
+                )
+            raster_name = map_list[0][0]
 
         result_file = tempfile.NamedTemporaryFile(
             dir=self.temp_file_path, delete=True
@@ -365,7 +358,7 @@ class AsyncEphemeralSTRDSAreaStats(EphemeralProcessing):
         pc = {
             "list": [
                 {
-                    "id": "g_region_5",
+                    "id": "g_region_3",
                     "module": "g.region",
                     "inputs": [
                         {
@@ -380,7 +373,7 @@ class AsyncEphemeralSTRDSAreaStats(EphemeralProcessing):
                     "superquiet": True
                 },
                 {
-                    "id": "r_mask_6",
+                    "id": "r_mask_4",
                     "module": "r.mask",
                     "inputs": [
                         {
@@ -391,7 +384,7 @@ class AsyncEphemeralSTRDSAreaStats(EphemeralProcessing):
                     "superquiet": True
                 },
                 {
-                    "id": "r_stats_7",
+                    "id": "r_stats_5",
                     "module": "r.stats",
                     "inputs": [
                         {
@@ -442,3 +435,173 @@ class AsyncEphemeralSTRDSAreaStats(EphemeralProcessing):
         self.module_results = output_list
 
         result_file.close()
+
+
+class AsyncEphemeralSTRDSAreaStatsTimeSeriesResource(ResourceBase):
+    """
+    Compute area statistics based on a vector map for all raster layers of a
+    STRDS with a start time in a time range.
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    def _execute(self, project_name, mapset_name, strds_name):
+        """Prepare and enqueue the raster area statistics of the time range
+
+        Raises:
+            InvalidUsage: In case the time stamps are wrong or the JSON
+                          content is missing
+        """
+        try:
+            time_range = parse_time_range(request.args)
+        except ValueError as e:
+            return self.get_error_response(message=str(e))
+
+        rdc = self.preprocess(
+            has_json=True,
+            has_xml=False,
+            project_name=project_name,
+            mapset_name=mapset_name,
+            map_name=strds_name,
+        )
+        if rdc:
+            map_list = select_time_range(
+                get_strds_temporal_index(rdc), time_range
+            )
+            if map_list == []:
+                # preprocess() committed the accepted status, the error
+                # response replaces it in the resource logger
+                self.get_error_response(
+                    message="No raster maps found in <%s@%s> for the time "
+                    "range" % (strds_name, mapset_name)
+                )
+                return None
+            rdc.set_user_data(dict(time_range, map_list=map_list))
+            enqueue_job(self.job_timeout, start_time_series_job, rdc)
+
+        return rdc
+
+    @swagger.doc(deepcopy(SCHEMA_DOC_TIME_SERIES))
+    def post(self, project_name, mapset_name, strds_name):
+        """
+        Compute area statistics based on a vector map for all raster layers
+        of a STRDS with a start time in a time range.
+        """
+        self._execute(project_name, mapset_name, strds_name)
+        html_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), html_code)
+
+
+class SyncEphemeralSTRDSAreaStatsTimeSeriesResource(
+    AsyncEphemeralSTRDSAreaStatsTimeSeriesResource
+):
+    """Compute area statistics based on a vector map for all raster layers of
+    a STRDS with a start time in a time range.
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    @swagger.doc(deepcopy(SCHEMA_DOC_TIME_SERIES))
+    def post(self, project_name, mapset_name, strds_name):
+        """Compute area statistics based on a vector map for all raster
+        layers of a STRDS with a start time in a time range.
+        """
+        check = self._execute(project_name, mapset_name, strds_name)
+        if check is not None:
+            http_code, response_model = self.wait_until_finish()
+        else:
+            http_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), http_code)
+
+
+def start_time_series_job(*args):
+    processing = AsyncEphemeralSTRDSAreaStatsTimeSeries(*args)
+    processing.run()
+
+
+class AsyncEphemeralSTRDSAreaStatsTimeSeries(AsyncEphemeralRasterAreaStats):
+    """
+    Compute area statistics based on a vector map for all raster layers of a
+    STRDS with a start time in a time range.
+
+    The raster map layers are listed once with t.rast.list, the polygon is
+    imported and rasterized as mask once and r.stats runs for each raster
+    map layer in the region aligned to the first raster map layer.
+    """
+
+    def __init__(self, *args):
+        AsyncEphemeralRasterAreaStats.__init__(self, *args)
+        self.response_model_class = STRDSAreaStatsTimeSeriesResponseModel
+
+    def _list_raster_maps(self, strds_name, where):
+        """List the raster map layers of the STRDS ordered by start time
+
+        Args:
+            strds_name (str): The fully qualified STRDS name
+            where (str): The where statement or None
+
+        Returns:
+            list: A list of (raster map layer id, start time) tuples
+        """
+        pc = {
+            "list": [
+                create_t_rast_list_pc(strds_name, where, "t_rast_list_2")
+            ],
+            "version": "1",
+        }
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        return parse_raster_map_list(
+            self.module_output_dict["t_rast_list_2"]["stdout"]
+        )
+
+    def _execute(self):
+
+        self._setup()
+
+        strds_name = self.map_name + "@" + self.mapset_name
+        time_range = self.rdc.user_data
+        map_list = time_range["map_list"]
+
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+
+        self._import_polygon(self.request_data)
+
+        # The raster map layers were not selected with the temporal index
+        if map_list is None:
+            map_list = self._list_raster_maps(
+                strds_name, create_time_range_where(time_range)
+            )
+        self.message_logger.debug("Maplist: " + str(map_list))
+        if not map_list:
+            raise AsyncProcessError(
+                "No raster maps found in <%s> for the time range" % strds_name
+            )
+
+        # The mask is created once on the grid of the first raster map layer
+        pc = {
+            "list": self._create_mask_pc_list(
+                map_list[0][0], "g_region_3", "r_mask_4"
+            ),
+            "version": "1",
+        }
+        self._run_area_stats_pc(pc)
+
+        output_list = []
+        for count, (raster_name, start_time) in enumerate(map_list):
+            output_list.append(
+                STRDSAreaStatsTimeSeriesResultModel(
+                    start_time=start_time,
+                    raster_name=raster_name,
+                    statistics=self._compute_r_stats(
+                        raster_name, "r_stats_%i" % (count + 5)
+                    ),
+                )
+            )
+
+        self.module_results = output_list
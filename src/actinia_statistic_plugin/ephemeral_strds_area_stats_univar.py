@@ -7,21 +7,48 @@ an input polygon.
 import pickle
 import tempfile
 from datetime import datetime
-from flask import jsonify, make_response
+from flask import jsonify, make_response, request
 from copy import deepcopy
-from flask.json import dumps
-from actinia_core.processing.actinia_processing.ephemeral_processing import (
-    EphemeralProcessing,
-)
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.kvdb_interface import enqueue_job
 from actinia_core.core.common.exceptions import AsyncProcessError
 from flask_restful_swagger_2 import swagger
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
+from .ephemeral_raster_area_stats_univar import (
+    AsyncEphemeralRasterAreaStatsUnivar,
+)
+from .config import AREA_STATS_PARALLEL_NPROCS
 from .response_models import (
     AreaUnivarResultModel,
     RasterAreaUnivarStatsResponseModel,
+    STRDSAreaUnivarTimeSeriesResponseModel,
+    STRDSAreaUnivarTimeSeriesResultModel,
+)
+from .geojson_utils import (
+    create_geojson_import_pc,
+    get_feature_fid,
+    get_features,
+    load_geojson,
+)
+from .raster_utils import get_project_epsg
+from .strds_utils import (
+    TIMESTAMP_FORMAT,
+    TIME_RANGE_QUERY_PARAMETERS,
+    create_t_rast_list_pc,
+    create_time_range_where,
+    create_timestamp_where,
+    format_start_time,
+    parse_raster_map_list,
+    parse_time_range,
+)
+from .temporal_index import get_strds_temporal_index, select_time_range
+from .univar_methods import (
+    UNIVAR_QUERY_PARAMETERS,
+    parse_t_rast_univar_values,
+    parse_univar_methods,
+    parse_univar_options,
+    plan_univar,
 )
 from actinia_core.models.response_models import ProcessingErrorResponseModel
 
@@ -39,7 +66,9 @@ SCHEMA_DOC = {
     "contained in a space-time raster dataset based on an input polygon. "
     "The input polygon must be provided as GeoJSON content in the request body"
     ". A correct coordinate reference system must be present in the GeoJSON "
-    "definition. Minimum required user role: user.",
+    "definition. Only the requested methods are computed, the cell values "
+    "are sorted only if order statistics like the median are requested. "
+    "Minimum required user role: user.",
     "consumes": ["application/json"],
     "parameters": [
         {
@@ -84,7 +113,8 @@ SCHEMA_DOC = {
             "in": "body",
             "schema": {"type": "string"},
         },
-    ],
+    ]
+    + deepcopy(UNIVAR_QUERY_PARAMETERS),
     "responses": {
         "200": {
             "description": "The result of the areal univar raster statistical "
@@ -100,6 +130,75 @@ SCHEMA_DOC = {
 }
 
 
+SCHEMA_DOC_TIME_SERIES = {
+    "tags": ["STRDS Statistics"],
+    "description": "Compute areal univariate statistics on all raster map "
+    "layers of a space-time raster dataset with a start time in a time range "
+    "based on an input polygon. The polygons are imported and rasterized "
+    "once as zones, aligned to the first raster map layer, and the zonal "
+    "statistics of all raster map layers are computed with t.rast.univar in "
+    "parallel processes. The results are ordered by the start time of the "
+    "raster map layers. "
+    "The input polygon must be provided as GeoJSON content in the request body"
+    ". A correct coordinate reference system must be present in the GeoJSON "
+    "definition. Overlapping polygons are not supported, a cell is assigned "
+    "to a single polygon. Only the requested methods are computed, the cell "
+    "values are sorted only if order statistics like the median are "
+    "requested. Minimum required user role: user.",
+    "consumes": ["application/json"],
+    "parameters": [
+        {
+            "name": "project_name",
+            "description": "The project name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the required "
+                           "space-time raster dataset",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "strds_name",
+            "description": "The name of the space-time raster dataset to "
+                           "select the raster map layers from",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "shape",
+            "description": "GeoJSON definition of the polygon to compute the "
+            "statistics for.",
+            "required": True,
+            "in": "body",
+            "schema": {"type": "string"},
+        },
+    ]
+    + deepcopy(TIME_RANGE_QUERY_PARAMETERS)
+    + deepcopy(
+        [param for param in UNIVAR_QUERY_PARAMETERS
+         if param["name"] == "methods"]
+    ),
+    "responses": {
+        "200": {
+            "description": "The result of the areal univar raster statistical "
+            "computation for each raster map layer",
+            "schema": STRDSAreaUnivarTimeSeriesResponseModel,
+        },
+        "400": {
+            "description": "The error message and a detailed log why univar "
+            "raster statistic did not succeeded",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
 class AsyncEphemeralSTRDSAreaStatsUnivarResource(ResourceBase):
     """
     Compute area statistics based on a vector map for a single raster layer
@@ -126,6 +225,11 @@ class AsyncEphemeralSTRDSAreaStatsUnivarResource(ResourceBase):
             )
             self.create_error_response(message=msg)
             return False
+        try:
+            options = parse_univar_options(request.args)
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return False
 
         rdc = self.preprocess(
             has_json=True,
@@ -135,7 +239,24 @@ class AsyncEphemeralSTRDSAreaStatsUnivarResource(ResourceBase):
             map_name=strds_name,
         )
         if rdc:
-            rdc.set_user_data(timestamp)
+            user_data = dict(options, timestamp=timestamp)
+            index = get_strds_temporal_index(rdc)
+            if index is not None:
+                raster_name = index.find(
+                    datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+                )
+                # Time stamps outside of the temporal extent or in a gap of
+                # the STRDS are rejected without a job
+                if raster_name is None:
+                    # preprocess() committed the accepted status, the error
+                    # response replaces it in the resource logger
+                    self.get_error_response(
+                        message="No raster maps found for timestamp: "
+                        + timestamp
+                    )
+                    return False
+                user_data["raster_name"] = raster_name
+            rdc.set_user_data(user_data)
             enqueue_job(self.job_timeout, start_job, rdc)
             return True
 
@@ -182,14 +303,14 @@ def start_job(*args):
     processing.run()
 
 
-class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
+class AsyncEphemeralSTRDSAreaStatsUnivar(AsyncEphemeralRasterAreaStatsUnivar):
     """
     Compute area statistics based on a vector map for a single raster layer
     that is temporally sampled from a STRDS by a timestamp.
     """
 
     def __init__(self, *args):
-        EphemeralProcessing.__init__(self, *args)
+        AsyncEphemeralRasterAreaStatsUnivar.__init__(self, *args)
         self.response_model_class = RasterAreaUnivarStatsResponseModel
 
     def _execute(self):
@@ -197,157 +318,78 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
         self._setup()
 
         strds_name = self.map_name
-        timestamp = self.rdc.user_data
+        timestamp = self.rdc.user_data["timestamp"]
+        methods = self.rdc.user_data["methods"]
+        raster_name = self.rdc.user_data.get("raster_name")
 
         self.required_mapsets.append(self.mapset_name)
-        gml_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
+        self._create_temporary_grass_environment()
+
+        import_pc, ascii_import = create_geojson_import_pc(
+            self.request_data,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "polygon",
+            "v_import_1",
         )
 
-        tmp_file = open(gml_file.name, "w")
-        if isinstance(self.request_data, str):
-            tmp_file.write(str(self.request_data).strip())
-        else:
-            tmp_file.write(dumps(self.request_data))
-        tmp_file.close()
+        pc = {"list": [import_pc], "version": "1"}
+        if raster_name is None:
+            # Look up the raster map layer that is valid at the time stamp in
+            # the temporal database, no temporary space-time datasets are
+            # created
+            pc["list"].append(
+                create_t_rast_list_pc(
+                    strds_name + "@" + self.mapset_name,
+                    create_timestamp_where(timestamp),
+                    "t_rast_list_2",
+                )
+            )
 
-        pc = {
-            "list": [
+        if ascii_import is True:
+            # v.in.ascii creates no attribute table for v.rast.stats
+            pc["list"].insert(
+                1,
                 {
-                    "id": "v_import_1",
-                    "module": "v.import",
+                    "id": "v_db_addtable_1",
+                    "module": "v.db.addtable",
                     "inputs": [
                         {
-                            "param": "input",
-                            "value": gml_file.name,
-                        },
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "polygon",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_create_2",
-                    "module": "t.create",
-                    "inputs": [
-                        {
-                            "param": "type",
-                            "value": "stvds",
-                        },
-                        {
-                            "param": "temporaltype",
-                            "value": "absolute",
-                        },
-                        {
-                            "param": "semantictype",
-                            "value": "mean",
-                        },
-                        {
-                            "param": "title",
-                            "value": "Polygon",
-                        },
-                        {
-                            "param": "description",
-                            "value": "Polygon",
-                        },
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "polygon_stvds",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_register_3",
-                    "module": "t.register",
-                    "inputs": [
-                        {
-                            "param": "type",
-                            "value": "vector",
-                        },
-                        {
-                            "param": "input",
-                            "value": "polygon_stvds",
-                        },
-                        {
-                            "param": "maps",
+                            "param": "map",
                             "value": "polygon",
                         },
-                        {
-                            "param": "start",
-                            "value": timestamp,
-                        },
-                        {
-                            "param": "increment",
-                            "value": "1 second",
-                        },
-                    ],
-                    "flags": "i",
-                    "superquiet": True
-                },
-                {
-                    "id": "t_sample_4",
-                    "module": "t.sample",
-                    "inputs": [
-                        {
-                            "param": "sample",
-                            "value": "polygon_stvds",
-                        },
-                        {
-                            "param": "samtype",
-                            "value": "stvds",
-                        },
-                        {
-                            "param": "intype",
-                            "value": "strds",
-                        },
-                        {
-                            "param": "inputs",
-                            "value": strds_name + "@" + self.mapset_name,
-                        },
                     ],
                     "superquiet": True
                 },
-            ],
-            "version": "1",
-        }
+            )
 
-        # Setup the grass environment, check the process chain and run the
-        # modules
+        # Check the process chain and run the modules
         self.skip_region_check = True
-        process_list = (
-            self._create_temporary_grass_environment_and_process_list(
-                process_chain=pc, skip_permission_check=True
-            )
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
         )
         self._execute_process_list(process_list)
 
-        gml_file.close()
-
-        # Extract raster name
-        map_list = self.module_output_log[3]["stdout"]
-        self.message_logger.info("Maplist: " + str(map_list))
-        # Check if a map was found
-        try:
-            raster_name = map_list.split("|")[1]
-            # Select the first raster name from a list of names
-            if "," in raster_name:
-                raster_name = raster_name.split(",")[0]
-        except Exception:
-            raise AsyncProcessError(
-                "No raster maps found for timestamp: " + timestamp
+        if raster_name is None:
+            map_list = parse_raster_map_list(
+                self.module_output_dict["t_rast_list_2"]["stdout"]
             )
-
-        if raster_name == "None":
-            raise AsyncProcessError(
-                "No raster maps found for timestamp: " + timestamp
+            self.message_logger.info("Maplist: " + str(map_list))
+            # Select the first raster map layer if several are valid
+            if not map_list:
+                raise AsyncProcessError(
+                    "No raster maps found for timestamp: " + timestamp
+                )
+            raster_name = map_list[0][0]
+
+        features = get_features(load_geojson(self.request_data) or {})
+        if self.rdc.user_data["approximate"] is True:
+            output_list = self._compute_approximate(
+                raster_name, features, self.rdc.user_data
             )
+            if output_list is not None:
+                self.module_results = output_list
+                return
 
         result_file = tempfile.NamedTemporaryFile(
             dir=self.temp_file_path, delete=True
@@ -356,7 +398,7 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
         pc = {
             "list": [
                 {
-                    "id": "g_region_5",
+                    "id": "g_region_3",
                     "module": "g.region",
                     "inputs": [
                         {
@@ -367,7 +409,7 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
                     "superquiet": True
                 },
                 {
-                    "id": "v_rast_stats_6",
+                    "id": "v_rast_stats_4",
                     "module": "v.rast.stats",
                     "inputs": [
                         {
@@ -376,8 +418,7 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
                         },
                         {
                             "param": "method",
-                            "value": "number,minimum,maximum,range,average,"
-                                     "median,stddev,sum,variance,coeff_var",
+                            "value": ",".join(methods),
                         },
                         {
                             "param": "raster",
@@ -391,7 +432,7 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
                     "superquiet": True
                 },
                 {
-                    "id": "v_db_select_7",
+                    "id": "v_db_select_5",
                     "module": "v.db.select",
                     "inputs": [
                         {
@@ -457,8 +498,253 @@ class AsyncEphemeralSTRDSAreaStatsUnivar(EphemeralProcessing):
                         pass
 
                 i += 1
+            if ascii_import is True and not result.get("fid"):
+                fid = get_feature_fid(features, result["cat"])
+                if fid is not None:
+                    result["fid"] = fid
             output_list.append(AreaUnivarResultModel(**result))
 
         self.module_results = output_list
 
         result_file.close()
+
+
+class AsyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource(ResourceBase):
+    """
+    Compute univariate area statistics based on a vector map for all raster
+    layers of a STRDS with a start time in a time range.
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    def _execute(self, project_name, mapset_name, strds_name):
+        """Prepare and enqueue the raster area statistics of the time range
+
+        Raises:
+            InvalidUsage: In case the time stamps are wrong or the JSON
+                          content is missing
+
+        """
+        try:
+            time_range = parse_time_range(request.args)
+            methods = parse_univar_methods(request.args.get("methods"))
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return False
+
+        rdc = self.preprocess(
+            has_json=True,
+            has_xml=False,
+            project_name=project_name,
+            mapset_name=mapset_name,
+            map_name=strds_name,
+        )
+        if rdc:
+            map_list = select_time_range(
+                get_strds_temporal_index(rdc), time_range
+            )
+            if map_list == []:
+                # preprocess() committed the accepted status, the error
+                # response replaces it in the resource logger
+                self.get_error_response(
+                    message="No raster maps found in <%s@%s> for the time "
+                    "range" % (strds_name, mapset_name)
+                )
+                return False
+            rdc.set_user_data(
+                dict(time_range, methods=methods, map_list=map_list)
+            )
+            enqueue_job(self.job_timeout, start_time_series_job, rdc)
+            return True
+
+        return False
+
+    @swagger.doc(deepcopy(SCHEMA_DOC_TIME_SERIES))
+    def post(self, project_name, mapset_name, strds_name):
+        """
+        Compute areal univariate statistics on all raster map layers of a
+        space-time raster dataset in a time range based on an input polygon.
+        """
+        self._execute(project_name, mapset_name, strds_name)
+        html_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), html_code)
+
+
+class SyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource(
+    AsyncEphemeralSTRDSAreaStatsUnivarTimeSeriesResource
+):
+    """Compute univariate area statistics based on a vector map for all
+    raster layers of a STRDS with a start time in a time range.
+    """
+
+    decorators = [log_api_call, auth.login_required]
+
+    @swagger.doc(deepcopy(SCHEMA_DOC_TIME_SERIES))
+    def post(self, project_name, mapset_name, strds_name):
+        """
+        Compute areal univariate statistics on all raster map layers of a
+        space-time raster dataset in a time range based on an input polygon.
+        """
+        check = self._execute(project_name, mapset_name, strds_name)
+        if check is True:
+            http_code, response_model = self.wait_until_finish()
+        else:
+            http_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), http_code)
+
+
+def start_time_series_job(*args):
+    processing = AsyncEphemeralSTRDSAreaStatsUnivarTimeSeries(*args)
+    processing.run()
+
+
+class AsyncEphemeralSTRDSAreaStatsUnivarTimeSeries(
+    AsyncEphemeralRasterAreaStatsUnivar
+):
+    """
+    Compute univariate area statistics based on a vector map for all raster
+    layers of a STRDS with a start time in a time range.
+
+    The polygons are imported and rasterized as zones once and a single
+    zonal t.rast.univar run computes the statistics of all raster map layers
+    in parallel processes.
+    """
+
+    def __init__(self, *args):
+        AsyncEphemeralRasterAreaStatsUnivar.__init__(self, *args)
+        self.response_model_class = STRDSAreaUnivarTimeSeriesResponseModel
+
+    def _execute(self):
+
+        self._setup()
+
+        strds_name = self.map_name + "@" + self.mapset_name
+        methods = self.rdc.user_data["methods"]
+        where = create_time_range_where(self.rdc.user_data)
+        map_list = self.rdc.user_data["map_list"]
+
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+
+        import_pc, _ = create_geojson_import_pc(
+            self.request_data,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "polygon",
+            "v_import_1",
+        )
+        pc = {"list": [import_pc], "version": "1"}
+        # The raster map layers were not selected with the temporal index
+        if map_list is None:
+            pc["list"].append(
+                create_t_rast_list_pc(strds_name, where, "t_rast_list_2")
+            )
+
+        # Check the process chain and run the modules
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        if map_list is None:
+            map_list = parse_raster_map_list(
+                self.module_output_dict["t_rast_list_2"]["stdout"]
+            )
+        self.message_logger.info("Maplist: " + str(map_list))
+        if not map_list:
+            raise AsyncProcessError(
+                "No raster maps found in <%s> for the time range" % strds_name
+            )
+
+        result_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=True
+        )
+
+        univar_inputs = [
+            {"param": "input", "value": strds_name},
+            {"param": "zones", "value": "zones"},
+            {"param": "separator", "value": "pipe"},
+            {
+                "param": "nprocs",
+                "value": str(min(AREA_STATS_PARALLEL_NPROCS, len(map_list))),
+            },
+        ]
+        if where is not None:
+            univar_inputs.append({"param": "where", "value": where})
+        t_rast_univar = {
+            "id": "t_rast_univar_5",
+            "module": "t.rast.univar",
+            "inputs": univar_inputs,
+            "outputs": [{"param": "output", "value": result_file.name}],
+            "superquiet": True
+        }
+        # The extended statistics sort the cell values of each map
+        if plan_univar(methods) == "et":
+            t_rast_univar["flags"] = "e"
+
+        pc = {
+            "list": [
+                {
+                    "id": "g_region_3",
+                    "module": "g.region",
+                    "inputs": [
+                        {"param": "vector", "value": "polygon"},
+                        {"param": "align", "value": map_list[0][0]},
+                    ],
+                    "flags": "p",
+                },
+                {
+                    "id": "v_to_rast_4",
+                    "module": "v.to.rast",
+                    "inputs": [
+                        {"param": "input", "value": "polygon"},
+                        {"param": "type", "value": "area"},
+                        {"param": "use", "value": "cat"},
+                    ],
+                    "outputs": [{"param": "output", "value": "zones"}],
+                    "superquiet": True
+                },
+                t_rast_univar,
+            ],
+            "version": "1",
+        }
+
+        # Check the process chain and run the modules
+        self.skip_region_check = False
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        # id|semantic_label|start|end|zone|mean|min|max|mean_of_abs|stddev|
+        # variance|coeff_var|sum|null_cells|cells|non_null_cells|...
+        # LST_Day_monthly_1@modis_lst||2016-01-01 00:00:00|
+        # 2016-02-01 00:00:00|1|14678.2|14532|14812|...
+        result = open(result_file.name, "r").readlines()
+        result_file.close()
+
+        features = get_features(load_geojson(self.request_data) or {})
+        keys = result[0].strip().split("|") if result else []
+        statistics = {}
+        for line in result[1:]:
+            values = dict(zip(keys, line.strip().split("|")))
+            entry = {"cat": values["zone"]}
+            fid = get_feature_fid(features, values["zone"])
+            if fid is not None:
+                entry["fid"] = fid
+            entry.update(parse_t_rast_univar_values(values, methods))
+            key = (values["id"], format_start_time(values["start"]))
+            statistics.setdefault(key, []).append(
+                AreaUnivarResultModel(**entry)
+            )
+
+        # The map list is ordered by start time
+        self.module_results = [
+            STRDSAreaUnivarTimeSeriesResultModel(
+                start_time=start_time,
+                raster_name=raster_name,
+                statistics=statistics.get((raster_name, start_time), []),
+            )
+            for raster_name, start_time in map_list
+        ]
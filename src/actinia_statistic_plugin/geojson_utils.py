@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+Helper functions to evaluate GeoJSON definitions in the worker process, for
+example to rasterize polygons without GRASS GIS modules or to import them
+without v.import.
+"""
+
+import json
+import re
+import tempfile
+import numpy as np
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+def get_geojson_epsg(geojson):
+    """Return the EPSG code of the coordinate reference system of a GeoJSON
+    definition
+
+    GeoJSON without "crs" member uses WGS84 longitude/latitude coordinates.
+
+    Args:
+        geojson (dict): The GeoJSON definition
+
+    Returns:
+        int: The EPSG code or None if the crs can not be identified
+    """
+    crs = geojson.get("crs")
+    if not crs:
+        return 4326
+    name = (crs.get("properties") or {}).get("name", "")
+    if name.endswith("CRS84"):
+        return 4326
+    # urn:ogc:def:crs:EPSG::3358, urn:ogc:def:crs:EPSG:6.6:3358,
+    # urn:x-ogc:def:crs:EPSG:3358, EPSG:3358
+    match = re.search(r"EPSG:(?:[\d.]*:)?(\d+)$", name)
+    if match is None:
+        return None
+    return int(match.group(1))
+
+
+def load_geojson(data):
+    """Return the GeoJSON definition of request data as dict
+
+    Args:
+        data: The request data, a dict or a JSON string
+
+    Returns:
+        dict: The GeoJSON definition or None if the data is no JSON object
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    if not isinstance(data, dict):
+        return None
+    return data
+
+
+def get_features(geojson):
+    """Return the list of features of a GeoJSON definition
+
+    Args:
+        geojson (dict): A GeoJSON FeatureCollection, Feature or geometry
+
+    Returns:
+        list: The GeoJSON features
+    """
+    if geojson.get("type") == "FeatureCollection":
+        return geojson.get("features") or []
+    if geojson.get("type") == "Feature":
+        return [geojson]
+    return [{"type": "Feature", "properties": {}, "geometry": geojson}]
+
+
+def get_polygons(geometry):
+    """Return the polygons of a Polygon or MultiPolygon geometry
+
+    Args:
+        geometry (dict): The GeoJSON geometry
+
+    Returns:
+        list: For each polygon a list of closed rings as numpy arrays of
+              shape (n, 2), the outer ring first, empty if the geometry is
+              not a polygon
+    """
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return []
+
+    result = []
+    for polygon in polygons:
+        rings = []
+        for coordinates in polygon:
+            ring = np.array(coordinates, dtype=np.float64)[:, :2]
+            if len(ring) < 3:
+                continue
+            if not np.array_equal(ring[0], ring[-1]):
+                ring = np.vstack([ring, ring[:1]])
+            rings.append(ring)
+        if rings:
+            result.append(rings)
+    return result
+
+
+def get_polygon_rings(geometry):
+    """Return all rings of a Polygon or MultiPolygon geometry
+
+    Args:
+        geometry (dict): The GeoJSON geometry
+
+    Returns:
+        list: A list of closed rings as numpy arrays of shape (n, 2), empty
+              if the geometry is not a polygon
+    """
+    return [ring for rings in get_polygons(geometry) for ring in rings]
+
+
+def get_bbox(feature_rings):
+    """Return the bounding box of a list of features given by their rings
+
+    Args:
+        feature_rings (list): For each feature a list of rings
+
+    Returns:
+        tuple: (west, south, east, north) or None if there are no rings
+    """
+    rings = [ring for rings in feature_rings for ring in rings]
+    if not rings:
+        return None
+    points = np.vstack(rings)
+    return (
+        points[:, 0].min(),
+        points[:, 1].min(),
+        points[:, 0].max(),
+        points[:, 1].max(),
+    )
+
+
+def _get_crossings(rings, y):
+    """Return the sorted x coordinates where the rings cross the horizontal
+    line at y, using the half-open rule ymin <= y < ymax for each edge"""
+    x0 = np.concatenate([ring[:-1, 0] for ring in rings])
+    y0 = np.concatenate([ring[:-1, 1] for ring in rings])
+    x1 = np.concatenate([ring[1:, 0] for ring in rings])
+    y1 = np.concatenate([ring[1:, 1] for ring in rings])
+    selection = (np.minimum(y0, y1) <= y) & (y < np.maximum(y0, y1))
+    x0, y0, x1, y1 = (
+        x0[selection], y0[selection], x1[selection], y1[selection]
+    )
+    return np.sort(x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+
+
+def get_interior_point(rings, num_candidates=16):
+    """Return a point inside of a polygon, for example to place a centroid
+
+    The polygon is scanned at horizontal lines between the vertices next to
+    the center of the polygon and the center of the widest inside interval
+    is returned.
+
+    Args:
+        rings (list): The outer ring and the holes of the polygon
+        num_candidates (int): The number of scan lines to test
+
+    Returns:
+        tuple: (x, y) or None if the polygon has no area
+    """
+    vertex_y = np.unique(np.concatenate([ring[:, 1] for ring in rings]))
+    if len(vertex_y) < 2:
+        return None
+    candidates = (vertex_y[:-1] + vertex_y[1:]) / 2.0
+    center = (vertex_y[0] + vertex_y[-1]) / 2.0
+    candidates = candidates[
+        np.argsort(np.abs(candidates - center))[:num_candidates]
+    ]
+
+    best = None
+    best_width = 0.0
+    for y in candidates:
+        crossings = _get_crossings(rings, y)
+        if len(crossings) < 2:
+            continue
+        widths = crossings[1::2] - crossings[0::2]
+        index = int(np.argmax(widths))
+        if widths[index] > best_width:
+            best_width = widths[index]
+            best = (
+                float((crossings[2 * index] + crossings[2 * index + 1]) / 2),
+                float(y),
+            )
+    return best
+
+
+def _format_coordinate(x, y):
+    return " %.17g %.17g" % (x, y)
+
+
+def geojson_to_grass_ascii(geojson):
+    """Convert a GeoJSON definition into the GRASS GIS ASCII vector standard
+    format without header, that can be imported with v.in.ascii -n
+
+    Each feature gets the category of its position in the feature list,
+    starting with 1, like with v.import. Only point features and polygon
+    features that do not touch each other are converted, since v.in.ascii
+    does not clean the topology of shared or intersecting boundaries.
+
+    Args:
+        geojson (dict): The GeoJSON definition
+
+    Returns:
+        str: The GRASS GIS ASCII vector or None if the GeoJSON definition
+             can not be converted
+    """
+    features = get_features(geojson)
+    if not features:
+        return None
+    geometry_types = set(
+        [(feature.get("geometry") or {}).get("type") for feature in features]
+    )
+
+    lines = []
+    if geometry_types == set(["Point"]):
+        for cat, feature in enumerate(features, start=1):
+            x, y = feature["geometry"]["coordinates"][:2]
+            lines += ["P  1 1", _format_coordinate(x, y), " 1 %i" % cat]
+        return "\n".join(lines) + "\n"
+
+    if not geometry_types <= set(["Polygon", "MultiPolygon"]):
+        return None
+
+    parts = []
+    for cat, feature in enumerate(features, start=1):
+        for rings in get_polygons(feature["geometry"]):
+            parts.append((cat, rings))
+    if not parts:
+        return None
+
+    # The bounding boxes of all polygons must be disjoint
+    bboxes = np.array([get_bbox([rings[:1]]) for _, rings in parts])
+    west, south, east, north = [bboxes[:, i] for i in range(4)]
+    overlap = (
+        (west[:, np.newaxis] <= east[np.newaxis, :])
+        & (west[np.newaxis, :] <= east[:, np.newaxis])
+        & (south[:, np.newaxis] <= north[np.newaxis, :])
+        & (south[np.newaxis, :] <= north[:, np.newaxis])
+    )
+    if np.count_nonzero(overlap) > len(parts):
+        return None
+
+    for cat, rings in parts:
+        centroid = get_interior_point(rings)
+        if centroid is None:
+            return None
+        for ring in rings:
+            lines.append("B  %i" % len(ring))
+            lines += [_format_coordinate(x, y) for x, y in ring]
+        lines += ["C  1 1", _format_coordinate(*centroid), " 1 %i" % cat]
+    return "\n".join(lines) + "\n"
+
+
+def create_geojson_import_pc(
+    geojson, project_epsg, temp_file_path, output, process_id
+):
+    """Create the process chain entry that imports a GeoJSON definition as
+    vector map layer
+
+    GeoJSON definitions in the coordinate reference system of the project
+    that can be converted with geojson_to_grass_ascii() are imported with
+    v.in.ascii, which skips OGR, the temporary reprojection project and the
+    topology cleaning of v.import. All other definitions are imported with
+    v.import. v.in.ascii does not create an attribute table.
+
+    Args:
+        geojson (dict): The GeoJSON definition, a string is parsed as JSON
+        project_epsg (int): The EPSG code of the project
+        temp_file_path (str): The directory of the temporary input file
+        output (str): The name of the vector map layer
+        process_id (str): The process id of the import
+
+    Returns:
+        tuple: (process chain entry, True if v.in.ascii is used)
+    """
+    if isinstance(geojson, str):
+        geojson_text = geojson.strip()
+    else:
+        geojson_text = json.dumps(geojson)
+    geojson = load_geojson(geojson)
+
+    ascii_text = None
+    if (
+        geojson is not None
+        and project_epsg is not None
+        and get_geojson_epsg(geojson) == project_epsg
+    ):
+        ascii_text = geojson_to_grass_ascii(geojson)
+
+    input_file = tempfile.NamedTemporaryFile(
+        dir=temp_file_path, delete=False, mode="w"
+    )
+    if ascii_text is not None:
+        input_file.write(ascii_text)
+        input_file.close()
+        return {
+            "id": process_id,
+            "module": "v.in.ascii",
+            "inputs": [
+                {"param": "input", "value": input_file.name},
+                {"param": "format", "value": "standard"},
+            ],
+            "outputs": [{"param": "output", "value": output}],
+            "flags": "n",
+            "superquiet": True
+        }, True
+
+    input_file.write(geojson_text)
+    input_file.close()
+    return {
+        "id": process_id,
+        "module": "v.import",
+        "inputs": [{"param": "input", "value": input_file.name}],
+        "outputs": [{"param": "output", "value": output}],
+        "superquiet": True
+    }, False
+
+
+def get_feature_fid(features, cat):
+    """Return the fid property of the feature with the category cat, that
+    was assigned by v.import or v.in.ascii, or None
+
+    Args:
+        features (list): The GeoJSON features
+        cat (int): The category of the feature, starting with 1
+    """
+    index = int(cat) - 1
+    if 0 <= index < len(features):
+        properties = features[index].get("properties") or {}
+        if "fid" in properties:
+            return str(properties["fid"])
+    return None
+
+
+def _rasterize_rings(rings, region):
+    """Compute the cell coverage of the polygon defined by the rings
+
+    A cell is covered if its center is inside of the polygon, using the
+    even-odd rule so that inner rings are holes.
+
+    Returns:
+        tuple: (first row, first col, coverage) with the boolean coverage
+               array of the bounding window of the polygon inside the
+               region, or None if no cell is covered
+    """
+    north = region["north"]
+    west = region["west"]
+    nsres = region["nsres"]
+    ewres = region["ewres"]
+
+    x0 = np.concatenate([ring[:-1, 0] for ring in rings])
+    y0 = np.concatenate([ring[:-1, 1] for ring in rings])
+    x1 = np.concatenate([ring[1:, 0] for ring in rings])
+    y1 = np.concatenate([ring[1:, 1] for ring in rings])
+    ymin = np.minimum(y0, y1)
+    ymax = np.maximum(y0, y1)
+
+    # The rows whose cell center y fulfills ymin <= y < ymax, horizontal
+    # edges have no row
+    first = np.floor((north - ymax) / nsres - 0.5).astype(np.int64) + 1
+    last = np.floor((north - ymin) / nsres - 0.5).astype(np.int64)
+    first = np.maximum(first, 0)
+    last = np.minimum(last, region["rows"] - 1)
+    counts = np.maximum(last - first + 1, 0)
+    if counts.sum() == 0:
+        return None
+
+    # One crossing per edge and row
+    edges = np.repeat(np.arange(len(x0)), counts)
+    starts = np.cumsum(counts) - counts
+    row_index = first[edges] + np.arange(counts.sum()) - starts[edges]
+    y = north - (row_index + 0.5) * nsres
+    x = x0[edges] + (y - y0[edges]) * (x1[edges] - x0[edges]) / (
+        y1[edges] - y0[edges]
+    )
+
+    # Each row has an even number of crossings, after sorting by row and x
+    # consecutive crossings are the start and end of an inside interval
+    order = np.lexsort((x, row_index))
+    row_index = row_index[order][0::2]
+    x = x[order]
+    col_start = np.ceil((x[0::2] - west) / ewres - 0.5).astype(np.int64)
+    col_end = np.ceil((x[1::2] - west) / ewres - 0.5).astype(np.int64)
+    col_start = np.clip(col_start, 0, region["cols"])
+    col_end = np.clip(col_end, 0, region["cols"])
+    valid = col_end > col_start
+    if not valid.any():
+        return None
+    row_index = row_index[valid]
+    col_start = col_start[valid]
+    col_end = col_end[valid]
+
+    row_offset = row_index.min()
+    col_offset = col_start.min()
+    diff = np.zeros(
+        (row_index.max() - row_offset + 1, col_end.max() - col_offset + 1),
+        dtype=np.int32,
+    )
+    np.add.at(diff, (row_index - row_offset, col_start - col_offset), 1)
+    np.add.at(diff, (row_index - row_offset, col_end - col_offset), -1)
+    coverage = np.cumsum(diff, axis=1)[:, :-1] > 0
+
+    return row_offset, col_offset, coverage
+
+
+def iter_feature_coverage(feature_rings, region):
+    """Iterate over the cell coverage of each polygon feature
+
+    Unlike rasterize_features() overlapping features keep all their cells.
+
+    Args:
+        feature_rings (list): For each feature a list of rings, see
+                              get_polygon_rings()
+        region (dict): The raster region with the keys north, west, nsres,
+                       ewres, rows and cols
+
+    Yields:
+        tuple: (zone, first row, first col, coverage) for each feature that
+               covers cells of the region, the zone of the n-th feature is
+               n
+    """
+    for zone, rings in enumerate(feature_rings, start=1):
+        if not rings:
+            continue
+        result = _rasterize_rings(rings, region)
+        if result is None:
+            continue
+        row_offset, col_offset, coverage = result
+        yield zone, row_offset, col_offset, coverage
+
+
+def rasterize_features(feature_rings, region):
+    """Rasterize polygon features into a zone array
+
+    A cell belongs to a feature if its center is inside of the feature. The
+    zone of the n-th feature is n, cells outside of all features have the
+    zone 0. Later features overwrite earlier features where they overlap.
+
+    Args:
+        feature_rings (list): For each feature a list of rings, see
+                              get_polygon_rings()
+        region (dict): The raster region with the keys north, west, nsres,
+                       ewres, rows and cols
+
+    Returns:
+        numpy.ndarray: The int32 zone array of shape (rows, cols)
+    """
+    zones = np.zeros((region["rows"], region["cols"]), dtype=np.int32)
+    for zone, row_offset, col_offset, coverage in iter_feature_coverage(
+        feature_rings, region
+    ):
+        window = zones[
+            row_offset:row_offset + coverage.shape[0],
+            col_offset:col_offset + coverage.shape[1],
+        ]
+        window[coverage] = zone
+    return zones
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Mergeable accumulator of the moments of raster cell values
+
+The partial results of the row bands of the approximate univariate
+statistics are combined with the exact parallel merge of Chan et al., so
+that splitting the computation does not change the moments.
+"""
+
+import math
+import numpy as np
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class MomentAccumulator(object):
+    """
+    Count, sum, Welford mean and sum of squared deviations (M2), minimum
+    and maximum of cell values
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, values):
+        """Add cell values, the values are accumulated as a partial result
+        that is merged
+
+        Args:
+            values (numpy.ndarray): The cell values without NULL cells
+        """
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        partial = MomentAccumulator()
+        partial.count = int(values.size)
+        partial.sum = float(values.sum())
+        partial.mean = partial.sum / partial.count
+        partial.m2 = float(np.square(values - partial.mean).sum())
+        partial.minimum = float(values.min())
+        partial.maximum = float(values.max())
+        self.merge(partial)
+
+    def merge(self, other):
+        """Merge the moments of another accumulator into this accumulator
+
+        Args:
+            other (MomentAccumulator): The accumulator to merge
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.sum = other.sum
+            self.mean = other.mean
+            self.m2 = other.m2
+            self.minimum = other.minimum
+            self.maximum = other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        """The population variance like r.univar"""
+        if self.count == 0:
+            return math.nan
+        return self.m2 / self.count
+
+    @property
+    def stddev(self):
+        """The population standard deviation like r.univar"""
+        return math.sqrt(self.variance)
+
+    @property
+    def coeff_var(self):
+        """The coefficient of variation in percent like r.univar"""
+        if self.count == 0 or self.mean == 0:
+            return math.nan
+        return 100.0 * self.stddev / abs(self.mean)
+
+    def get_statistics(self):
+        """Return the univariate statistics of the moments by method name,
+        see univar_methods.UNIVAR_METHODS
+
+        Returns:
+            dict: The statistics, without median
+        """
+        return {
+            "number": float(self.count),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "range": self.maximum - self.minimum,
+            "average": self.mean,
+            "stddev": self.stddev,
+            "sum": self.sum,
+            "variance": self.variance,
+            "coeff_var": self.coeff_var,
+        }
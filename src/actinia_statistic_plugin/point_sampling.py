@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Helper functions to sample raster map layers at points
+
+The coordinates of the sample points are converted into row and column
+indices of a cell grid once with numpy. All raster map layers that share the
+grid are queried at the cell centers, so that no coordinate conversion is
+repeated for each raster map layer. Points with identical coordinates or in
+the same cell are sampled once and the values are expanded to all point ids.
+"""
+
+import numpy as np
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+# The value of NULL cells and of points outside of the cell grid like r.what
+NULL_VALUE = "*"
+
+# The maximum number of coordinates of a r.what run, to keep the length of
+# the coordinates parameter below the argument length limit
+R_WHAT_MAX_COORDINATES = 1000
+
+
+def parse_sample_points(points):
+    """Parse the [id, x, y] sample points of a request
+
+    Args:
+        points (list): The list of [id, x, y] points
+
+    Raises:
+        ValueError: In case of a wrong number of entries or invalid
+                    coordinates
+
+    Returns:
+        tuple: (ids, coordinates) the list of point ids and the float64
+               array of shape (points, 2) with the x and y coordinates
+    """
+    ids = []
+    coordinates = []
+    for point in points:
+        if len(point) != 3:
+            raise ValueError("Wrong number of coordinate entries")
+        point_id, x, y = point
+        try:
+            coordinates.append((float(x), float(y)))
+        except (TypeError, ValueError):
+            raise ValueError(
+                "Invalid coordinates of point <%s>" % str(point_id)
+            )
+        ids.append(str(point_id))
+    return ids, np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+
+
+def get_grid_key(grid):
+    """Return a hashable key of a cell grid from tile_index.get_header_grid()
+    to group raster map layers with identical grids"""
+    return tuple(sorted(grid.items()))
+
+
+def compute_cell_indices(grid, coordinates):
+    """Convert coordinates into the row and column indices of a cell grid
+
+    Args:
+        grid (dict): The cell grid with the keys north, west, nsres, ewres,
+                     rows and cols
+        coordinates (numpy.ndarray): The x and y coordinates of shape
+                                     (points, 2)
+
+    Returns:
+        tuple: (rows, cols, inside) the int64 row and column indices and the
+               mask of the points inside of the grid
+    """
+    rows = np.floor(
+        (grid["north"] - coordinates[:, 1]) / grid["nsres"]
+    ).astype(np.int64)
+    cols = np.floor(
+        (coordinates[:, 0] - grid["west"]) / grid["ewres"]
+    ).astype(np.int64)
+    inside = (
+        (rows >= 0) & (rows < grid["rows"]) & (cols >= 0)
+        & (cols < grid["cols"])
+    )
+    return rows, cols, inside
+
+
+def get_cell_centers(grid, rows, cols):
+    """Return the coordinates of the cell centers of row and column indices
+
+    Returns:
+        numpy.ndarray: The x and y coordinates of shape (cells, 2)
+    """
+    x = grid["west"] + (cols + 0.5) * grid["ewres"]
+    y = grid["north"] - (rows + 0.5) * grid["nsres"]
+    return np.column_stack((x, y))
+
+
+def get_points_region(grid, coordinates):
+    """Return the region aligned to a cell grid that covers the cells of all
+    points, points outside of the grid extend the region beyond the grid
+
+    Args:
+        grid (dict): The cell grid from tile_index.get_header_grid()
+        coordinates (numpy.ndarray): The x and y coordinates of shape
+                                     (points, 2)
+
+    Returns:
+        dict: The region with the keys north, south, east, west, nsres and
+              ewres
+    """
+    rows, cols, _ = compute_cell_indices(grid, coordinates)
+    return {
+        "north": grid["north"] - int(rows.min()) * grid["nsres"],
+        "south": grid["north"] - (int(rows.max()) + 1) * grid["nsres"],
+        "east": grid["west"] + (int(cols.max()) + 1) * grid["ewres"],
+        "west": grid["west"] + int(cols.min()) * grid["ewres"],
+        "nsres": grid["nsres"],
+        "ewres": grid["ewres"],
+    }
+
+
+def deduplicate_points(coordinates, grid=None):
+    """Find the unique sample locations of points
+
+    Without cell grid points are identical if they have the same
+    coordinates. With a cell grid points are identical if they are located
+    in the same cell, points outside of the grid only if they have the same
+    coordinates.
+
+    Args:
+        coordinates (numpy.ndarray): The x and y coordinates of shape
+                                     (points, 2)
+        grid (dict): The cell grid from tile_index.get_header_grid() or None
+
+    Returns:
+        tuple: (unique, inverse) the int64 positions of the first point of
+               each unique location in the order of the points and the
+               int64 position in unique of each point
+    """
+    keys = [tuple(coordinate) for coordinate in coordinates.tolist()]
+    if grid is not None:
+        rows, cols, inside = compute_cell_indices(grid, coordinates)
+        keys = [
+            (row, col) if is_inside else key
+            for key, row, col, is_inside in zip(
+                keys, rows.tolist(), cols.tolist(), inside.tolist()
+            )
+        ]
+    unique = []
+    inverse = []
+    positions = {}
+    for position, key in enumerate(keys):
+        index = positions.setdefault(key, len(unique))
+        if index == len(unique):
+            unique.append(position)
+        inverse.append(index)
+    return np.array(unique, dtype=np.int64), np.array(inverse, dtype=np.int64)
+
+
+def expand_sample_rows(rows, ids, inverse):
+    """Expand the rows of the t.rast.sample layout that were sampled at the
+    unique locations of deduplicate_points() to all points
+
+    Args:
+        rows: An iterable of the header and the rows with the values of the
+              unique locations
+        ids (list): The ids of all points
+        inverse (numpy.ndarray): The position in the unique locations of each
+                                 point
+
+    Yields:
+        list: The header with all point ids and the rows with the values of
+              all points
+    """
+    inverse = inverse.tolist()
+    header = True
+    for row in rows:
+        if header:
+            header = False
+            yield row[:2] + list(ids)
+            continue
+        values = row[2:]
+        yield row[:2] + [values[index] for index in inverse]
+
+
+def format_coordinates(coordinates):
+    """Format coordinates as comma separated x,y list for r.what"""
+    return ",".join(repr(float(value)) for value in coordinates.ravel())
+
+
+def parse_r_what_values(stdout, num_points, num_maps):
+    """Parse the values of the r.what output, the values of the raster map
+    layers are the last columns of each line
+
+    Args:
+        stdout (str): The r.what output without header
+        num_points (int): The number of queried coordinates
+        num_maps (int): The number of queried raster map layers
+
+    Raises:
+        ValueError: If the number of lines or values is wrong
+
+    Returns:
+        numpy.ndarray: The value strings of shape (num_points, num_maps)
+    """
+    lines = [line for line in stdout.splitlines() if line.strip()]
+    if len(lines) != num_points:
+        raise ValueError(
+            "r.what returned %i instead of %i lines"
+            % (len(lines), num_points)
+        )
+    values = np.full((num_points, num_maps), NULL_VALUE, dtype=object)
+    for position, line in enumerate(lines):
+        fields = line.strip().split("|")
+        if len(fields) < num_maps:
+            raise ValueError("r.what returned too few values")
+        values[position] = fields[len(fields) - num_maps:]
+    return values
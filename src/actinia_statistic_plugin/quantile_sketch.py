@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Mergeable streaming quantile sketch of raster cell values
+
+The sketch is a histogram with a fixed number of bins over the value range
+of the raster map layer, which is known from its range file before the
+cells are scanned. Cells are added in chunks, sketches of the same range
+are merged by adding their bins, so that partial results of row bands or
+tiles can be combined. A quantile is answered with the center of the bin
+that contains the cell of the nearest rank, its absolute error is at most
+half of the bin width. Integer raster map layers with fewer categories than
+bins have one bin per value and exact quantiles.
+"""
+
+import math
+import numpy as np
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class QuantileSketch(object):
+    """
+    Fixed range histogram sketch to approximate quantiles
+    """
+
+    def __init__(self, minimum, maximum, bins, integer=False):
+        """
+        Args:
+            minimum (float): The minimum value of the cells
+            maximum (float): The maximum value of the cells
+            bins (int): The maximum number of bins
+            integer (bool): True if the cells are integer values
+        """
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.integer = integer
+        value_range = self.maximum - self.minimum
+        if (integer is True and value_range + 1 <= bins) or value_range == 0:
+            # One bin per value, the quantiles are exact
+            self.bins = int(value_range) + 1
+            self.width = 1.0
+            self.lower = self.minimum - 0.5
+            self.exact = True
+        else:
+            self.bins = int(bins)
+            self.width = value_range / self.bins
+            self.lower = self.minimum
+            self.exact = False
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    @property
+    def count(self):
+        """The number of added cells"""
+        return int(self.counts.sum())
+
+    @property
+    def error_bound(self):
+        """The maximum absolute error of a quantile"""
+        if self.exact is True:
+            return 0.0
+        return self.width / 2.0
+
+    def add(self, values):
+        """Add cell values to the sketch
+
+        Args:
+            values (numpy.ndarray): The cell values without NULL cells
+        """
+        index = np.floor((values - self.lower) / self.width).astype(np.int64)
+        # The maximum is the upper edge of the last bin
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def merge(self, other):
+        """Merge another sketch of the same range into this sketch
+
+        Args:
+            other (QuantileSketch): The sketch to merge
+
+        Raises:
+            ValueError: If the sketches have different bins
+        """
+        if (
+            other.bins != self.bins
+            or other.lower != self.lower
+            or other.width != self.width
+        ):
+            raise ValueError("Unable to merge sketches with different bins")
+        self.counts += other.counts
+
+    def quantile(self, q):
+        """Return the approximate value of the cell of the nearest rank
+        ceil(q * count)
+
+        Args:
+            q (float): The quantile between 0 and 1
+
+        Returns:
+            float: The value or None if the sketch is empty
+        """
+        count = self.count
+        if count == 0:
+            return None
+        rank = min(max(int(math.ceil(q * count)), 1), count)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        if self.exact is True:
+            return self.minimum + index
+        return self.lower + (index + 0.5) * self.width
+
+    def to_dict(self):
+        """Serialize the sketch, the bins are stored sparse
+
+        Returns:
+            dict: The JSON serializable sketch
+        """
+        index = np.flatnonzero(self.counts)
+        return {
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "bins": self.bins,
+            "integer": self.integer,
+            "index": index.tolist(),
+            "counts": self.counts[index].tolist(),
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Create a sketch from its serialization
+
+        Args:
+            data (dict): The sketch from to_dict()
+
+        Returns:
+            QuantileSketch: The sketch
+        """
+        sketch = QuantileSketch(
+            data["minimum"], data["maximum"], data["bins"], data["integer"]
+        )
+        sketch.counts[np.array(data["index"], dtype=np.int64)] = data["counts"]
+        return sketch
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Build or refresh the category histogram tile index of a raster map layer
+that is used by the index engine of the raster area statistics.
+"""
+
+import math
+import os
+import pickle
+from copy import deepcopy
+from flask import jsonify, make_response, request
+from flask_restful_swagger_2 import swagger
+from actinia_core.models.response_models import ProcessingErrorResponseModel
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_core.rest.base.resource_base import ResourceBase
+from actinia_core.rest.base.user_auth import check_admin_role
+from actinia_core.core.common.kvdb_interface import enqueue_job
+from actinia_core.core.common.app import auth
+from actinia_core.core.common.api_logger import log_api_call
+from .config import AREA_STATS_INDEX_TILE_SIZE
+from .ephemeral_raster_area_stats import (
+    AsyncEphemeralRasterAreaStats,
+    NULL_CELL,
+)
+from .raster_utils import read_raster_header
+from .response_models import (
+    RasterAreaStatsIndexResponseModel,
+    RasterAreaStatsIndexResultModel,
+)
+from .tile_index import (
+    compute_band_histograms,
+    create_tile_index,
+    get_header_grid,
+    get_raster_data_mtime,
+    get_tile_index_path,
+    write_tile_index,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+SCHEMA_DOC = {
+    "tags": ["Raster Statistics"],
+    "description": "Build or refresh the category histogram tile index of an "
+    "integer raster map layer. The cell grid of the raster map layer is "
+    "divided into square tiles and the number of cells of each category is "
+    "stored for each tile in the resource storage of actinia, per user "
+    "group. The index engine of the areal categorical statistics sums the "
+    "histograms of the tiles inside of the polygon and reads only the tiles "
+    "crossed by the polygon boundary. The index is outdated as soon as the "
+    "raster map layer is modified and must be refreshed. "
+    "Minimum required user role: admin.",
+    "parameters": [
+        {
+            "name": "project_name",
+            "description": "The project name",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "mapset_name",
+            "description": "The name of the mapset that contains the required "
+                           "raster map layer",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "raster_name",
+            "description": "The name of the raster map layer to index",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "tile_size",
+            "description": "The number of rows and columns of a tile. The "
+                           "default is set in the plugin configuration.",
+            "required": False,
+            "in": "query",
+            "type": "integer",
+        },
+    ],
+    "responses": {
+        "200": {
+            "description": "The size of the tile index",
+            "schema": RasterAreaStatsIndexResponseModel,
+        },
+        "400": {
+            "description": "The error message and a detailed log why the "
+                           "tile index was not built",
+            "schema": ProcessingErrorResponseModel,
+        },
+    },
+}
+
+
+class AsyncRasterAreaStatsIndexResource(ResourceBase):
+    """
+    Build or refresh the category histogram tile index of a raster map
+    layer, asynchronous call
+    """
+
+    decorators = [log_api_call, check_admin_role, auth.login_required]
+
+    def _execute(self, project_name, mapset_name, raster_name):
+
+        tile_size = request.args.get("tile_size", AREA_STATS_INDEX_TILE_SIZE)
+        try:
+            tile_size = int(tile_size)
+        except ValueError:
+            tile_size = 0
+        if tile_size <= 0:
+            self.create_error_response(
+                message="The tile size must be a positive integer"
+            )
+            return None
+
+        rdc = self.preprocess(
+            has_json=False,
+            has_xml=False,
+            project_name=project_name,
+            mapset_name=mapset_name,
+            map_name=raster_name,
+        )
+        if rdc:
+            rdc.set_user_data({"tile_size": tile_size})
+            enqueue_job(self.job_timeout, start_job, rdc)
+
+        return rdc
+
+    @swagger.doc(deepcopy(SCHEMA_DOC))
+    def post(self, project_name, mapset_name, raster_name):
+        """
+        Build or refresh the category histogram tile index of a raster map
+        layer asynchronously
+        """
+        self._execute(project_name, mapset_name, raster_name)
+        html_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), html_code)
+
+
+class SyncRasterAreaStatsIndexResource(AsyncRasterAreaStatsIndexResource):
+    """
+    Build or refresh the category histogram tile index of a raster map
+    layer, synchronous call
+    """
+
+    decorators = [log_api_call, check_admin_role, auth.login_required]
+
+    @swagger.doc(deepcopy(SCHEMA_DOC))
+    def post(self, project_name, mapset_name, raster_name):
+        """
+        Build or refresh the category histogram tile index of a raster map
+        layer synchronously
+        """
+        check = self._execute(project_name, mapset_name, raster_name)
+        if check is not None:
+            http_code, response_model = self.wait_until_finish()
+        else:
+            http_code, response_model = pickle.loads(self.response_data)
+        return make_response(jsonify(response_model), http_code)
+
+
+def start_job(*args):
+    processing = AsyncRasterAreaStatsIndex(*args)
+    processing.run()
+
+
+class AsyncRasterAreaStatsIndex(AsyncEphemeralRasterAreaStats):
+    """
+    Read the raster map layer in row bands of one tile height, compute the
+    category histogram of each tile and write the index into the resource
+    storage.
+    """
+
+    def __init__(self, *args):
+        AsyncEphemeralRasterAreaStats.__init__(self, *args)
+        self.response_model_class = RasterAreaStatsIndexResponseModel
+
+    def _execute(self):
+
+        self._setup()
+
+        name = self.map_name
+        mapset = self.mapset_name
+        tile_size = self.rdc.user_data["tile_size"]
+        self.required_mapsets.append(mapset)
+        self._create_temporary_grass_environment()
+
+        header = read_raster_header(self.temp_project_path, mapset, name)
+        if header["format"] < 0:
+            raise AsyncProcessError(
+                "The tile index requires an integer raster map layer, "
+                "<%s@%s> is a floating point raster map layer"
+                % (name, mapset)
+            )
+
+        # The mapset is linked read-only into the temporary project, the
+        # index is written into the resource storage
+        mapset_path = os.path.join(self.temp_project_path, mapset)
+        data_mtime = get_raster_data_mtime(mapset_path, name)
+        grid = get_header_grid(header)
+
+        band_histograms = []
+        for first_row in range(0, grid["rows"], tile_size):
+            end_row = min(first_row + tile_size, grid["rows"])
+            band_region = {
+                "north": grid["north"] - first_row * grid["nsres"],
+                "south": grid["north"] - end_row * grid["nsres"],
+                "west": grid["west"],
+                "east": header["east"],
+                "nsres": grid["nsres"],
+                "ewres": grid["ewres"],
+                "rows": end_row - first_row,
+                "cols": grid["cols"],
+            }
+            values = self._read_raster_window(name + "@" + mapset, band_region)
+            band_histograms.append(
+                compute_band_histograms(values, tile_size, NULL_CELL)
+            )
+
+        index = create_tile_index(grid, tile_size, band_histograms, data_mtime)
+        try:
+            write_tile_index(
+                get_tile_index_path(
+                    self.config.GRASS_RESOURCE_DIR,
+                    self.user_group,
+                    self.project_name,
+                    mapset,
+                    name,
+                ),
+                index,
+            )
+        except OSError as e:
+            raise AsyncProcessError(
+                "Unable to write the tile index of raster map layer "
+                "<%s@%s>: %s" % (name, mapset, str(e))
+            )
+
+        self.module_results = RasterAreaStatsIndexResultModel(
+            raster_name=name + "@" + mapset,
+            tile_size=tile_size,
+            tile_rows=int(math.ceil(grid["rows"] / tile_size)),
+            tile_cols=int(math.ceil(grid["cols"] / tile_size)),
+            entries=len(index["counts"]),
+        )
@@ -3,9 +3,9 @@
 Perform raster map sampling on a raster map layer based on input points.
 """
 
+import os
 import pickle
-import tempfile
-from flask import jsonify, make_response
+from flask import jsonify, make_response, request
 from copy import deepcopy
 from flask_restful_swagger_2 import swagger
 from flask_restful_swagger_2 import Schema
@@ -18,7 +18,24 @@ from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.kvdb_interface import enqueue_job
 from actinia_core.core.common.app import auth
 from actinia_core.core.common.api_logger import log_api_call
+from .point_sampling import (
+    R_WHAT_MAX_COORDINATES,
+    deduplicate_points,
+    format_coordinates,
+    get_points_region,
+    parse_sample_points,
+)
+from .raster_utils import read_raster_header
 from .response_models import RasterSamplingResponseModel
+from .result_formats import (
+    NPZ_FILE_NAME,
+    RASTER_OUTPUT_FORMAT_DESCRIPTIONS,
+    create_output_format_parameters,
+    parse_dtype,
+    parse_output_format,
+    write_raster_sample_npz,
+)
+from .tile_index import get_header_grid
 
 
 __license__ = "GPLv3"
@@ -47,6 +64,10 @@ class PointListModel(Schema):
     required = ["points"]
 
 
+# The output formats of the raster sampling, npz stores the arrays point_id,
+# easting, northing and value
+RASTER_SAMPLING_OUTPUT_FORMATS = ["json", "npz"]
+
 SCHEMA_DOC = {
     "tags": ["Raster Sampling"],
     "description": "Spatial sampling of a raster dataset with vector points. "
@@ -91,6 +112,9 @@ SCHEMA_DOC = {
             "in": "body",
             "schema": PointListModel,
         },
+        *create_output_format_parameters(
+            RASTER_SAMPLING_OUTPUT_FORMATS, RASTER_OUTPUT_FORMAT_DESCRIPTIONS
+        ),
     ],
     "responses": {
         "200": {
@@ -116,6 +140,15 @@ class AsyncEphemeralRasterSamplingResource(ResourceBase):
 
     def _execute(self, project_name, mapset_name, raster_name):
 
+        try:
+            output_format = parse_output_format(
+                request.args, RASTER_SAMPLING_OUTPUT_FORMATS
+            )
+            dtype = parse_dtype(request.args)
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return None
+
         rdc = self.preprocess(
             has_json=True,
             has_xml=False,
@@ -124,6 +157,7 @@ class AsyncEphemeralRasterSamplingResource(ResourceBase):
             map_name=raster_name,
         )
         if rdc:
+            rdc.set_user_data({"output_format": output_format, "dtype": dtype})
             enqueue_job(self.job_timeout, start_job, rdc)
 
         return rdc
@@ -175,6 +209,34 @@ class AsyncEphemeralRasterSampling(EphemeralProcessing):
         EphemeralProcessing.__init__(self, *args)
         self.response_model_class = RasterSamplingResponseModel
 
+    def _store_npz(self, rows, column_names, points, dtype):
+        """Store the r.what result as .npz file in the resource storage
+
+        Args:
+            rows (list): The r.what output rows split into their values
+            column_names (list): The column names of the rows
+            points (list): The [id, x, y] sample points
+            dtype (str): The data type of the values
+        """
+        columns = {
+            name: position for position, name in enumerate(column_names)
+        }
+        file_path = os.path.join(self.temp_file_path, NPZ_FILE_NAME)
+        write_raster_sample_npz(
+            file_path,
+            [point[0] for point in points],
+            [row[columns["easting"]] for row in rows],
+            [row[columns["northing"]] for row in rows],
+            [row[columns["value"]] for row in rows],
+            dtype,
+        )
+        self.storage_interface = self.rdc.create_storage_interface()
+        self.storage_interface.setup()
+        self.resource_url_list.append(
+            self.storage_interface.store_resource(file_path)
+        )
+        self.module_results = []
+
     def _execute(self):
 
         self._setup()
@@ -186,85 +248,95 @@ class AsyncEphemeralRasterSampling(EphemeralProcessing):
         if not points or len(points) == 0:
             raise AsyncProcessError("Empty coordinate list")
 
-        point_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
-        )
-        result_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
-        )
-
-        for tuple in points:
-            if len(tuple) != 3:
-                raise AsyncProcessError("Wrong number of coordinate entries")
+        try:
+            _, coordinates = parse_sample_points(points)
+        except ValueError as e:
+            raise AsyncProcessError(str(e))
 
-            id, x, y = tuple
-            row = "%s|%s|%s\n" % (id, x, y)
-            point_file.write(row.encode())
+        # Points with identical coordinates are sampled once
+        unique, inverse = deduplicate_points(coordinates)
+        unique_coordinates = coordinates[unique]
 
-        point_file.flush()
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
 
+        # The coordinates are passed to r.what directly, the point ids stay
+        # in the plugin. The region covers the cells of all points aligned to
+        # the raster map layer. r.what only reads the rows that contain
+        # points, so the number of cells of the region is not checked.
+        raster_name_qualified = "%s@%s" % (raster_name, self.mapset_name)
+        header = read_raster_header(
+            self.temp_project_path, self.mapset_name, raster_name
+        )
+        region = get_points_region(
+            get_header_grid(header), unique_coordinates
+        )
         pc = {
             "list": [
                 {
-                    "id": "v_in_ascii_1",
-                    "module": "v.in.ascii",
-                    "inputs": [
-                        {"param": "input", "value": point_file.name},
-                        {"param": "format", "value": "point"},
-                        {
-                            "param": "column",
-                            "value": "id text, x double precision, y double "
-                                     "precision",
-                        },
-                        {"param": "x", "value": "2"},
-                        {"param": "y", "value": "3"},
-                    ],
-                    "outputs": [{"param": "output", "value": "input_points"}],
-                    "superquiet": True
-                },
-                {
-                    "id": "g_region_2",
+                    "id": "g_region_1",
                     "module": "g.region",
                     "inputs": [
-                        {"param": "vector", "value": "input_points"},
-                        {
-                            "param": "align",
-                            "value": "%s@%s" % (raster_name, self.mapset_name),
-                        },
+                        {"param": "n", "value": "%.17g" % region["north"]},
+                        {"param": "s", "value": "%.17g" % region["south"]},
+                        {"param": "e", "value": "%.17g" % region["east"]},
+                        {"param": "w", "value": "%.17g" % region["west"]},
+                        {"param": "nsres", "value": "%.17g" % region["nsres"]},
+                        {"param": "ewres", "value": "%.17g" % region["ewres"]},
                     ],
-                    "flags": "p",
                     "superquiet": True
                 },
+            ],
+            "version": "1",
+        }
+        r_what_runs = []
+        for first in range(0, len(unique), R_WHAT_MAX_COORDINATES):
+            batch = unique_coordinates[first:first + R_WHAT_MAX_COORDINATES]
+            r_what_id = "r_what_%i" % (len(pc["list"]) + 1)
+            r_what_runs.append((r_what_id, len(batch)))
+            pc["list"].append(
                 {
-                    "id": "r_what_3",
+                    "id": r_what_id,
                     "module": "r.what",
                     "inputs": [
+                        {"param": "map", "value": raster_name_qualified},
                         {
-                            "param": "map",
-                            "value": "%s@%s" % (raster_name, self.mapset_name),
+                            "param": "coordinates",
+                            "value": format_coordinates(batch),
                         },
-                        {"param": "points", "value": "input_points"},
-                    ],
-                    "outputs": [
-                        {"param": "output", "value": result_file.name}
+                        {"param": "separator", "value": "pipe"},
                     ],
                     "flags": "nrf",
-                    "overwrite": True,
                     "superquiet": True,
-                },
-            ],
-            "version": "1",
-        }
-
-        self.request_data = pc
-
-        # Run the process chain
-        EphemeralProcessing._execute(self, skip_permission_check=True)
+                }
+            )
 
-        result = open(result_file.name, "r").readlines()
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        # Each r.what run prints a header line
+        header_line = None
+        unique_lines = []
+        for r_what_id, num_points in r_what_runs:
+            lines = [
+                line
+                for line in self.module_output_dict[r_what_id][
+                    "stdout"
+                ].splitlines()
+                if line.strip()
+            ]
+            if len(lines) != num_points + 1:
+                raise AsyncProcessError(
+                    "r.what returned %i instead of %i lines"
+                    % (len(lines) - 1, num_points)
+                )
+            header_line = lines[0]
+            unique_lines.extend(lines[1:])
 
         output_list = []
-        raster_name_qualified = "%s@%s" % (raster_name, self.mapset_name)
         # remove map name from columns
         colum_name = [
             col
@@ -272,9 +344,23 @@ class AsyncEphemeralRasterSampling(EphemeralProcessing):
             else col.replace(f"{raster_name_qualified}_", "").replace(
                 raster_name_qualified, "value"
             )
-            for col in result[0].strip().split("|")
+            for col in header_line.strip().split("|")
         ]
-        for line, point in zip(result[1:], points):
+
+        # Expand the lines of the unique points to all points
+        lines = [unique_lines[index] for index in inverse.tolist()]
+
+        user_data = self.rdc.user_data or {}
+        if user_data.get("output_format", "json") == "npz":
+            self._store_npz(
+                [line.strip().split("|") for line in lines],
+                colum_name,
+                points,
+                user_data.get("dtype", "float64"),
+            )
+            return
+
+        for line, point in zip(lines, points):
             entry = dict()
             entry[point[0]] = {
                 key: value
@@ -288,6 +374,3 @@ class AsyncEphemeralRasterSampling(EphemeralProcessing):
             output_list.append(entry)
 
         self.module_results = output_list
-
-        point_file.close()
-        result_file.close()
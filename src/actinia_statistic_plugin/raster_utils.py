@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Helper functions to access the metadata of the project and of raster map
+layers that are linked into the temporary GRASS GIS database of a processing
+job.
+"""
+
+import math
+import os
+import re
+from actinia_core.core.common.exceptions import AsyncProcessError
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+# The legal names of GRASS GIS map layers and mapsets, see G_legal_filename()
+LEGAL_NAME_PATTERN = re.compile(r"^[^./\"'@,=*~\s][^/\"'@,=*~\s]*$")
+
+
+def check_raster_name(name, mapset):
+    """Check the name and the mapset of a raster map layer against the legal
+    GRASS GIS names, so that they can be used as path components
+
+    Args:
+        name (str): The name of the raster map layer
+        mapset (str): The mapset of the raster map layer
+
+    Raises:
+        AsyncProcessError: In case of an illegal name or mapset
+    """
+    for value in [name, mapset]:
+        if not isinstance(value, str) or LEGAL_NAME_PATTERN.match(
+            value
+        ) is None:
+            raise AsyncProcessError(
+                "Illegal raster map name <%s@%s>" % (name, mapset)
+            )
+
+
+def split_raster_name(raster_name, default_mapset):
+    """Split a raster map name into name and mapset
+
+    Args:
+        raster_name (str): The raster map name, optionally with @mapset
+        default_mapset (str): The mapset to use if none is part of the name
+
+    Returns:
+        tuple: (name, mapset)
+    """
+    if "@" in raster_name:
+        name, mapset = raster_name.split("@", 1)
+        return name, mapset
+    return raster_name, default_mapset
+
+
+def read_raster_header(project_path, mapset, name):
+    """Read the cell header file of a raster map layer
+
+    Reclassified raster map layers have no region in their cell header, the
+    cell header of the base raster map layer is read instead.
+
+    Args:
+        project_path (str): The path to the GRASS GIS project
+        mapset (str): The mapset of the raster map layer
+        name (str): The name of the raster map layer
+
+    Raises:
+        AsyncProcessError: In case of an illegal name, if the raster map
+                           layer does not exist or the cell header is invalid
+
+    Returns:
+        dict: The header entries, the region values converted to float and
+              the number of rows and columns converted to int
+    """
+    visited = set()
+    while True:
+        if (name, mapset) in visited:
+            raise AsyncProcessError(
+                "Cyclic reclassification of raster map <%s@%s>"
+                % (name, mapset)
+            )
+        visited.add((name, mapset))
+
+        check_raster_name(name, mapset)
+        cellhd = os.path.join(project_path, mapset, "cellhd", name)
+        if not os.path.isfile(cellhd):
+            raise AsyncProcessError(
+                "Raster map <%s@%s> not found" % (name, mapset)
+            )
+
+        header = {}
+        with open(cellhd, "r") as cellhd_file:
+            lines = cellhd_file.readlines()
+        for line in lines:
+            if ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            header[key.strip()] = value.strip()
+
+        # The cell header of a reclassified raster map layer starts with
+        # "reclass" and references the base raster map layer
+        if lines and lines[0].strip().lower() == "reclass":
+            if "name" not in header:
+                raise AsyncProcessError(
+                    "Invalid reclass header of raster map <%s@%s>"
+                    % (name, mapset)
+                )
+            name = header["name"]
+            mapset = header.get("mapset") or mapset
+            continue
+        break
+
+    try:
+        for key in ["rows", "cols", "format", "proj"]:
+            header[key] = int(header[key])
+        for key in [
+            "north", "south", "east", "west", "e-w resol", "n-s resol"
+        ]:
+            header[key] = _parse_coordinate(header[key])
+    except (KeyError, ValueError) as e:
+        raise AsyncProcessError(
+            "Invalid cell header of raster map <%s@%s>: %s"
+            % (name, mapset, str(e))
+        )
+
+    return header
+
+
+def _parse_coordinate(value):
+    """Convert a cell header coordinate or resolution into float, the
+    degree:minute:second notation of latitude-longitude projects included
+    """
+    sign = 1.0
+    if value[-1] in "NSEW":
+        if value[-1] in "SW":
+            sign = -1.0
+        value = value[:-1]
+    result = 0.0
+    for count, part in enumerate(value.split(":")):
+        result += float(part) / 60.0 ** count
+    return sign * result
+
+
+def _read_key_value_file(file_path):
+    """Read a GRASS GIS key: value file, return an empty dict if the file
+    does not exist"""
+    entries = {}
+    if not os.path.isfile(file_path):
+        return entries
+    with open(file_path, "r") as key_value_file:
+        for line in key_value_file:
+            if ":" not in line:
+                continue
+            key, value = line.split(":", 1)
+            entries[key.strip().lower()] = value.strip()
+    return entries
+
+
+def get_project_epsg(project_path):
+    """Return the EPSG code of a GRASS GIS project
+
+    Args:
+        project_path (str): The path to the GRASS GIS project
+
+    Returns:
+        int: The EPSG code or None if the project has no EPSG code
+    """
+    permanent = os.path.join(project_path, "PERMANENT")
+    srid_file = os.path.join(permanent, "PROJ_SRID")
+    if os.path.isfile(srid_file):
+        with open(srid_file, "r") as srid:
+            value = srid.read().strip()
+        if value.upper().startswith("EPSG:"):
+            return int(value.split(":", 1)[1])
+    epsg = _read_key_value_file(os.path.join(permanent, "PROJ_EPSG"))
+    if "epsg" in epsg:
+        return int(epsg["epsg"])
+    return None
+
+
+def get_project_meters(project_path):
+    """Return the conversion factor of the project units to meters
+
+    Args:
+        project_path (str): The path to the GRASS GIS project
+
+    Returns:
+        float: The conversion factor, 1.0 if the project has no unit file
+    """
+    units = _read_key_value_file(
+        os.path.join(project_path, "PERMANENT", "PROJ_UNITS")
+    )
+    for key in ["meters", "meter"]:
+        if key in units:
+            return float(units[key])
+    return 1.0
+
+
+def read_raster_cats(project_path, mapset, name):
+    """Read the category labels of an integer raster map layer
+
+    Args:
+        project_path (str): The path to the GRASS GIS project
+        mapset (str): The mapset of the raster map layer
+        name (str): The name of the raster map layer
+
+    Returns:
+        dict: The labels by category number
+    """
+    labels = {}
+    cats = os.path.join(project_path, mapset, "cats", name)
+    if not os.path.isfile(cats):
+        return labels
+    with open(cats, "r") as cats_file:
+        # The first four lines are number of categories, title, label
+        # format and label format coefficients
+        for line in cats_file.readlines()[4:]:
+            if ":" not in line:
+                continue
+            cat, label = line.rstrip("\n").split(":", 1)
+            try:
+                labels[int(cat)] = label
+            except ValueError:
+                continue
+    return labels
+
+
+def align_region(header, bbox):
+    """Compute the region that covers a bounding box and is aligned to the
+    cell grid of a raster map layer, like g.region align=
+
+    Args:
+        header (dict): The raster header from read_raster_header()
+        bbox (tuple): The bounding box (west, south, east, north)
+
+    Returns:
+        dict: The region with the keys north, south, east, west, nsres,
+              ewres, rows and cols
+    """
+    west, south, east, north = bbox
+    nsres = header["n-s resol"]
+    ewres = header["e-w resol"]
+    north = header["north"] - math.floor(
+        round((header["north"] - north) / nsres, 9)
+    ) * nsres
+    south = header["north"] - math.ceil(
+        round((header["north"] - south) / nsres, 9)
+    ) * nsres
+    west = header["west"] + math.floor(
+        round((west - header["west"]) / ewres, 9)
+    ) * ewres
+    east = header["west"] + math.ceil(
+        round((east - header["west"]) / ewres, 9)
+    ) * ewres
+    return {
+        "north": north,
+        "south": south,
+        "east": east,
+        "west": west,
+        "nsres": nsres,
+        "ewres": ewres,
+        "rows": int(round((north - south) / nsres)),
+        "cols": int(round((east - west) / ewres)),
+    }
+
+
+def grid_key(header):
+    """Compute a key that is identical for all raster map layers sharing the
+    same cell grid (resolution and cell alignment)
+
+    Args:
+        header (dict): The raster header from read_raster_header()
+
+    Returns:
+        tuple: The grid key
+    """
+    ewres = header["e-w resol"]
+    nsres = header["n-s resol"]
+    west_offset = round((header["west"] / ewres) % 1.0, 6) % 1.0
+    north_offset = round((header["north"] / nsres) % 1.0, 6) % 1.0
+    return (round(ewres, 9), round(nsres, 9), west_offset, north_offset)
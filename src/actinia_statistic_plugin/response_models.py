@@ -9,6 +9,42 @@ __author__ = "Sören Gebbert, Markus Neteler"
 __copyright__ = "Copyright 2016-2022, Sören Gebbert, Markus Neteler and "
 "mundialis GmbH & Co. KG"
 
+# Reported by the area statistics resources if the result cache is enabled
+CACHE_STATUS_PROPERTY = {
+    "type": "string",
+    "enum": ["hit", "miss"],
+    "description": "Set to hit if the result was answered from the area "
+    "statistics result cache, miss if it was computed and stored in the "
+    "cache. Missing if the cache is disabled.",
+}
+
+SAMPLING_CURSOR_PROPERTY = {
+    "type": "object",
+    "properties": {
+        "start_time": {
+            "type": "string",
+            "description": "The start time of the last sampled raster map "
+            "layer, null if no raster map layer was sampled",
+        },
+        "modification_time": {
+            "type": "string",
+            "description": "The modification time of the space-time raster "
+            "dataset before the sampling",
+        },
+        "maps_digest": {
+            "type": "string",
+            "description": "The digest of the raster map layers up to the "
+            "start time, to detect raster map layers that are registered "
+            "later at earlier start times. Null if the space-time raster "
+            "dataset has no temporal index, then all raster map layers are "
+            "sampled again after a modification of the dataset",
+        },
+    },
+    "description": "The resume cursor of the sampling. Send it as cursor in "
+    "the request body of the next request to sample only the raster map "
+    "layers that are new since this request.",
+}
+
 
 class UnivarResultModel(Schema):
     """
@@ -132,6 +168,7 @@ class RasterAreaStatsResponseModel(ProcessingResponseModel):
     properties["process_results"] = {}
     properties["process_results"]["type"] = "array"
     properties["process_results"]["items"] = CategoricalStatisticsResultModel
+    properties["cache_status"] = deepcopy(CACHE_STATUS_PROPERTY)
     required = deepcopy(ProcessingResponseModel.required)
     example = {
       "accept_datetime": "2022-07-31 16:57:18.978035",
@@ -328,6 +365,437 @@ class RasterAreaStatsResponseModel(ProcessingResponseModel):
     }
 
 
+class RasterAreaStatsBatchResultModel(Schema):
+    """
+    Response schema for the categorical statistics of a single raster map
+    layer of a batch area statistics computation.
+
+    It is used as schema to define the *process_result* in a
+    ProcessingResponseModel derivative.
+    """
+
+    type = "object"
+    required = ["raster_name", "statistics"]
+    properties = {
+        "raster_name": {
+            "type": "string",
+            "description": "The name of the raster map layer",
+        },
+        "statistics": {
+            "type": "array",
+            "items": CategoricalStatisticsResultModel,
+            "description": "The categorical statistics of the raster map "
+            "layer",
+        },
+    }
+    example = {
+        "raster_name": "landuse96_28m",
+        "statistics": [
+            {
+                "area": 812.25,
+                "cat": "0",
+                "cell_count": 1,
+                "name": "not classified",
+                "percent": 0.0,
+            }
+        ],
+    }
+
+
+class RasterAreaStatsBatchResponseModel(ProcessingResponseModel):
+    """Response schema for a list of categorical statistics of several
+    raster map layers.
+
+    This schema is a derivative of the ProcessingResponseModel that defines a
+    different *process_results* schema.
+    """
+
+    type = "object"
+    properties = deepcopy(ProcessingResponseModel.properties)
+    properties["process_results"] = {}
+    properties["process_results"]["type"] = "array"
+    properties["process_results"]["items"] = RasterAreaStatsBatchResultModel
+    required = deepcopy(ProcessingResponseModel.required)
+    example = {
+      "accept_datetime": "2022-07-31 16:57:18.978035",
+      "accept_timestamp": 1659286638.9780345,
+      "api_info": {
+        "endpoint": "syncephemeralrasterareastatsbatchresource",
+        "method": "POST",
+        "path": f"{URL_PREFIX}/projects/nc_spm_08/mapsets/PERMANENT/"
+                "raster_layers/area_stats_batch_sync",
+        "request_url": f"http://localhost:8088{URL_PREFIX}/projects/"
+                       "nc_spm_08/mapsets/PERMANENT/raster_layers/"
+                       "area_stats_batch_sync"
+      },
+      "datetime": "2022-07-31 16:57:21.441611",
+      "http_code": 200,
+      "message": "Processing successfully finished",
+      "process_results": [
+        {
+          "raster_name": "landuse96_28m",
+          "statistics": [
+            {
+              "area": 4080591297.0,
+              "cat": "*",
+              "cell_count": 5023812,
+              "name": "no data",
+              "percent": 100.0
+            }
+          ]
+        },
+        {
+          "raster_name": "basin_50K",
+          "statistics": [
+            {
+              "area": 4080591297.0,
+              "cat": "*",
+              "cell_count": 5023812,
+              "name": "no data",
+              "percent": 100.0
+            }
+          ]
+        }
+      ],
+      "progress": {
+        "num_of_steps": 5,
+        "step": 5
+      },
+      "resource_id": "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9",
+      "status": "finished",
+      "time_delta": 2.4635958671569824,
+      "timestamp": 1659286641.4415936,
+      "urls": {
+        "resources": [],
+        "status": f"http://localhost:8088{URL_PREFIX}/resources/actinia-gdi/"
+                  "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9"
+      },
+      "user_id": "actinia-gdi"
+    }
+
+
+class STRDSAreaStatsTimeSeriesResultModel(Schema):
+    """
+    Response schema for the categorical statistics of a single raster map
+    layer of a space-time raster dataset time range area statistics
+    computation.
+
+    It is used as schema to define the *process_result* in a
+    ProcessingResponseModel derivative.
+    """
+
+    type = "object"
+    required = ["start_time", "raster_name", "statistics"]
+    properties = {
+        "start_time": {
+            "type": "string",
+            "description": "The start time of the raster map layer",
+        },
+        "raster_name": {
+            "type": "string",
+            "description": "The name of the raster map layer",
+        },
+        "statistics": {
+            "type": "array",
+            "items": CategoricalStatisticsResultModel,
+            "description": "The categorical statistics of the raster map "
+            "layer",
+        },
+    }
+    example = {
+        "start_time": "2016-01-01T00:00:00",
+        "raster_name": "MOD11B3.A2016001.h11v05.single_LST_Day_6km@modis_lst",
+        "statistics": [
+            {
+                "area": 82473.87,
+                "cat": "14634",
+                "cell_count": 2,
+                "name": "",
+                "percent": 2.15,
+            }
+        ],
+    }
+
+
+class STRDSAreaStatsTimeSeriesResponseModel(ProcessingResponseModel):
+    """Response schema for a list of categorical statistics of the raster map
+    layers of a space-time raster dataset in a time range.
+
+    This schema is a derivative of the ProcessingResponseModel that defines a
+    different *process_results* schema.
+    """
+
+    type = "object"
+    properties = deepcopy(ProcessingResponseModel.properties)
+    properties["process_results"] = {}
+    properties["process_results"]["type"] = "array"
+    properties["process_results"][
+        "items"
+    ] = STRDSAreaStatsTimeSeriesResultModel
+    required = deepcopy(ProcessingResponseModel.required)
+    example = {
+      "accept_datetime": "2022-07-31 16:57:18.978035",
+      "accept_timestamp": 1659286638.9780345,
+      "api_info": {
+        "endpoint": "syncephemeralstrdsareastatstimeseriesresource",
+        "method": "POST",
+        "path": f"{URL_PREFIX}/projects/nc_spm_08/mapsets/modis_lst/"
+                "strds/LST_Day_monthly/area_stats_sync",
+        "request_url": f"http://localhost:8088{URL_PREFIX}/projects/"
+                       "nc_spm_08/mapsets/modis_lst/strds/LST_Day_monthly/"
+                       "area_stats_sync?start=2016-01-01T00:00:00"
+                       "&end=2016-03-01T00:00:00"
+      },
+      "datetime": "2022-07-31 16:57:21.441611",
+      "http_code": 200,
+      "message": "Processing successfully finished",
+      "process_results": [
+        {
+          "start_time": "2016-01-01T00:00:00",
+          "raster_name": "MOD11B3.A2016001.h11v05.single_LST_Day_6km"
+                         "@modis_lst",
+          "statistics": [
+            {
+              "area": 82473.87,
+              "cat": "14634",
+              "cell_count": 2,
+              "name": "",
+              "percent": 2.15
+            }
+          ]
+        },
+        {
+          "start_time": "2016-02-01T00:00:00",
+          "raster_name": "MOD11B3.A2016032.h11v05.single_LST_Day_6km"
+                         "@modis_lst",
+          "statistics": [
+            {
+              "area": 82473.87,
+              "cat": "14801",
+              "cell_count": 2,
+              "name": "",
+              "percent": 2.15
+            }
+          ]
+        }
+      ],
+      "progress": {
+        "num_of_steps": 6,
+        "step": 6
+      },
+      "resource_id": "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9",
+      "status": "finished",
+      "time_delta": 2.4635958671569824,
+      "timestamp": 1659286641.4415936,
+      "urls": {
+        "resources": [],
+        "status": f"http://localhost:8088{URL_PREFIX}/resources/actinia-gdi/"
+                  "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9"
+      },
+      "user_id": "actinia-gdi"
+    }
+
+
+class ZonalCategoricalStatisticsResultModel(Schema):
+    """
+    Response schema for the categorical statistics of a single feature of a
+    zonal area statistics computation.
+
+    It is used as schema to define the *process_result* in a
+    ProcessingResponseModel derivative.
+    """
+
+    type = "object"
+    required = ["cat", "statistics"]
+    properties = {
+        "cat": {
+            "type": "string",
+            "description": "The category id of the feature, the n-th feature "
+            "of the GeoJSON FeatureCollection has the category n",
+        },
+        "fid": {
+            "type": "string",
+            "description": "Field id from the feature properties, if "
+            "available",
+        },
+        "statistics": {
+            "type": "array",
+            "items": CategoricalStatisticsResultModel,
+            "description": "The categorical statistics of the feature, the "
+            "percentage refers to the area of the feature",
+        },
+    }
+    example = {
+        "cat": "1",
+        "fid": "swwake_10m.0",
+        "statistics": [
+            {
+                "area": 812.25,
+                "cat": "0",
+                "cell_count": 1,
+                "name": "not classified",
+                "percent": 0.0,
+            }
+        ],
+    }
+
+
+class RasterAreaZonalStatsResponseModel(ProcessingResponseModel):
+    """Response schema for a list of categorical statistics per feature.
+
+    This schema is a derivative of the ProcessingResponseModel that defines a
+    different *process_results* schema.
+    """
+
+    type = "object"
+    properties = deepcopy(ProcessingResponseModel.properties)
+    properties["process_results"] = {}
+    properties["process_results"]["type"] = "array"
+    properties["process_results"][
+        "items"
+    ] = ZonalCategoricalStatisticsResultModel
+    properties["cache_status"] = deepcopy(CACHE_STATUS_PROPERTY)
+    required = deepcopy(ProcessingResponseModel.required)
+    example = {
+      "accept_datetime": "2022-07-31 16:57:18.978035",
+      "accept_timestamp": 1659286638.9780345,
+      "api_info": {
+        "endpoint": "syncephemeralrasterareastatsresource",
+        "method": "POST",
+        "path": f"{URL_PREFIX}/projects/nc_spm_08/mapsets/PERMANENT/"
+                "raster_layers/landuse96_28m/area_stats_sync",
+        "request_url": f"http://localhost:8088{URL_PREFIX}/projects/"
+                       "nc_spm_08/mapsets/PERMANENT/raster_layers/"
+                       "landuse96_28m/area_stats_sync?zonal=true"
+      },
+      "datetime": "2022-07-31 16:57:21.441611",
+      "http_code": 200,
+      "message": "Processing successfully finished",
+      "process_results": [
+        {
+          "cat": "1",
+          "fid": "swwake_10m.0",
+          "statistics": [
+            {
+              "area": 2025000.0,
+              "cat": "1",
+              "cell_count": 2493,
+              "name": "High Intensity Developed",
+              "percent": 100.0
+            }
+          ]
+        }
+      ],
+      "progress": {
+        "num_of_steps": 4,
+        "step": 4
+      },
+      "resource_id": "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9",
+      "status": "finished",
+      "time_delta": 2.4635958671569824,
+      "timestamp": 1659286641.4415936,
+      "urls": {
+        "resources": [],
+        "status": f"http://localhost:8088{URL_PREFIX}/resources/actinia-gdi/"
+                  "resource_id-67fab95f-2782-41c8-9b89-b767f67a9df9"
+      },
+      "user_id": "actinia-gdi"
+    }
+
+
+class RasterAreaStatsIndexResultModel(Schema):
+    """
+    Response schema for the category histogram tile index of a raster map
+    layer.
+
+    It is used as schema to define the *process_result* in a
+    ProcessingResponseModel derivative.
+    """
+
+    type = "object"
+    required = ["raster_name", "tile_size", "tile_rows", "tile_cols"]
+    properties = {
+        "raster_name": {
+            "type": "string",
+            "description": "The name of the indexed raster map layer",
+        },
+        "tile_size": {
+            "type": "integer",
+            "description": "The number of rows and columns of a tile",
+        },
+        "tile_rows": {
+            "type": "integer",
+            "description": "The number of tile rows of the index",
+        },
+        "tile_cols": {
+            "type": "integer",
+            "description": "The number of tile columns of the index",
+        },
+        "entries": {
+            "type": "integer",
+            "description": "The number of stored tile histogram entries",
+        },
+    }
+    example = {
+        "raster_name": "landuse96_28m@PERMANENT",
+        "tile_size": 256,
+        "tile_rows": 43,
+        "tile_cols": 112,
+        "entries": 28370,
+    }
+
+
+class RasterAreaStatsIndexResponseModel(ProcessingResponseModel):
+    """Response schema for building the category histogram tile index of a
+    raster map layer.
+
+    This schema is a derivative of the ProcessingResponseModel that defines a
+    different *process_results* schema.
+    """
+
+    type = "object"
+    properties = deepcopy(ProcessingResponseModel.properties)
+    properties["process_results"] = RasterAreaStatsIndexResultModel
+    required = deepcopy(ProcessingResponseModel.required)
+    example = {
+      "accept_datetime": "2026-03-02 09:12:40.112361",
+      "accept_timestamp": 1772442760.1123612,
+      "api_info": {
+        "endpoint": "syncrasterareastatsindexresource",
+        "method": "POST",
+        "path": f"{URL_PREFIX}/projects/nc_spm_08/mapsets/PERMANENT/"
+                "raster_layers/landuse96_28m/area_stats_index_sync",
+        "request_url": f"http://localhost:8088{URL_PREFIX}/projects/"
+                       "nc_spm_08/mapsets/PERMANENT/raster_layers/"
+                       "landuse96_28m/area_stats_index_sync"
+      },
+      "datetime": "2026-03-02 09:12:52.907713",
+      "http_code": 200,
+      "message": "Processing successfully finished",
+      "process_results": {
+        "raster_name": "landuse96_28m@PERMANENT",
+        "tile_size": 256,
+        "tile_rows": 43,
+        "tile_cols": 112,
+        "entries": 28370
+      },
+      "progress": {
+        "num_of_steps": 86,
+        "step": 86
+      },
+      "resource_id": "resource_id-5d0c4a1f-0e8e-4c43-9b47-3c0f5d2b8a61",
+      "status": "finished",
+      "time_delta": 12.795352220535278,
+      "timestamp": 1772442772.907713,
+      "urls": {
+        "resources": [],
+        "status": f"http://localhost:8088{URL_PREFIX}/resources/admin/"
+                  "resource_id-5d0c4a1f-0e8e-4c43-9b47-3c0f5d2b8a61"
+      },
+      "user_id": "admin"
+    }
+
+
 class AreaUnivarResultModel(Schema):
     """
     Response schema for the result of univariate computations of raster layers
@@ -389,6 +857,19 @@ class AreaUnivarResultModel(Schema):
             "type": "number",
             "format": "double",
         },
+        "raster_percentiles": {
+            "type": "object",
+            "additionalProperties": {"type": "number", "format": "double"},
+            "description": "The approximate percentiles by percentile, only "
+            "computed if approximate statistics are requested",
+        },
+        "raster_quantile_error": {
+            "type": "number",
+            "format": "double",
+            "description": "The maximum absolute error of the approximate "
+            "median and percentiles, only reported if approximate statistics "
+            "are requested",
+        },
     }
     example = {
         "cat": "1",
@@ -420,6 +901,7 @@ class RasterAreaUnivarStatsResponseModel(ProcessingResponseModel):
     properties["process_results"] = {}
     properties["process_results"]["type"] = "array"
     properties["process_results"]["items"] = AreaUnivarResultModel
+    properties["cache_status"] = deepcopy(CACHE_STATUS_PROPERTY)
     required = deepcopy(ProcessingResponseModel.required)
     # required.append("process_results")
     example = {
@@ -773,6 +1255,131 @@ class RasterAreaUnivarStatsResponseModel(ProcessingResponseModel):
     }
 
 
+class STRDSAreaUnivarTimeSeriesResultModel(Schema):
+    """
+    Response schema for the univariate statistics of the polygons of a
+    single raster map layer of a space-time raster dataset time range area
+    statistics computation.
+
+    It is used as schema to define the *process_result* in a
+    ProcessingResponseModel derivative.
+    """
+
+    type = "object"
+    required = ["start_time", "raster_name", "statistics"]
+    properties = {
+        "start_time": {
+            "type": "string",
+            "description": "The start time of the raster map layer",
+        },
+        "raster_name": {
+            "type": "string",
+            "description": "The name of the raster map layer",
+        },
+        "statistics": {
+            "type": "array",
+            "items": AreaUnivarResultModel,
+            "description": "The univariate statistics of each polygon",
+        },
+    }
+    example = {
+        "start_time": "2016-01-01T00:00:00",
+        "raster_name": "MOD11B3.A2016001.h11v05.single_LST_Day_6km@modis_lst",
+        "statistics": [
+            {
+                "cat": "1",
+                "fid": "test",
+                "raster_average": 14678.2,
+                "raster_maximum": 14812.0,
+                "raster_minimum": 14532.0,
+                "raster_number": 5.0,
+            }
+        ],
+    }
+
+
+class STRDSAreaUnivarTimeSeriesResponseModel(ProcessingResponseModel):
+    """Response schema for a list of univariate statistics of the raster map
+    layers of a space-time raster dataset in a time range.
+
+    This schema is a derivative of the ProcessingResponseModel that defines a
+    different *process_results* schema.
+    """
+
+    type = "object"
+    properties = deepcopy(ProcessingResponseModel.properties)
+    properties["process_results"] = {}
+    properties["process_results"]["type"] = "array"
+    properties["process_results"][
+        "items"
+    ] = STRDSAreaUnivarTimeSeriesResultModel
+    required = deepcopy(ProcessingResponseModel.required)
+    example = {
+      "accept_datetime": "2022-07-31 17:08:36.534924",
+      "accept_timestamp": 1659287316.5349228,
+      "api_info": {
+        "endpoint": "syncephemeralstrdsareastatsunivartimeseriesresource",
+        "method": "POST",
+        "path": f"{URL_PREFIX}/projects/nc_spm_08/mapsets/modis_lst/"
+                "strds/LST_Day_monthly/area_stats_univar_sync",
+        "request_url": f"http://localhost:8088{URL_PREFIX}/projects/"
+                       "nc_spm_08/mapsets/modis_lst/strds/LST_Day_monthly/"
+                       "area_stats_univar_sync?start=2016-01-01T00:00:00"
+                       "&end=2016-03-01T00:00:00"
+                       "&methods=number,minimum,maximum,average"
+      },
+      "datetime": "2022-07-31 17:08:38.411029",
+      "http_code": 200,
+      "message": "Processing successfully finished",
+      "process_results": [
+        {
+          "start_time": "2016-01-01T00:00:00",
+          "raster_name": "MOD11B3.A2016001.h11v05.single_LST_Day_6km"
+                         "@modis_lst",
+          "statistics": [
+            {
+              "cat": "1",
+              "fid": "test",
+              "raster_average": 14678.2,
+              "raster_maximum": 14812.0,
+              "raster_minimum": 14532.0,
+              "raster_number": 5.0
+            }
+          ]
+        },
+        {
+          "start_time": "2016-02-01T00:00:00",
+          "raster_name": "MOD11B3.A2016032.h11v05.single_LST_Day_6km"
+                         "@modis_lst",
+          "statistics": [
+            {
+              "cat": "1",
+              "fid": "test",
+              "raster_average": 14880.4,
+              "raster_maximum": 15015.0,
+              "raster_minimum": 14701.0,
+              "raster_number": 5.0
+            }
+          ]
+        }
+      ],
+      "progress": {
+        "num_of_steps": 5,
+        "step": 5
+      },
+      "resource_id": "resource_id-2be7fd8c-6a5f-4c8b-a4d3-a1b01b7dbe9b",
+      "status": "finished",
+      "time_delta": 1.876138687133789,
+      "timestamp": 1659287318.4110167,
+      "urls": {
+        "resources": [],
+        "status": f"http://localhost:8088{URL_PREFIX}/resources/actinia-gdi/"
+                  "resource_id-2be7fd8c-6a5f-4c8b-a4d3-a1b01b7dbe9b"
+      },
+      "user_id": "actinia-gdi"
+    }
+
+
 class RasterSamplingResponseModel(ProcessingResponseModel):
     """
     Response schema for a raster map sampling result.
@@ -808,60 +1415,32 @@ class RasterSamplingResponseModel(ProcessingResponseModel):
             {
                 "list": [
                     {
-                        "id": "v_in_ascii",
+                        "id": "g_region_1",
                         "inputs": [
                             {
-                                "param": "input",
-                                "value": "/tmp/"
-                                "gisdbase_3ef25f3f447844f2aaea07b4a34a2107/"
-                                ".tmp/tmpnk7lt8rx",
-                            },
-                            {"param": "format", "value": "point"},
-                            {
-                                "param": "column",
-                                "value": "id text, x double precision, y"
-                                " double precision",
-                            },
-                            {"param": "x", "value": "2"},
-                            {"param": "y", "value": "3"},
-                        ],
-                        "module": "v.in.ascii",
-                        "outputs": [
-                            {"param": "output", "value": "input_points"}
-                        ],
-                    },
-                    {
-                        "flags": "p",
-                        "id": "g_region",
-                        "inputs": [
-                            {"param": "vector", "value": "input_points"},
-                            {
-                                "param": "align",
+                                "param": "raster",
                                 "value": "landuse96_28m@PERMANENT",
                             },
                         ],
                         "module": "g.region",
+                        "superquiet": True,
                     },
                     {
                         "flags": "nrf",
-                        "id": "r_what",
+                        "id": "r_what_2",
                         "inputs": [
                             {
                                 "param": "map",
                                 "value": "landuse96_28m@PERMANENT",
                             },
-                            {"param": "points", "value": "input_points"},
-                        ],
-                        "module": "r.what",
-                        "outputs": [
                             {
-                                "param": "output",
-                                "value": "/tmp/"
-                                "gisdbase_3ef25f3f447844f2aaea07b4a34a2107/"
-                                ".tmp/tmp0ktsyzl6",
-                            }
+                                "param": "coordinates",
+                                "value": "638684.0,220210.0,635676.0,"
+                                "226371.0",
+                            },
+                            {"param": "separator", "value": "pipe"},
                         ],
-                        "overwrite": True,
+                        "module": "r.what",
                         "superquiet": True,
                     },
                 ],
@@ -869,72 +1448,37 @@ class RasterSamplingResponseModel(ProcessingResponseModel):
             }
         ],
         "process_log": [
-            {
-                "executable": "v.in.ascii",
-                "id": "v_in_ascii",
-                "mapset_size": 15753,
-                "parameter": [
-                    "input=/tmp/gisdbase_3ef25f3f4"
-                    "47844f2aaea07b4a34a2107/.tmp/tmpnk7lt8rx",
-                    "format=point",
-                    "column=id text, x double precision, y double precision",
-                    "x=2",
-                    "y=3",
-                    "output=input_points",
-                ],
-                "return_code": 0,
-                "run_time": 0.10030794143676758,
-                "stderr": [
-                    "Scanning input for column types...",
-                    "Number of columns: 3",
-                    "Number of data rows: 2",
-                    "Importing points...",
-                    "0..50..100",
-                    "Populating table...",
-                    "Building topology for vector map <input_points@mapset_3e"
-                    "f25f3f447844f2aaea07b4a34a2107>...",
-                    "Registering primitives...",
-                    "",
-                    "",
-                ],
-                "stdout": "",
-            },
             {
                 "executable": "g.region",
-                "id": "g_region",
-                "mapset_size": 15761,
+                "id": "g_region_1",
+                "mapset_size": 15753,
                 "parameter": [
-                    "vector=input_points",
-                    "align=landuse96_28m@PERMANENT",
-                    "-p",
+                    "raster=landuse96_28m@PERMANENT",
+                    "--qq",
                 ],
                 "return_code": 0,
                 "run_time": 0.10032916069030762,
                 "stderr": [""],
-                "stdout": "projection: 99 (Lambert Conformal Conic)\nzone:  "
-                "     0\ndatum:      nad83\nellipsoid:  a=6378137 es=0.006694"
-                "380022900787\nnorth:      226389.75\nsouth:      220205.25\n"
-                "west:       635651.5\neast:       638701\nnsres:      28.5\n"
-                "ewres:      28.5\nrows:       217\ncols:       107\ncells:   "
-                "   23219\n",
+                "stdout": "",
             },
             {
                 "executable": "r.what",
-                "id": "r_what",
-                "mapset_size": 15761,
+                "id": "r_what_2",
+                "mapset_size": 15753,
                 "parameter": [
                     "map=landuse96_28m@PERMANENT",
-                    "points=input_points",
-                    "output=/tmp/gisdbase_3ef25f3f4"
-                    "47844f2aaea07b4a34a2107/.tmp/tmp0ktsyzl6",
+                    "coordinates=638684.0,220210.0,635676.0,226371.0",
+                    "separator=pipe",
                     "-nrf",
-                    "--o",
                     "--qq",
                 ],
                 "return_code": 0,
                 "run_time": 0.1003561019897461,
                 "stderr": [""],
-                "stdout": "",
+                "stdout": "easting|northing|site_name|landuse96_28m@PERMANENT"
+                "|landuse96_28m@PERMANENT_label|landuse96_28m@PERMANENT_color"
+                "\n638684|220210||4|Managed Herbaceous Cover|229:229:204\n"
+                "635676|226371||1|High Intensity Developed|255:000:000\n",
             },
         ],
         "process_results": [
@@ -959,7 +1503,7 @@ class RasterSamplingResponseModel(ProcessingResponseModel):
                 }
             },
         ],
-        "progress": {"num_of_steps": 3, "step": 3},
+        "progress": {"num_of_steps": 2, "step": 2},
         "resource_id": "resource_id-14d1b433-f875-4ffd-a42a-27449d76341a",
         "status": "finished",
         "time_delta": 0.7126758098602295,
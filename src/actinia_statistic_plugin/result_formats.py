@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Output formats of large sampling results
+
+The JSON output keeps the sampling result in the response document. The
+NDJSON output writes one JSON array per row into a file of the resource
+storage while the rows are parsed, so that neither the worker nor the API
+node holds the full result in memory. The file is streamed back line by line
+by the sampling result download endpoint. The NPZ output stores typed
+columnar numpy arrays, the sampled values as float matrix with NaN for NULL
+values, the time stamps and the point ids, so that clients do not parse
+strings.
+"""
+
+import json
+import math
+import numpy as np
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+OUTPUT_FORMATS = ["json", "ndjson", "npz"]
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# The file names of the outputs in the resource storage
+NDJSON_FILE_NAME = "sampling.ndjson"
+NPZ_FILE_NAME = "sampling.npz"
+
+# The data types of the value matrix of the NPZ output
+NPZ_DTYPES = ["float64", "float32"]
+
+# The number of NDJSON lines of a chunk of the streamed download
+NDJSON_CHUNK_LINES = 1000
+
+OUTPUT_FORMAT_DESCRIPTIONS = {
+    "json": "json returns the result in process_results",
+    "ndjson": "ndjson writes one JSON array per row into a file of the "
+    "resource storage and process_results only contains the header row",
+    "npz": "npz writes typed numpy arrays into a compressed .npz file of the "
+    "resource storage, the sampled values as float matrix with NaN for NULL "
+    "values, the time stamps and the point ids",
+}
+
+# The output format descriptions of the raster sampling
+RASTER_OUTPUT_FORMAT_DESCRIPTIONS = {
+    "json": OUTPUT_FORMAT_DESCRIPTIONS["json"],
+    "npz": "npz writes typed numpy arrays into a compressed .npz file of the "
+    "resource storage, the arrays point_id, easting, northing and value with "
+    "NaN for NULL values",
+}
+
+
+def create_output_format_parameters(
+    output_formats=OUTPUT_FORMATS, descriptions=OUTPUT_FORMAT_DESCRIPTIONS
+):
+    """Create the query parameters output_format and dtype of a sampling
+    resource
+
+    Args:
+        output_formats (list): The supported output formats
+        descriptions (dict): The descriptions of the output formats
+
+    Returns:
+        list: The swagger parameter definitions
+    """
+    return [
+        {
+            "name": "output_format",
+            "description": "The output format of the sampling result. "
+            + ", ".join(
+                descriptions[output_format]
+                for output_format in output_formats
+            )
+            + ". The URL of a file output is listed in urls.resources.",
+            "required": False,
+            "in": "query",
+            "type": "string",
+            "enum": output_formats,
+            "default": "json",
+        },
+        {
+            "name": "dtype",
+            "description": "The data type of the sampled values of the npz "
+            "output format",
+            "required": False,
+            "in": "query",
+            "type": "string",
+            "enum": NPZ_DTYPES,
+            "default": "float64",
+        },
+    ]
+
+
+def parse_output_format(args, output_formats=OUTPUT_FORMATS):
+    """Parse the output_format query parameter of a request
+
+    Args:
+        args (dict): The query parameters of the request
+        output_formats (list): The supported output formats
+
+    Raises:
+        ValueError: If the output format is not supported
+
+    Returns:
+        str: The output format
+    """
+    output_format = args.get("output_format", "json")
+    if output_format not in output_formats:
+        raise ValueError(
+            "Unknown output format <%s>, supported formats are: %s"
+            % (output_format, ", ".join(output_formats))
+        )
+    return output_format
+
+
+def parse_dtype(args):
+    """Parse the dtype query parameter of a request
+
+    Args:
+        args (dict): The query parameters of the request
+
+    Raises:
+        ValueError: If the data type is not supported
+
+    Returns:
+        str: The data type of the value matrix of the npz output
+    """
+    dtype = args.get("dtype", "float64")
+    if dtype not in NPZ_DTYPES:
+        raise ValueError(
+            "Unknown dtype <%s>, supported data types are: %s"
+            % (dtype, ", ".join(NPZ_DTYPES))
+        )
+    return dtype
+
+
+def write_ndjson(rows, file_object):
+    """Write rows as NDJSON, one JSON array per line
+
+    Args:
+        rows: An iterable of rows, each row a list of values
+        file_object: The text file to write into
+
+    Returns:
+        tuple: (number of rows, first row, last row), the rows are None if
+               no row was written
+    """
+    count = 0
+    first = None
+    last = None
+    for row in rows:
+        file_object.write(json.dumps(row))
+        file_object.write("\n")
+        if first is None:
+            first = row
+        last = row
+        count += 1
+    return count, first, last
+
+
+def iter_ndjson_chunks(file_object, chunk_lines=NDJSON_CHUNK_LINES):
+    """Read a NDJSON file in chunks of complete lines
+
+    Args:
+        file_object: The text file to read
+        chunk_lines (int): The number of lines of a chunk
+
+    Yields:
+        str: The chunks
+    """
+    lines = []
+    for line in file_object:
+        lines.append(line)
+        if len(lines) >= chunk_lines:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def parse_sample_value(value):
+    """Convert a sampled value string into a float, NULL values like * and
+    values that are no numbers are NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def parse_sample_time(value):
+    """Convert a time stamp of the sampling output into numpy.datetime64,
+    missing end times of time instances are NaT"""
+    if value in (None, "", "None", "*"):
+        return np.datetime64("NaT", "us")
+    return np.datetime64(str(value).strip().replace(" ", "T"), "us")
+
+
+def write_strds_sample_npz(rows, file_path, dtype="float64"):
+    """Write the STRDS sampling rows as typed columnar arrays into a
+    compressed .npz file
+
+    The file contains the arrays values of shape (time stamps, points),
+    start_time and end_time as datetime64[us] and point_id as strings.
+
+    Args:
+        rows: An iterable of the header and the rows of the t.rast.sample
+              layout
+        file_path (str): The path of the .npz file
+        dtype (str): The data type of the value matrix
+
+    Returns:
+        tuple: (number of rows including the header, header, last row), the
+               rows are None if there is no header
+    """
+    header = None
+    last = None
+    count = 0
+    start_times = []
+    end_times = []
+    values = []
+    for row in rows:
+        count += 1
+        last = row
+        if header is None:
+            header = row
+            continue
+        start_times.append(parse_sample_time(row[0]))
+        end_times.append(parse_sample_time(row[1]))
+        values.append(
+            np.array([parse_sample_value(value) for value in row[2:]], dtype)
+        )
+    point_ids = header[2:] if header is not None else []
+    if values:
+        value_matrix = np.vstack(values)
+    else:
+        value_matrix = np.empty((0, len(point_ids)), dtype=dtype)
+    np.savez_compressed(
+        file_path,
+        values=value_matrix,
+        start_time=np.array(start_times, dtype="datetime64[us]"),
+        end_time=np.array(end_times, dtype="datetime64[us]"),
+        point_id=np.array(point_ids, dtype=str),
+    )
+    return count, header, last
+
+
+def write_raster_sample_npz(
+    file_path, point_ids, eastings, northings, values, dtype="float64"
+):
+    """Write the raster sampling result as typed columnar arrays into a
+    compressed .npz file
+
+    The file contains the arrays point_id as strings, easting and northing
+    as float64 and value with NaN for NULL values.
+
+    Args:
+        file_path (str): The path of the .npz file
+        point_ids (list): The point ids
+        eastings (list): The easting of each point
+        northings (list): The northing of each point
+        values (list): The sampled value strings of each point
+        dtype (str): The data type of the values
+    """
+    np.savez_compressed(
+        file_path,
+        point_id=np.array(point_ids, dtype=str),
+        easting=np.array(
+            [parse_sample_value(value) for value in eastings], np.float64
+        ),
+        northing=np.array(
+            [parse_sample_value(value) for value in northings], np.float64
+        ),
+        value=np.array(
+            [parse_sample_value(value) for value in values], dtype
+        ),
+    )
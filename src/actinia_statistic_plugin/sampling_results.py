@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Download of the NDJSON output of the sampling resources
+"""
+
+import os
+import pickle
+from copy import deepcopy
+from flask import (
+    Response,
+    jsonify,
+    make_response,
+    redirect,
+    stream_with_context,
+)
+from flask_restful_swagger_2 import swagger
+from actinia_core.core.common.config import global_config
+from actinia_core.core.utils import ensure_valid_path
+from actinia_core.rest.resource_management import ResourceManagerBase
+from .result_formats import (
+    NDJSON_FILE_NAME,
+    NDJSON_MIMETYPE,
+    iter_ndjson_chunks,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+SCHEMA_DOC = {
+    "tags": ["STRDS Sampling"],
+    "description": "Download the NDJSON output of a sampling resource that "
+    "was started with output_format=ndjson. Files of the file system "
+    "resource storage are streamed with chunked transfer encoding, one JSON "
+    "array per line, the first line is the header. If the file was stored "
+    "in an object storage like S3 or GCS, the request is redirected to the "
+    "stored object URL from urls.resources of the resource. "
+    "Minimum required user role: user.",
+    "produces": [NDJSON_MIMETYPE],
+    "parameters": [
+        {
+            "name": "user_id",
+            "description": "The unique user name/id",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+        {
+            "name": "resource_id",
+            "description": "The id of the sampling resource",
+            "required": True,
+            "in": "path",
+            "type": "string",
+        },
+    ],
+    "responses": {
+        "200": {"description": "The NDJSON rows of the sampling result"},
+        "302": {"description": "The URL of the stored NDJSON object"},
+        "400": {"description": "The resource does not exist"},
+        "401": {
+            "description": "The user has no permission to access the resource"
+        },
+    },
+}
+
+
+class SamplingResultNDJSONResource(ResourceManagerBase):
+    """Stream the NDJSON output of a sampling resource"""
+
+    def _get_stored_object_url(self, user_id, resource_id):
+        """Return the URL of the NDJSON file of a resource from the
+        urls.resources entry of its latest response
+
+        Returns:
+            str: The URL or None if the resource has no NDJSON file
+        """
+        try:
+            _, response_data = self.resource_logger.get_latest_iteration(
+                user_id, resource_id
+            )
+        except ValueError:
+            # There is no entry of the resource
+            return None
+        if response_data is None:
+            return None
+        _, response_model = pickle.loads(response_data)
+        urls = response_model.get("urls") or {}
+        for url in urls.get("resources") or []:
+            # Presigned object storage URLs have query parameters
+            if url.split("?", 1)[0].endswith(NDJSON_FILE_NAME):
+                return url
+        return None
+
+    @swagger.doc(deepcopy(SCHEMA_DOC))
+    def get(self, user_id, resource_id):
+        """Stream the NDJSON output of a sampling resource"""
+        ret = self.check_permissions(user_id=user_id)
+        if ret:
+            return ret
+
+        file_path = ensure_valid_path(
+            [
+                global_config.GRASS_RESOURCE_DIR,
+                user_id,
+                resource_id,
+                NDJSON_FILE_NAME,
+            ],
+            "w",
+        )
+        if not os.path.isfile(file_path) or not os.access(file_path, os.R_OK):
+            # The file is not in the file system resource storage, it was
+            # stored in an object storage
+            url = self._get_stored_object_url(user_id, resource_id)
+            if url is not None:
+                return redirect(url)
+            return make_response(
+                jsonify(
+                    {"status": "error", "message": "Resource does not exist"}
+                ),
+                400,
+            )
+
+        def generate():
+            with open(file_path, "r") as ndjson_file:
+                for chunk in iter_ndjson_chunks(ndjson_file):
+                    yield chunk
+
+        # The response has no content length and is sent with chunked
+        # transfer encoding
+        return Response(
+            stream_with_context(generate()), mimetype=NDJSON_MIMETYPE
+        )
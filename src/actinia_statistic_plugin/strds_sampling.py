@@ -3,21 +3,75 @@
 Sample a space-time raster dataset at specific vector points
 """
 
+import os
 import pickle
+import shutil
 import tempfile
-from flask import jsonify, make_response
+from datetime import datetime
+import numpy as np
+from flask import jsonify, make_response, request
 from copy import deepcopy
 from flask_restful_swagger_2 import swagger, Schema
 from actinia_core.models.response_models import (
     ProcessingResponseModel,
     ProcessingErrorResponseModel,
+    ProcessLogModel,
 )
 from actinia_core.processing.actinia_processing.ephemeral_processing import (
     EphemeralProcessing,
 )
 from actinia_core.rest.base.resource_base import ResourceBase
+from actinia_core.core.grass_init import GrassGisRC
 from actinia_core.core.common.kvdb_interface import enqueue_job
 from actinia_core.core.common.exceptions import AsyncProcessError
+from .config import (
+    STRDS_SAMPLING_CHUNK_MAPS,
+    STRDS_SAMPLING_ENGINE,
+    STRDS_SAMPLING_ENGINES,
+    STRDS_SAMPLING_PARALLEL_NPROCS,
+)
+from .point_sampling import (
+    NULL_VALUE,
+    R_WHAT_MAX_COORDINATES,
+    compute_cell_indices,
+    deduplicate_points,
+    expand_sample_rows,
+    format_coordinates,
+    get_cell_centers,
+    get_grid_key,
+    parse_r_what_values,
+    parse_sample_points,
+)
+from .raster_utils import read_raster_header, split_raster_name
+from .response_models import SAMPLING_CURSOR_PROPERTY
+from .result_formats import (
+    NDJSON_FILE_NAME,
+    NPZ_FILE_NAME,
+    create_output_format_parameters,
+    parse_dtype,
+    parse_output_format,
+    write_ndjson,
+    write_strds_sample_npz,
+)
+from .strds_utils import (
+    create_cursor_where,
+    create_sampling_cursor,
+    create_sampling_where,
+    create_sampling_wheres,
+    create_t_rast_list_pc,
+    create_time_chunk_where,
+    is_cursor_backfilled,
+    parse_chunk_maps,
+    parse_modification_time,
+    parse_nprocs,
+    parse_sampling_cursor,
+    parse_sampling_window,
+    select_granularity_steps,
+    split_time_chunks,
+    iter_sample_rows,
+)
+from .temporal_index import get_strds_temporal_index, select_sampling_window
+from .tile_index import get_header_grid
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -25,6 +79,33 @@ __copyright__ = "Copyright 2016, Sören Gebbert"
 __maintainer__ = "Sören Gebbert"
 __email__ = "soerengebbert@googlemail.com"
 
+# The maximum number of raster map layers of a r.what run, r.what opens all
+# raster map layers at the same time
+R_WHAT_MAX_MAPS = 100
+
+# The query parameter of the number of parallel t.rast.sample processes
+NPROCS_QUERY_PARAMETER = {
+    "name": "nprocs",
+    "description": "The maximum number of parallel t.rast.sample processes. "
+    "Long STRDS are split into contiguous time chunks that are sampled in "
+    "parallel, the number is capped by the plugin configuration.",
+    "required": False,
+    "in": "query",
+    "type": "integer",
+}
+
+# The query parameter of the number of raster map layers of a time chunk
+CHUNK_MAPS_QUERY_PARAMETER = {
+    "name": "chunk_maps",
+    "description": "The minimum number of raster map layers of a time chunk "
+    "of the parallel t.rast.sample processes, STRDS with less than two "
+    "times this number of raster map layers are sampled by a single "
+    "process. The default is set in the plugin configuration.",
+    "required": False,
+    "in": "query",
+    "type": "integer",
+}
+
 
 class STRDSSampleResponseModel(ProcessingResponseModel):
     """Response schema for a STRDS sampling result.
@@ -41,6 +122,7 @@ class STRDSSampleResponseModel(ProcessingResponseModel):
         "type": "array",
         "items": {"type": "string", "minItems": 3},
     }
+    properties["cursor"] = deepcopy(SAMPLING_CURSOR_PROPERTY)
     required = deepcopy(ProcessingResponseModel.required)
     example = {
         "accept_datetime": "2017-05-11 10:09:47.237997",
@@ -150,6 +232,10 @@ class STRDSSampleResponseModel(ProcessingResponseModel):
                 "7.87268863552",
             ],
         ],
+        "cursor": {
+            "start_time": "2012-01-01 00:00:00",
+            "modification_time": "2017-05-10 14:21:05.413302",
+        },
         "progress": {"num_of_steps": 2, "step": 2},
         "resource_id": "resource_id-96554e63-3dad-4a16-8652-e7c6be734057",
         "status": "finished",
@@ -182,6 +268,30 @@ class PointListModel(Schema):
             "description": "The where statement to select specific subsets "
             "of the strds, for example: start_time > '2001-01-01'",
         },
+        "start_time": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Sample the raster map layers with a start time "
+            "later or equal to this time stamp, "
+            "format YYYY-MM-DDTHH:MM:SS",
+        },
+        "end_time": {
+            "type": "string",
+            "format": "dateTime",
+            "description": "Sample the raster map layers with a start time "
+            "earlier than this time stamp, format YYYY-MM-DDTHH:MM:SS",
+        },
+        "granularity": {
+            "type": "string",
+            "description": "Sample only the first raster map layer of each "
+            "granule of the time window, for example: 1 month",
+        },
+        "cursor": {
+            "type": "object",
+            "description": "The resume cursor of a previous response to "
+            "sample only the raster map layers with a start time later than "
+            "the cursor or registered after the cursor was created",
+        },
     }
     example = {
         "where": "start_time > '2001-01-01'",
@@ -235,6 +345,21 @@ SCHEMA_DOC = {
             "in": "body",
             "schema": PointListModel,
         },
+        {
+            "name": "engine",
+            "description": "The sampling engine, t.rast.sample samples each "
+            "raster map layer with a separate module run, r.what converts the "
+            "points into cells once and queries batches of raster map layers "
+            "that share the cell grid with r.what runs of at most 1000 "
+            "points. The default is set in the plugin configuration.",
+            "required": False,
+            "in": "query",
+            "type": "string",
+            "enum": STRDS_SAMPLING_ENGINES,
+        },
+        NPROCS_QUERY_PARAMETER,
+        CHUNK_MAPS_QUERY_PARAMETER,
+        *create_output_format_parameters(),
     ],
     "responses": {
         "200": {
@@ -250,11 +375,67 @@ SCHEMA_DOC = {
 }
 
 
+def create_sampling_user_data(rdc, data, where=None):
+    """Parse the time window and the resume cursor of a sampling request
+    and select the start times of the raster map layers of the time window
+    with the temporal index of the STRDS
+
+    Args:
+        rdc (ResourceDataContainer): The resource data container
+        data (dict): The request body with the start_time, end_time,
+                     granularity and cursor fields
+        where (str): The where statement of the request or None
+
+    Raises:
+        ValueError: In case of a wrong time window or cursor or if no raster
+                    map layer is in the time window
+
+    Returns:
+        dict: The user data of the time window and the cursor
+    """
+    user_data = {"cursor": parse_sampling_cursor(data)}
+    window = parse_sampling_window(data)
+    if window is None:
+        return user_data
+    user_data["window"] = window
+    if where:
+        # The where statement is evaluated by the temporal modules
+        return user_data
+    start_times = select_sampling_window(get_strds_temporal_index(rdc), window)
+    if start_times is None:
+        return user_data
+    if len(start_times) == 0:
+        raise ValueError("No raster maps found in the time window")
+    if window["granularity"] is not None:
+        user_data["start_times"] = [
+            str(start_time) for start_time in start_times
+        ]
+    return user_data
+
+
 class AsyncEphemeralSTRDSSamplingResource(ResourceBase):
     """Sample a STRDS at vector point projects, asynchronous call"""
 
     def _execute(self, project_name, mapset_name, strds_name):
 
+        engine = request.args.get("engine", STRDS_SAMPLING_ENGINE)
+        if engine not in STRDS_SAMPLING_ENGINES:
+            self.create_error_response(
+                message="Unknown engine <%s>, supported engines are: %s"
+                % (engine, ", ".join(STRDS_SAMPLING_ENGINES))
+            )
+            return None
+        try:
+            nprocs = parse_nprocs(request.args, STRDS_SAMPLING_PARALLEL_NPROCS)
+            chunk_maps = parse_chunk_maps(
+                request.args, STRDS_SAMPLING_CHUNK_MAPS
+            )
+            output_format = parse_output_format(request.args)
+            dtype = parse_dtype(request.args)
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return None
+
         rdc = self.preprocess(
             has_json=True,
             has_xml=False,
@@ -263,6 +444,25 @@ class AsyncEphemeralSTRDSSamplingResource(ResourceBase):
             map_name=strds_name,
         )
         if rdc:
+            try:
+                user_data = create_sampling_user_data(
+                    rdc, rdc.request_data, rdc.request_data.get("where")
+                )
+            except ValueError as e:
+                # preprocess() committed the accepted status, the error
+                # response replaces it in the resource logger
+                self.get_error_response(message=str(e))
+                return None
+            user_data.update(
+                {
+                    "engine": engine,
+                    "nprocs": nprocs,
+                    "chunk_maps": chunk_maps,
+                    "output_format": output_format,
+                    "dtype": dtype,
+                }
+            )
+            rdc.set_user_data(user_data)
             enqueue_job(self.job_timeout, start_job, rdc)
 
         return rdc
@@ -300,119 +500,731 @@ class AsyncEphemeralSTRDSSampling(EphemeralProcessing):
     def __init__(self, *args):
         EphemeralProcessing.__init__(self, *args)
         self.response_model_class = STRDSSampleResponseModel
+        self.strds_modification_time = None
+        # The temporal index of the STRDS before the sampling or None
+        self.temporal_index = None
+        # The header and the last row of results that are not stored as
+        # module results
+        self.cursor_rows = None
 
-    def _execute(self):
+    def _run_r_what(self, raster_names, coordinates, process_id):
+        """Query raster map layers that share a cell grid at coordinates with
+        r.what runs in the region of the first raster map layer, each run
+        queries at most R_WHAT_MAX_COORDINATES coordinates
+
+        Args:
+            raster_names (list): The fully qualified raster map layer names
+            coordinates (numpy.ndarray): The x and y coordinates of the cell
+                                         centers of shape (cells, 2)
+            process_id (int): The first free number of the process ids
+
+        Returns:
+            tuple: The value strings of shape (cells, raster maps) as
+                   numpy.ndarray and the next free number of the process ids
+        """
+        pc = {
+            "list": [
+                {
+                    "id": "g_region_%i" % process_id,
+                    "module": "g.region",
+                    "inputs": [{"param": "raster", "value": raster_names[0]}],
+                    "superquiet": True
+                }
+            ],
+            "version": "1",
+        }
+        r_what_runs = []
+        for first in range(0, len(coordinates), R_WHAT_MAX_COORDINATES):
+            batch = coordinates[first:first + R_WHAT_MAX_COORDINATES]
+            r_what_id = "r_what_%i" % (process_id + len(pc["list"]))
+            r_what_runs.append((r_what_id, len(batch)))
+            pc["list"].append(
+                {
+                    "id": r_what_id,
+                    "module": "r.what",
+                    "inputs": [
+                        {"param": "map", "value": ",".join(raster_names)},
+                        {
+                            "param": "coordinates",
+                            "value": format_coordinates(batch),
+                        },
+                        {"param": "separator", "value": "pipe"},
+                        {"param": "null_value", "value": NULL_VALUE},
+                    ],
+                    "superquiet": True
+                }
+            )
+        # The region is the extent of a raster map layer
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        try:
+            values = np.concatenate(
+                [
+                    parse_r_what_values(
+                        self.module_output_dict[r_what_id]["stdout"],
+                        num_coordinates,
+                        len(raster_names),
+                    )
+                    for r_what_id, num_coordinates in r_what_runs
+                ]
+            )
+        except ValueError as e:
+            raise AsyncProcessError("Unable to parse r.what output: " + str(e))
+        return values, process_id + len(pc["list"])
 
+    def _execute_r_what(self):
+        """Sample the STRDS with r.what
+
+        The raster map layers are grouped by cell grid, the points are
+        converted into the cells of each grid once and each batch of raster
+        map layers is queried at the cell centers with r.what runs of at most
+        R_WHAT_MAX_COORDINATES cell centers. Points in the same cell are
+        queried once.
+        The result has the layout of the t.rast.sample output.
+        """
         self._setup()
-        where = None
 
-        # Points and where statement are stored in self.request_data
-        strds_name = self.map_name
+        strds_name = "%s@%s" % (self.map_name, self.mapset_name)
+        where = self.request_data.get("where")
         points = self.request_data["points"]
-        if "where" in self.request_data:
-            where = self.request_data["where"]
-
         if not points or len(points) == 0:
             raise AsyncProcessError("Empty coordinate list")
+        try:
+            ids, coordinates = parse_sample_points(points)
+        except ValueError as e:
+            raise AsyncProcessError(str(e))
 
-        point_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+        wheres = self._get_sampling_wheres(where)
+
+        pc = {
+            "list": [
+                create_t_rast_list_pc(
+                    strds_name, where, "t_rast_list_%i" % (number + 1),
+                    columns="id,start_time,end_time",
+                )
+                for number, where in enumerate(wheres)
+            ],
+            "version": "1",
+        }
+        self.skip_region_check = True
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
         )
-        result_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
+        self._execute_process_list(process_list)
+        map_list = []
+        for entry in pc["list"]:
+            stdout = self.module_output_dict[entry["id"]]["stdout"]
+            map_list.extend(
+                line.strip().split("|")[:3]
+                for line in stdout.splitlines()
+                if "|" in line
+            )
+
+        # Group the raster map layers by cell grid
+        grids = {}
+        for position, (raster_id, _, _) in enumerate(map_list):
+            name, mapset = split_raster_name(raster_id, self.mapset_name)
+            grid = get_header_grid(
+                read_raster_header(self.temp_project_path, mapset, name)
+            )
+            grids.setdefault(get_grid_key(grid), (grid, []))[1].append(
+                position
+            )
+
+        values = np.full((len(map_list), len(ids)), NULL_VALUE, dtype=object)
+        process_id = len(pc["list"]) + 1
+        for grid, positions in grids.values():
+            rows, cols, inside = compute_cell_indices(grid, coordinates)
+            if not inside.any():
+                continue
+            inside_points = np.flatnonzero(inside)
+            unique, inverse = deduplicate_points(
+                coordinates[inside_points], grid
+            )
+            cells = inside_points[unique]
+            centers = get_cell_centers(grid, rows[cells], cols[cells])
+            for first in range(0, len(positions), R_WHAT_MAX_MAPS):
+                batch = positions[first:first + R_WHAT_MAX_MAPS]
+                batch_values, process_id = self._run_r_what(
+                    [map_list[position][0] for position in batch],
+                    centers,
+                    process_id,
+                )
+                values[np.ix_(batch, inside_points)] = batch_values.T[
+                    :, inverse
+                ]
+
+        output_list = [["start_time", "end_time"] + ids]
+        for (_, start_time, end_time), row in zip(map_list, values):
+            output_list.append([start_time, end_time] + list(row))
+
+        self._store_sample_results(output_list)
+
+    def _store_sample_results(self, rows):
+        """Store the sampled rows in the output format of the request
+
+        The json output stores the rows as module results. The ndjson and
+        npz outputs write the rows into a file of the resource storage while
+        they are read and store only the header as module results.
+
+        Args:
+            rows: An iterable of the header and the rows
+        """
+        user_data = self.rdc.user_data or {}
+        output_format = user_data.get("output_format", "json")
+        if output_format == "json":
+            self.module_results = list(rows)
+            return
+
+        self.storage_interface = self.rdc.create_storage_interface()
+        self.storage_interface.setup()
+        if output_format == "npz":
+            file_path = os.path.join(self.temp_file_path, NPZ_FILE_NAME)
+            count, header, last = write_strds_sample_npz(
+                rows, file_path, user_data.get("dtype", "float64")
+            )
+        else:
+            file_path = os.path.join(self.temp_file_path, NDJSON_FILE_NAME)
+            with open(file_path, "w") as ndjson_file:
+                count, header, last = write_ndjson(rows, ndjson_file)
+        self.resource_url_list.append(
+            self.storage_interface.store_resource(file_path)
         )
+        self.module_results = [header] if header is not None else []
+        self.cursor_rows = self.module_results + ([last] if count > 1 else [])
 
-        for tuple in points:
-            if len(tuple) != 3:
-                raise AsyncProcessError("Wrong number of coordinate entries")
+    @staticmethod
+    def _expand_sample_rows(rows, expansion):
+        """Expand the sampled rows of deduplicated points to all point ids
 
-            id, x, y = tuple
-            row = "%s|%s|%s\n" % (id, x, y)
-            point_file.write(row.encode())
+        Args:
+            rows: An iterable of the header and the rows
+            expansion (tuple): The (ids, inverse) of
+                               point_sampling.deduplicate_points() or None
 
-        point_file.flush()
+        Returns:
+            The iterable of the expanded rows
+        """
+        if expansion is None:
+            return rows
+        return expand_sample_rows(rows, *expansion)
 
+    @staticmethod
+    def _read_result_files(file_names):
+        """Open the t.rast.sample output files one after another
+
+        Yields:
+            file: The open output file
+        """
+        for file_name in file_names:
+            with open(file_name, "r") as result_file:
+                yield result_file
+
+    def _send_to_database(self, document, final=False):
+        """Add the resume cursor to the finished response"""
+        if final is True and self.strds_modification_time is not None:
+            http_code, response_model = pickle.loads(document)
+            if response_model.get("status") == "finished":
+                cursor = create_sampling_cursor(
+                    self.cursor_rows
+                    if self.cursor_rows is not None
+                    else self.module_results,
+                    (self.rdc.user_data or {}).get("cursor"),
+                    self.strds_modification_time,
+                )
+                cursor["maps_digest"] = self._get_maps_digest(
+                    cursor["start_time"]
+                )
+                response_model["cursor"] = cursor
+                document = pickle.dumps([http_code, response_model])
+        EphemeralProcessing._send_to_database(self, document, final)
+
+    def _get_maps_digest(self, start_time):
+        """Create the digest of the raster map layers up to a start time
+        with the temporal index of the STRDS
+
+        Args:
+            start_time (str): The start time or None
+
+        Returns:
+            str: The digest or None if there is no index
+        """
+        if self.temporal_index is None or start_time is None:
+            return None
+        return self.temporal_index.get_maps_digest(
+            datetime.fromisoformat(str(start_time))
+        )
+
+    def _read_modification_time(self):
+        """Read the modification time of the STRDS from the temporal index,
+        t.info only runs for STRDS without index
+
+        Returns:
+            str: The modification time or None
+        """
+        if getattr(self.temporal_index, "modification_time", None):
+            return self.temporal_index.modification_time
         pc = {
             "list": [
                 {
-                    "id": "v_in_ascii_1",
-                    "module": "v.in.ascii",
+                    "id": "t_info_cursor",
+                    "module": "t.info",
                     "inputs": [
                         {
                             "param": "input",
-                            "value": point_file.name,
-                        },
-                        {
-                            "param": "format",
-                            "value": "point",
-                        },
-                        {
-                            "param": "column",
-                            "value": "id text, x double precision, y double "
-                                     "precision",
+                            "value": "%s@%s" % (
+                                self.map_name, self.mapset_name
+                            ),
                         },
-                        {
-                            "param": "x",
-                            "value": "2",
-                        },
-                        {
-                            "param": "y",
-                            "value": "3",
-                        }
+                        {"param": "type", "value": "strds"},
                     ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "input_points",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_rast_sample_2",
-                    "module": "t.rast.sample",
-                    "inputs": [
-                        {
-                            "param": "strds",
-                            "value": "%s@%s" % (strds_name, self.mapset_name),
-                        },
-                        {
-                            "param": "points",
-                            "value": "input_points",
-                        },
-                        {
-                            "param": "column",
-                            "value": "id",
-                        }
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": result_file.name,
-                        }
-                    ],
-                    "flags": "rn",
-                    "superquiet": True
-                },
+                    "flags": "g",
+                }
             ],
             "version": "1",
         }
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+        return parse_modification_time(
+            self.module_output_dict["t_info_cursor"]["stdout"]
+        )
+
+    def _get_sampling_wheres(self, where):
+        """Combine the where statement with the resume cursor and the time
+        window of the request
+
+        Time windows with granularity that were not resolved by the temporal
+        index are resolved with t.rast.list. The start times selected by
+        granularity are split into time chunks, so that each where statement
+        stays below the argument length limit of the modules.
+
+        Args:
+            where (str): The where statement of the request or None
+
+        Returns:
+            list: The where statements of the time chunks in time order, a
+                  where statement is None to sample all raster map layers
+        """
+        user_data = self.rdc.user_data or {}
+        self.temporal_index = get_strds_temporal_index(self.rdc)
+        self.strds_modification_time = self._read_modification_time()
+        cursor = user_data.get("cursor")
+        if cursor is not None:
+            where = create_cursor_where(
+                cursor,
+                where,
+                is_cursor_backfilled(
+                    cursor,
+                    self.strds_modification_time,
+                    self._get_maps_digest(cursor["start_time"]),
+                ),
+            )
+        window = user_data.get("window")
+        if window is None:
+            return [where]
+        start_times = user_data.get("start_times")
+        if window["granularity"] is not None and start_times is None:
+            pc = {
+                "list": [
+                    create_t_rast_list_pc(
+                        "%s@%s" % (self.map_name, self.mapset_name),
+                        create_sampling_where(window, where),
+                        "t_rast_list_window",
+                        columns="start_time",
+                    )
+                ],
+                "version": "1",
+            }
+            process_list = self._validate_process_chain(
+                process_chain=pc, skip_permission_check=True
+            )
+            self._execute_process_list(process_list)
+            stdout = self.module_output_dict["t_rast_list_window"]["stdout"]
+            start_times = select_granularity_steps(
+                sorted(
+                    set(
+                        datetime.fromisoformat(line.strip())
+                        for line in stdout.splitlines()
+                        if line.strip()
+                    )
+                ),
+                window,
+            )
+            if len(start_times) == 0:
+                raise AsyncProcessError(
+                    "No raster maps found in the time window"
+                )
+        return create_sampling_wheres(window, where, start_times)
+
+    def _list_start_times(self, request_where, where):
+        """List the distinct start times of the raster map layers to sample
+        in time order
+
+        The start times are selected with the temporal index of the STRDS.
+        Requests with a where statement or a resume cursor, which the index
+        can not evaluate, and STRDS without index are listed with
+        t.rast.list.
+
+        Args:
+            request_where (str): The where statement of the request or None
+            where (str): The combined where statement of the request, the
+                         resume cursor and the time window or None
+
+        Returns:
+            list: The start times in the format of the temporal database
+        """
+        user_data = self.rdc.user_data or {}
+        if not request_where and user_data.get("cursor") is None:
+            start_times = user_data.get("start_times")
+            if start_times is None:
+                start_times = select_sampling_window(
+                    self.temporal_index, user_data.get("window") or {}
+                )
+            if start_times is not None:
+                return [str(start_time) for start_time in start_times]
+
+        pc = {
+            "list": [
+                create_t_rast_list_pc(
+                    "%s@%s" % (self.map_name, self.mapset_name),
+                    where,
+                    "t_rast_list_chunks",
+                    columns="start_time",
+                )
+            ],
+            "version": "1",
+        }
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+        return [
+            line.strip()
+            for line in self.module_output_dict["t_rast_list_chunks"][
+                "stdout"
+            ].splitlines()
+            if line.strip()
+        ]
 
+    def _sample_strds(self, import_pc, column, where, expansion=None):
+        """Import the points, sample the STRDS with t.rast.sample and store
+        the results
+
+        STRDS with at least two times chunk_maps raster map layers are split
+        into contiguous time chunks that are sampled by parallel
+        t.rast.sample processes. The chunk outputs are read line by line and
+        stitched into the layout of a single t.rast.sample run.
+        The where statement is combined with the time window of the request,
+        time windows that are split into several where statements are
+        sampled by one t.rast.sample process per where statement.
+
+        Args:
+            import_pc (dict): The process chain entry that imports the points
+                              as vector map input_points
+            column (str): The id column of the points or None to use the
+                          category
+            where (str): The where statement or None
+            expansion (tuple): The (ids, inverse) to expand the results of
+                               deduplicated points to all point ids or None
+        """
+        strds_name = "%s@%s" % (self.map_name, self.mapset_name)
+        user_data = self.rdc.user_data or {}
+        nprocs = user_data.get("nprocs", STRDS_SAMPLING_PARALLEL_NPROCS)
+        chunk_maps = user_data.get("chunk_maps", STRDS_SAMPLING_CHUNK_MAPS)
+        wheres = self._get_sampling_wheres(where)
+        if nprocs > 1 and len(wheres) == 1:
+            start_times = self._list_start_times(where, wheres[0])
+            num_chunks = min(nprocs, len(start_times) // max(1, chunk_maps))
+            if num_chunks > 1:
+                wheres = [
+                    create_time_chunk_where(chunk, wheres[0])
+                    for chunk in split_time_chunks(start_times, num_chunks)
+                ]
+
+        pc = {"list": [import_pc], "version": "1"}
+        process_list = self._validate_process_chain(
+            process_chain=pc, skip_permission_check=True
+        )
+        self._execute_process_list(process_list)
+
+        if len(wheres) > 1:
+            result_files = self._run_parallel_t_rast_sample(
+                strds_name, column, wheres, nprocs
+            )
+            self._store_sample_results(
+                self._expand_sample_rows(
+                    iter_sample_rows(self._read_result_files(result_files)),
+                    expansion,
+                )
+            )
+            return
+
+        where = wheres[0]
+        result_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=False
+        )
+        sample_pc = {
+            "id": "t_rast_sample_%i" % (len(pc["list"]) + 1),
+            "module": "t.rast.sample",
+            "inputs": [
+                {
+                    "param": "strds",
+                    "value": strds_name,
+                },
+                {
+                    "param": "points",
+                    "value": "input_points",
+                }
+            ],
+            "outputs": [
+                {
+                    "param": "output",
+                    "value": result_file.name,
+                }
+            ],
+            "flags": "rn",
+            "superquiet": True
+        }
+        if column is not None:
+            sample_pc["inputs"].append({"param": "column", "value": column})
         if where is not None:
-            pc["list"][1]["inputs"].append({"param": "where", "value": where})
+            sample_pc["inputs"].append({"param": "where", "value": where})
+
+        process_list = self._validate_process_chain(
+            process_chain={"list": [sample_pc], "version": "1"},
+            skip_permission_check=True,
+        )
+        self._execute_process_list(process_list)
+
+        result_file.close()
+        self._store_sample_results(
+            self._expand_sample_rows(
+                iter_sample_rows(self._read_result_files([result_file.name])),
+                expansion,
+            )
+        )
+
+    def _run_parallel_t_rast_sample(self, strds_name, column, wheres, nprocs):
+        """Sample the time chunks of the STRDS with parallel t.rast.sample
+        processes, at most nprocs processes run at the same time
 
-        self.request_data = pc
+        Each process runs in its own temporary mapset and reads the STRDS
+        and the imported points of the temporary mapset of the job.
 
-        # Run the process chain
-        EphemeralProcessing._execute(self, skip_permission_check=True)
+        Args:
+            strds_name (str): The fully qualified STRDS name
+            column (str): The id column of the points or None
+            wheres (list): The where statements of the time chunks in time
+                           order
+            nprocs (int): The maximum number of parallel processes
 
-        result = open(result_file.name, "r").readlines()
+        Returns:
+            list: The output files of the chunks in time order
+        """
+        chunk_procs = []
+        outputs = []
+        try:
+            for number, where in enumerate(wheres):
+                if len(chunk_procs) - len(outputs) >= max(1, nprocs):
+                    outputs.append(
+                        self._wait_for_chunk(*chunk_procs[len(outputs)])
+                    )
+                result_file = tempfile.NamedTemporaryFile(
+                    dir=self.temp_file_path, delete=False
+                )
+                log_file = tempfile.TemporaryFile(dir=self.temp_file_path)
+                parameter = [
+                    "strds=" + strds_name,
+                    "points=input_points@" + self.temp_mapset_name,
+                    "output=" + result_file.name,
+                    "-rn",
+                    "--q",
+                ]
+                if where is not None:
+                    parameter.append("where=" + where)
+                if column is not None:
+                    parameter.append("column=" + column)
+                # The process inherits the GISRC of the chunk mapset
+                gisrc = os.environ["GISRC"]
+                os.environ["GISRC"] = self._create_chunk_mapset(number + 1)
+                try:
+                    proc = self.ginit.run_module(
+                        "t.rast.sample",
+                        parameter,
+                        raw=True,
+                        stdout=log_file,
+                        stderr=log_file,
+                    )
+                finally:
+                    os.environ["GISRC"] = gisrc
+                chunk_procs.append(
+                    (
+                        "t_rast_sample_chunk_%i" % (number + 1),
+                        proc,
+                        parameter,
+                        result_file,
+                        log_file,
+                    )
+                )
+            while len(outputs) < len(chunk_procs):
+                outputs.append(
+                    self._wait_for_chunk(*chunk_procs[len(outputs)])
+                )
+        except Exception:
+            for _, proc, _, _, _ in chunk_procs:
+                if proc.poll() is None:
+                    proc.kill()
+            raise
 
-        output_list = []
-        for line in result:
-            output_list.append(line.strip().split("|"))
+        return outputs
 
-        self.module_results = output_list
+    def _create_chunk_mapset(self, number):
+        """Create the temporary mapset of a time chunk in the temporary
+        project of the job
 
-        point_file.close()
+        The mapset gets the region and the mapset search path of the
+        temporary mapset of the job.
+
+        Args:
+            number (int): The number of the time chunk
+
+        Returns:
+            str: The path of the GISRC file of the mapset
+        """
+        mapset_name = "%s_chunk_%i" % (self.temp_mapset_name, number)
+        mapset_path = os.path.join(self.temp_project_path, mapset_name)
+        os.mkdir(mapset_path)
+        for file_name in ["WIND", "SEARCH_PATH"]:
+            file_path = os.path.join(self.temp_mapset_path, file_name)
+            if os.path.isfile(file_path):
+                shutil.copyfile(
+                    file_path, os.path.join(mapset_path, file_name)
+                )
+        gisrc_path = tempfile.mkdtemp(dir=self.temp_file_path)
+        GrassGisRC(
+            self.temp_grass_data_base, self.project_name, mapset_name
+        ).write(gisrc_path)
+        return os.path.join(gisrc_path, "gisrc")
+
+    def _wait_for_chunk(self, chunk_id, proc, parameter, result_file,
+                        log_file):
+        """Wait for the t.rast.sample process of a time chunk and log it
+
+        Returns:
+            str: The output file of the chunk
+        """
+        run_time = self._wait_for_process(
+            "t.rast.sample", parameter, proc, 0.05
+        )
+        proc.wait()
+        log_file.seek(0)
+        log = log_file.read().decode()
+        log_file.close()
+        self.module_output_log.append(
+            ProcessLogModel(
+                id=chunk_id,
+                executable="t.rast.sample",
+                parameter=parameter,
+                return_code=proc.returncode,
+                stdout="",
+                stderr=log.split("\n"),
+                run_time=run_time,
+            )
+        )
+        if proc.returncode != 0:
+            raise AsyncProcessError(
+                "Error while running executable <t.rast.sample> for "
+                "time chunk <%s>" % chunk_id
+            )
         result_file.close()
+        return result_file.name
+
+    def _execute(self):
+
+        user_data = self.rdc.user_data or {}
+        if user_data.get("engine", STRDS_SAMPLING_ENGINE) == "r.what":
+            self._execute_r_what()
+            return
+
+        self._setup()
+        where = None
+
+        # Points and where statement are stored in self.request_data
+        points = self.request_data["points"]
+        if "where" in self.request_data:
+            where = self.request_data["where"]
+
+        if not points or len(points) == 0:
+            raise AsyncProcessError("Empty coordinate list")
+
+        try:
+            ids, coordinates = parse_sample_points(points)
+        except ValueError as e:
+            raise AsyncProcessError(str(e))
+
+        # Points with identical coordinates are imported and sampled once
+        unique, inverse = deduplicate_points(coordinates)
+        expansion = None
+        if len(unique) < len(ids):
+            expansion = (ids, inverse)
+
+        point_file = tempfile.NamedTemporaryFile(
+            dir=self.temp_file_path, delete=True
+        )
+
+        for position in unique.tolist():
+            id, x, y = points[position]
+            row = "%s|%s|%s\n" % (id, x, y)
+            point_file.write(row.encode())
+
+        point_file.flush()
+
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
+
+        import_pc = {
+            "id": "v_in_ascii_1",
+            "module": "v.in.ascii",
+            "inputs": [
+                {
+                    "param": "input",
+                    "value": point_file.name,
+                },
+                {
+                    "param": "format",
+                    "value": "point",
+                },
+                {
+                    "param": "column",
+                    "value": "id text, x double precision, y double "
+                             "precision",
+                },
+                {
+                    "param": "x",
+                    "value": "2",
+                },
+                {
+                    "param": "y",
+                    "value": "3",
+                }
+            ],
+            "outputs": [
+                {
+                    "param": "output",
+                    "value": "input_points",
+                }
+            ],
+            "superquiet": True
+        }
+
+        self._sample_strds(import_pc, "id", where, expansion)
+
+        point_file.close()
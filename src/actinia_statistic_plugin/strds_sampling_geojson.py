@@ -4,21 +4,35 @@ Sample a space-time raster dataset at specific vector points
 """
 
 import pickle
-import tempfile
-from flask import jsonify, make_response
-from flask.json import dumps as json_dumps
+from flask import jsonify, make_response, request
 from copy import deepcopy
 from flask_restful_swagger_2 import swagger
 from actinia_core.models.response_models import (
     ProcessingResponseModel,
     ProcessingErrorResponseModel,
 )
-from actinia_core.processing.actinia_processing.ephemeral_processing import (
-    EphemeralProcessing,
-)
 from actinia_core.rest.base.resource_base import ResourceBase
 from actinia_core.core.common.kvdb_interface import enqueue_job
 from actinia_api import URL_PREFIX
+from .config import (
+    STRDS_SAMPLING_CHUNK_MAPS,
+    STRDS_SAMPLING_PARALLEL_NPROCS,
+)
+from .response_models import SAMPLING_CURSOR_PROPERTY
+from .result_formats import (
+    create_output_format_parameters,
+    parse_dtype,
+    parse_output_format,
+)
+from .geojson_utils import create_geojson_import_pc, load_geojson
+from .raster_utils import get_project_epsg
+from .strds_sampling import (
+    AsyncEphemeralSTRDSSampling,
+    CHUNK_MAPS_QUERY_PARAMETER,
+    NPROCS_QUERY_PARAMETER,
+    create_sampling_user_data,
+)
+from .strds_utils import parse_chunk_maps, parse_nprocs
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert"
@@ -38,6 +52,7 @@ class STRDSSampleGeoJSONResponseModel(ProcessingResponseModel):
         "type": "array",
         "items": {"type": "string", "minItems": 3},
     }
+    properties["cursor"] = deepcopy(SAMPLING_CURSOR_PROPERTY)
     required = deepcopy(ProcessingResponseModel.required)
     example = {
         "accept_datetime": "2017-09-04 19:41:41.456341",
@@ -151,6 +166,10 @@ class STRDSSampleGeoJSONResponseModel(ProcessingResponseModel):
                 "7.87268863552",
             ],
         ],
+        "cursor": {
+            "start_time": "2012-01-01 00:00:00",
+            "modification_time": "2017-09-04 18:12:33.172411",
+        },
         "progress": {"num_of_steps": 2, "step": 2},
         "resource_id": "resource_id-6ee74d8c-1ef6-4b01-a098-2bc04bcb75c8",
         "status": "finished",
@@ -205,7 +224,13 @@ SCHEMA_DOC = {
         {
             "name": "points",
             "description": "GeoJSON vector input that contains the vector "
-            "points for sampling",
+            "points for sampling. The optional members start_time and "
+            "end_time (format YYYY-MM-DDTHH:MM:SS) restrict the sampling to "
+            "the raster map layers with a start time in this time window, "
+            "the optional member granularity (for example 1 month) samples "
+            "only the first raster map layer of each granule. The optional "
+            "member cursor is the resume cursor of a previous response to "
+            "sample only the raster map layers that are new since then",
             "required": True,
             "in": "body",
             "schema": "string",
@@ -225,6 +250,9 @@ SCHEMA_DOC = {
 }
                         """,
         },
+        NPROCS_QUERY_PARAMETER,
+        CHUNK_MAPS_QUERY_PARAMETER,
+        *create_output_format_parameters(),
     ],
     "responses": {
         "200": {
@@ -245,6 +273,17 @@ class AsyncEphemeralSTRDSSamplingGeoJSONResource(ResourceBase):
 
     def _execute(self, project_name, mapset_name, strds_name):
 
+        try:
+            nprocs = parse_nprocs(request.args, STRDS_SAMPLING_PARALLEL_NPROCS)
+            chunk_maps = parse_chunk_maps(
+                request.args, STRDS_SAMPLING_CHUNK_MAPS
+            )
+            output_format = parse_output_format(request.args)
+            dtype = parse_dtype(request.args)
+        except ValueError as e:
+            self.create_error_response(message=str(e))
+            return None
+
         rdc = self.preprocess(
             has_json=True,
             has_xml=False,
@@ -253,6 +292,24 @@ class AsyncEphemeralSTRDSSamplingGeoJSONResource(ResourceBase):
             map_name=strds_name,
         )
         if rdc:
+            try:
+                user_data = create_sampling_user_data(
+                    rdc, load_geojson(rdc.request_data)
+                )
+            except ValueError as e:
+                # preprocess() committed the accepted status, the error
+                # response replaces it in the resource logger
+                self.get_error_response(message=str(e))
+                return None
+            user_data.update(
+                {
+                    "nprocs": nprocs,
+                    "chunk_maps": chunk_maps,
+                    "output_format": output_format,
+                    "dtype": dtype,
+                }
+            )
+            rdc.set_user_data(user_data)
             # # for debugging
             # processing = AsyncEphemeralSTRDSSamplingGeoJSON(rdc)
             # processing.run()
@@ -289,87 +346,28 @@ def start_job(*args):
     processing.run()
 
 
-class AsyncEphemeralSTRDSSamplingGeoJSON(EphemeralProcessing):
+class AsyncEphemeralSTRDSSamplingGeoJSON(AsyncEphemeralSTRDSSampling):
     """Sample a STRDS at vector points using GeoJSON as input"""
 
     def __init__(self, *args):
-        EphemeralProcessing.__init__(self, *args)
+        AsyncEphemeralSTRDSSampling.__init__(self, *args)
         self.response_model_class = STRDSSampleGeoJSONResponseModel
 
     def _execute(self):
         self._setup()
 
-        # Points and where statement are stored in self.request_data
-        strds_name = self.map_name
+        # The GeoJSON points are stored in self.request_data
         geojson = self.request_data
 
-        point_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
-        )
-        result_file = tempfile.NamedTemporaryFile(
-            dir=self.temp_file_path, delete=True
-        )
-
-        point_file.write(json_dumps(geojson).encode())
-        point_file.flush()
+        self.required_mapsets.append(self.mapset_name)
+        self._create_temporary_grass_environment()
 
-        pc = {
-            "list": [
-                {
-                    "id": "v_import_1",
-                    "module": "v.import",
-                    "inputs": [
-                        {
-                            "param": "input",
-                            "value": point_file.name,
-                        }
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": "input_points",
-                        }
-                    ],
-                    "superquiet": True
-                },
-                {
-                    "id": "t_rast_sample_2",
-                    "module": "t.rast.sample",
-                    "inputs": [
-                        {
-                            "param": "strds",
-                            "value": "%s@%s" % (strds_name, self.mapset_name),
-                        },
-                        {
-                            "param": "points",
-                            "value": "input_points",
-                        }
-                    ],
-                    "outputs": [
-                        {
-                            "param": "output",
-                            "value": result_file.name,
-                        }
-                    ],
-                    "flags": "rn",
-                    "superquiet": True
-                },
-            ],
-            "version": "1",
-        }
-
-        self.request_data = pc
-
-        # Run the process chain
-        EphemeralProcessing._execute(self, skip_permission_check=True)
-
-        result = open(result_file.name, "r").readlines()
-
-        output_list = []
-        for line in result:
-            output_list.append(line.strip().split("|"))
-
-        self.module_results = output_list
+        import_pc, _ = create_geojson_import_pc(
+            geojson,
+            get_project_epsg(self.temp_project_path),
+            self.temp_file_path,
+            "input_points",
+            "v_import_1",
+        )
 
-        point_file.close()
-        result_file.close()
+        self._sample_strds(import_pc, None, None)
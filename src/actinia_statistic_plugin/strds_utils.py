@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+"""
+Helper functions to select the raster map layers of a space-time raster
+dataset in a time range.
+"""
+
+import calendar
+import re
+from datetime import datetime, timedelta
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# The maximum number of start times in the where statement of a sampling
+# run, the where statement is a single module argument that is limited by
+# the maximum argument length of the operating system
+SAMPLING_WHERE_MAX_TIMES = 1000
+
+# The units of a granularity like "1 month" or "10 days"
+GRANULARITY_UNITS = [
+    "second", "minute", "hour", "day", "week", "month", "year"
+]
+
+# The query parameters of the time range resources
+TIME_RANGE_QUERY_PARAMETERS = [
+    {
+        "name": "start",
+        "description": "Select the raster map layers with a start time "
+        "later or equal to this time stamp. "
+        "Required format is: YYYY-MM-DDTHH:MM:SS for example "
+        "2001-03-16T12:30:15.",
+        "required": False,
+        "in": "query",
+        "type": "string",
+        "format": "dateTime",
+    },
+    {
+        "name": "end",
+        "description": "Select the raster map layers with a start time "
+        "earlier than this time stamp. "
+        "Required format is: YYYY-MM-DDTHH:MM:SS for example "
+        "2001-03-16T12:30:15.",
+        "required": False,
+        "in": "query",
+        "type": "string",
+        "format": "dateTime",
+    },
+    {
+        "name": "where",
+        "description": "An additional SQL where statement to select the "
+        "raster map layers, for example: start_time > '2001-01-01'",
+        "required": False,
+        "in": "query",
+        "type": "string",
+    },
+]
+
+
+def parse_time_range(args):
+    """Parse the time range query parameters start, end and where of a
+    request
+
+    Args:
+        args (dict): The query parameters of the request
+
+    Raises:
+        ValueError: In case of a wrong time stamp format
+
+    Returns:
+        dict: The start and end time in the temporal database format
+              YYYY-MM-DD HH:MM:SS and the where statement, None if not set
+    """
+    time_range = {"start": None, "end": None, "where": args.get("where")}
+    for key in ["start", "end"]:
+        timestamp = args.get(key)
+        if timestamp is None:
+            continue
+        try:
+            time_range[key] = str(
+                datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+            )
+        except ValueError:
+            raise ValueError(
+                "Wrong %s time stamp format. Required format is: "
+                "YYYY-MM-DDTHH:MM:SS for example 2001-03-16T12:30:15" % key
+            )
+    return time_range
+
+
+def create_time_range_where(time_range):
+    """Create the temporal where statement of the time range
+
+    Args:
+        time_range (dict): The time range from parse_time_range()
+
+    Returns:
+        str: The where statement or None to select all raster map layers
+    """
+    conditions = []
+    if time_range.get("start"):
+        conditions.append("start_time >= '%s'" % time_range["start"])
+    if time_range.get("end"):
+        conditions.append("start_time < '%s'" % time_range["end"])
+    if time_range.get("where"):
+        conditions.append("(%s)" % time_range["where"])
+    if not conditions:
+        return None
+    return " AND ".join(conditions)
+
+
+def create_timestamp_where(timestamp):
+    """Create the where statement that selects the raster map layers that
+    are valid at a time stamp, start_time <= timestamp < end_time, or that
+    have the time stamp as time instance
+
+    Args:
+        timestamp (str): The time stamp in the format YYYY-MM-DDTHH:MM:SS
+
+    Returns:
+        str: The where statement
+    """
+    timestamp = str(datetime.strptime(timestamp, TIMESTAMP_FORMAT))
+    return (
+        "start_time <= '%(t)s' AND (end_time > '%(t)s' OR "
+        "(end_time IS NULL AND start_time = '%(t)s'))" % {"t": timestamp}
+    )
+
+
+def create_t_rast_list_pc(strds_name, where, list_id,
+                          columns="id,start_time"):
+    """Create the t.rast.list process chain entry that lists the id and the
+    start time of the raster map layers ordered by start time
+
+    Args:
+        strds_name (str): The fully qualified STRDS name
+        where (str): The where statement or None
+        list_id (str): The process id of the t.rast.list call
+        columns (str): The columns to list
+
+    Returns:
+        dict: The process chain entry
+    """
+    inputs = [
+        {"param": "input", "value": strds_name},
+        {"param": "columns", "value": columns},
+        {"param": "order", "value": "start_time"},
+        {"param": "separator", "value": "|"},
+    ]
+    if where is not None:
+        inputs.append({"param": "where", "value": where})
+    return {
+        "id": list_id,
+        "module": "t.rast.list",
+        "inputs": inputs,
+        "flags": "u",
+        "superquiet": True
+    }
+
+
+def format_start_time(start_time):
+    """Convert a start time of the temporal database into the time stamp
+    format of the resources, for example 2001-03-16T12:30:15
+    """
+    return start_time.strip().replace(" ", "T")
+
+
+def parse_raster_map_list(stdout):
+    """Parse the t.rast.list output of create_t_rast_list_pc()
+
+    Args:
+        stdout (str): The output of t.rast.list
+
+    Returns:
+        list: A list of (raster map layer id, start time) tuples
+    """
+    map_list = []
+    for line in stdout.splitlines():
+        if "|" not in line:
+            continue
+        raster_name, start_time = line.strip().split("|")[:2]
+        map_list.append((raster_name, format_start_time(start_time)))
+    return map_list
+
+
+def parse_nprocs(args, max_nprocs):
+    """Parse the nprocs query parameter of a request
+
+    Args:
+        args (dict): The query parameters of the request
+        max_nprocs (int): The configured maximum number of processes
+
+    Raises:
+        ValueError: If nprocs is not a positive integer
+
+    Returns:
+        int: The number of processes, capped by max_nprocs
+    """
+    nprocs = args.get("nprocs")
+    if nprocs is None:
+        return max(1, max_nprocs)
+    try:
+        nprocs = int(nprocs)
+    except ValueError:
+        nprocs = 0
+    if nprocs < 1:
+        raise ValueError("The nprocs parameter must be a positive integer")
+    return max(1, min(nprocs, max_nprocs))
+
+
+def parse_chunk_maps(args, default_chunk_maps):
+    """Parse the chunk_maps query parameter of a request
+
+    Args:
+        args (dict): The query parameters of the request
+        default_chunk_maps (int): The configured number of raster map layers
+                                  of a time chunk
+
+    Raises:
+        ValueError: If chunk_maps is not a positive integer
+
+    Returns:
+        int: The minimum number of raster map layers of a time chunk
+    """
+    chunk_maps = args.get("chunk_maps")
+    if chunk_maps is None:
+        return max(1, default_chunk_maps)
+    try:
+        chunk_maps = int(chunk_maps)
+    except ValueError:
+        chunk_maps = 0
+    if chunk_maps < 1:
+        raise ValueError("The chunk_maps parameter must be a positive integer")
+    return chunk_maps
+
+
+def split_time_chunks(start_times, num_chunks):
+    """Split the ordered start times of raster map layers into contiguous
+    time chunks, raster map layers with the same start time are always in
+    the same chunk
+
+    Args:
+        start_times (list): The start times ordered by start time
+        num_chunks (int): The maximum number of chunks
+
+    Returns:
+        list: A list of (first start time, last start time) tuples
+    """
+    distinct = []
+    for start_time in start_times:
+        if not distinct or distinct[-1] != start_time:
+            distinct.append(start_time)
+    num_chunks = max(1, min(num_chunks, len(distinct)))
+    chunks = []
+    for chunk in range(num_chunks):
+        first = chunk * len(distinct) // num_chunks
+        last = (chunk + 1) * len(distinct) // num_chunks - 1
+        chunks.append((distinct[first], distinct[last]))
+    return chunks
+
+
+def create_time_chunk_where(chunk, where=None):
+    """Create the where statement of a time chunk
+
+    Args:
+        chunk (tuple): The (first start time, last start time) of the chunk
+        where (str): An additional where statement or None
+
+    Returns:
+        str: The where statement
+    """
+    chunk_where = "start_time >= '%s' AND start_time <= '%s'" % chunk
+    if where:
+        chunk_where += " AND (%s)" % where
+    return chunk_where
+
+
+def iter_sample_rows(outputs):
+    """Iterate the rows of the t.rast.sample -n outputs of time chunks as a
+    single header and row layout, the outputs are read line by line
+
+    Args:
+        outputs: An iterable of the output lines of the chunks in time order,
+                 for example open files
+
+    Yields:
+        list: The header followed by the rows of all chunks, each line split
+              into its values
+    """
+    has_header = False
+    for lines in outputs:
+        is_header = True
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if is_header is True:
+                is_header = False
+                if has_header is True:
+                    continue
+                has_header = True
+            yield line.split("|")
+
+
+def stitch_sample_outputs(outputs):
+    """Stitch the t.rast.sample -n outputs of time chunks into a single
+    header and row layout
+
+    Args:
+        outputs (list): The lists of output lines of the chunks in time order
+
+    Returns:
+        list: The header followed by the rows of all chunks, each line split
+              into its values
+    """
+    return list(iter_sample_rows(outputs))
+
+
+def parse_granularity(granularity):
+    """Parse a granularity like "1 month" or "10 days"
+
+    Args:
+        granularity (str): The granularity
+
+    Raises:
+        ValueError: In case of a wrong granularity format
+
+    Returns:
+        tuple: (number, unit) with the unit in singular, for example
+               (10, "day")
+    """
+    match = re.match(r"^\s*(\d+)\s+([a-z]+?)s?\s*$", str(granularity))
+    if (
+        match is None
+        or int(match.group(1)) < 1
+        or match.group(2) not in GRANULARITY_UNITS
+    ):
+        raise ValueError(
+            "Wrong granularity <%s>. Required format is: <number> <unit> "
+            "with the units %s, for example 1 month"
+            % (granularity, ", ".join(GRANULARITY_UNITS))
+        )
+    return int(match.group(1)), match.group(2)
+
+
+def add_granularity(timestamp, granularity):
+    """Add a multiple of a granularity to a time stamp, the day of month
+    is clipped to the length of the resulting month
+
+    Args:
+        timestamp (datetime): The time stamp
+        granularity (tuple): The (number, unit) from parse_granularity()
+
+    Returns:
+        datetime: The time stamp plus the granularity
+    """
+    number, unit = granularity
+    if unit in ["month", "year"]:
+        months = number * 12 if unit == "year" else number
+        month_index = timestamp.month - 1 + months
+        year = timestamp.year + month_index // 12
+        month = month_index % 12 + 1
+        day = min(timestamp.day, calendar.monthrange(year, month)[1])
+        return timestamp.replace(year=year, month=month, day=day)
+    return timestamp + timedelta(**{unit + "s": number})
+
+
+def parse_sampling_window(data):
+    """Parse the start_time, end_time and granularity fields of a sampling
+    request body
+
+    Args:
+        data (dict): The request body
+
+    Raises:
+        ValueError: In case of wrong time stamps or granularity
+
+    Returns:
+        dict: The start and end time in the temporal database format
+              YYYY-MM-DD HH:MM:SS and the granularity as (number, unit),
+              None if not set, or None if the body has no time window
+    """
+    if not isinstance(data, dict):
+        return None
+    window = {"start": None, "end": None, "granularity": None}
+    for key, field in [("start", "start_time"), ("end", "end_time")]:
+        if data.get(field) is None:
+            continue
+        try:
+            window[key] = str(
+                datetime.strptime(str(data[field]), TIMESTAMP_FORMAT)
+            )
+        except ValueError:
+            raise ValueError(
+                "Wrong %s format. Required format is: YYYY-MM-DDTHH:MM:SS "
+                "for example 2001-03-16T12:30:15" % field
+            )
+    if data.get("granularity") is not None:
+        window["granularity"] = parse_granularity(data["granularity"])
+    if window == {"start": None, "end": None, "granularity": None}:
+        return None
+    if window["start"] and window["end"] and window["start"] >= window["end"]:
+        raise ValueError("The start_time must be earlier than the end_time")
+    return window
+
+
+def select_granularity_steps(start_times, window):
+    """Select the first raster map layer of each granule of the time window,
+    the granules start at the start of the window or at the first start time
+
+    Args:
+        start_times (list): The start times as datetime ordered by start time
+        window (dict): The time window from parse_sampling_window()
+
+    Returns:
+        list: The selected start times
+    """
+    if not start_times or window.get("granularity") is None:
+        return list(start_times)
+    origin = start_times[0]
+    if window.get("start"):
+        origin = datetime.fromisoformat(window["start"])
+    number, unit = window["granularity"]
+    step = 1
+    boundary = origin
+    selected = []
+    for start_time in start_times:
+        if start_time < boundary:
+            continue
+        selected.append(start_time)
+        while boundary <= start_time:
+            boundary = add_granularity(origin, (number * step, unit))
+            step += 1
+    return selected
+
+
+def create_sampling_where(window, where=None, start_times=None):
+    """Create the where statement of the time window of a sampling request
+
+    Args:
+        window (dict): The time window from parse_sampling_window()
+        where (str): An additional where statement or None
+        start_times (list): The start times selected by granularity or None
+
+    Returns:
+        str: The where statement or None to select all raster map layers
+    """
+    conditions = []
+    if start_times is not None:
+        conditions.append(
+            "start_time IN (%s)"
+            % ", ".join("'%s'" % str(start_time) for start_time in start_times)
+        )
+    else:
+        window_where = create_time_range_where(
+            {"start": window.get("start"), "end": window.get("end")}
+        )
+        if window_where is not None:
+            conditions.append(window_where)
+    if where:
+        conditions.append("(%s)" % where)
+    if not conditions:
+        return None
+    return " AND ".join(conditions)
+
+
+def create_sampling_wheres(window, where=None, start_times=None):
+    """Create the where statements of the time window of a sampling request,
+    the start times selected by granularity are split into contiguous time
+    chunks of at most SAMPLING_WHERE_MAX_TIMES start times
+
+    Args:
+        window (dict): The time window from parse_sampling_window()
+        where (str): An additional where statement or None
+        start_times (list): The ordered start times selected by granularity
+                            or None
+
+    Returns:
+        list: The where statements of the time chunks in time order, a
+              where statement is None to select all raster map layers
+    """
+    if not start_times:
+        return [create_sampling_where(window, where, start_times)]
+    return [
+        create_sampling_where(
+            window,
+            where,
+            start_times[first:first + SAMPLING_WHERE_MAX_TIMES],
+        )
+        for first in range(0, len(start_times), SAMPLING_WHERE_MAX_TIMES)
+    ]
+
+
+def _parse_cursor_time(value, key):
+    """Parse a time stamp of a resume cursor into the temporal database
+    format"""
+    try:
+        return str(datetime.fromisoformat(str(value)))
+    except ValueError:
+        raise ValueError(
+            "Wrong %s of the cursor. Required format is: "
+            "YYYY-MM-DD HH:MM:SS for example 2001-03-16 12:30:15" % key
+        )
+
+
+def parse_sampling_cursor(data):
+    """Parse the resume cursor of a sampling request body
+
+    Args:
+        data (dict): The request body with the cursor of a previous response
+
+    Raises:
+        ValueError: In case of a wrong cursor
+
+    Returns:
+        dict: The start time of the last sampled raster map layer, None if
+              no raster map layer was sampled, the modification time of the
+              STRDS and the digest of the raster map layers up to the start
+              time or None, or None if the body has no cursor
+    """
+    if not isinstance(data, dict) or data.get("cursor") is None:
+        return None
+    cursor = data["cursor"]
+    if not isinstance(cursor, dict) or not cursor.get("modification_time"):
+        raise ValueError(
+            "The cursor must be an object with the start_time and the "
+            "modification_time of a previous response"
+        )
+    start_time = cursor.get("start_time")
+    if start_time is not None:
+        start_time = _parse_cursor_time(start_time, "start_time")
+    maps_digest = cursor.get("maps_digest")
+    if maps_digest is not None and not isinstance(maps_digest, str):
+        raise ValueError("The maps_digest of the cursor must be a string")
+    return {
+        "start_time": start_time,
+        "modification_time": _parse_cursor_time(
+            cursor["modification_time"], "modification_time"
+        ),
+        "maps_digest": maps_digest,
+    }
+
+
+def is_cursor_backfilled(cursor, modification_time, maps_digest=None):
+    """Check if raster map layers may have been registered in the STRDS at
+    start times up to the start time of a resume cursor since the cursor
+    was created
+
+    The register of a STRDS does not store when a raster map layer was
+    added. A STRDS that was not modified since the cursor has no new raster
+    map layers. Otherwise the digest of the raster map layers up to the
+    start time of the cursor is compared, without digest the raster map
+    layers may have been added.
+
+    Args:
+        cursor (dict): The cursor from parse_sampling_cursor()
+        modification_time (str): The current modification time of the STRDS
+                                 or None
+        maps_digest (str): The current digest of the raster map layers up to
+                           the start time of the cursor or None
+
+    Returns:
+        bool: True if all raster map layers must be sampled again
+    """
+    if cursor["start_time"] is None:
+        return False
+    if modification_time is None:
+        return True
+    if datetime.fromisoformat(str(modification_time)) <= (
+        datetime.fromisoformat(cursor["modification_time"])
+    ):
+        return False
+    if maps_digest is None or cursor.get("maps_digest") is None:
+        return True
+    return maps_digest != cursor["maps_digest"]
+
+
+def create_cursor_where(cursor, where=None, backfilled=False):
+    """Create the where statement that selects the raster map layers that
+    are new since a resume cursor
+
+    These are the raster map layers with a start time later than the last
+    sampled raster map layer. If raster map layers were registered in the
+    STRDS at earlier start times, see is_cursor_backfilled(), all raster
+    map layers are selected.
+
+    Args:
+        cursor (dict): The cursor from parse_sampling_cursor()
+        where (str): An additional where statement or None
+        backfilled (bool): True to select all raster map layers
+
+    Returns:
+        str: The where statement or None to select all raster map layers
+    """
+    if backfilled is True or cursor["start_time"] is None:
+        return where
+    cursor_where = "start_time > '%s'" % cursor["start_time"]
+    if where:
+        cursor_where = "(%s) AND %s" % (where, cursor_where)
+    return cursor_where
+
+
+def parse_modification_time(stdout):
+    """Parse the modification time of a space-time dataset from the t.info -g
+    output
+
+    Returns:
+        str: The modification time or None
+    """
+    for line in stdout.splitlines():
+        if line.startswith("modification_time="):
+            return line.split("=", 1)[1].strip().strip("'\"") or None
+    return None
+
+
+def create_sampling_cursor(output_list, cursor, modification_time):
+    """Create the resume cursor of a sampling response
+
+    Args:
+        output_list (list): The header and the rows of the sampling result
+        cursor (dict): The cursor of the request or None
+        modification_time (str): The modification time of the STRDS before
+                                 the sampling
+
+    Returns:
+        dict: The start time of the last sampled raster map layer and the
+              modification time of the STRDS
+    """
+    start_times = [row[0] for row in (output_list or [])[1:] if row]
+    start_time = cursor["start_time"] if cursor else None
+    if start_times:
+        start_time = max(start_times + ([start_time] if start_time else []))
+    return {"start_time": start_time, "modification_time": modification_time}
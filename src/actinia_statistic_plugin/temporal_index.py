@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Process-local temporal index of space-time raster datasets
+
+The start and end times of the registered raster map layers are read once
+from the SQLite temporal database of the mapset and kept as sorted arrays,
+so that the raster map layer of a time stamp or the raster map layers of a
+time range are found with a binary search instead of a temporal module run.
+As the index covers the temporal extent and the gaps of the STRDS, requests
+without a valid raster map layer are rejected before a job is enqueued.
+An index is read again as soon as the modification time of the temporal
+database changes. STRDS with relative time or in a PostgreSQL temporal
+database have no index, their lookups fall back to the temporal modules.
+"""
+
+import hashlib
+import os
+import pathlib
+import re
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+
+from .config import TEMPORAL_INDEX_CACHE_SIZE
+from .strds_utils import select_granularity_steps
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+# The temporal indexes by (database path, STRDS id) in least recently used
+# order, each entry stores the modification time of the database and the
+# index
+_temporal_indexes = OrderedDict()
+
+
+class STRDSTemporalIndex(object):
+    """
+    The registered raster map layers of a STRDS sorted by start time
+    """
+
+    def __init__(self, maps, modification_time=None):
+        """
+        Args:
+            maps (list): A list of (raster map layer id, start time, end time)
+                         tuples sorted by start time, the end time of time
+                         instances is None
+            modification_time (str): The modification time of the STRDS or
+                                     None
+        """
+        self.modification_time = modification_time
+        self.ids = [item[0] for item in maps]
+        self.start_times = [item[1] for item in maps]
+        self.end_times = [item[2] for item in maps]
+        # The latest end time of all maps up to each position, to stop the
+        # backward search for overlapping maps
+        self.max_end_times = []
+        max_end_time = None
+        for start_time, end_time in zip(self.start_times, self.end_times):
+            end_time = end_time or start_time
+            if max_end_time is None or end_time > max_end_time:
+                max_end_time = end_time
+            self.max_end_times.append(max_end_time)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, timestamp):
+        """Find the raster map layer that is valid at a time stamp,
+        start_time <= timestamp < end_time, or that is a time instance at
+        the time stamp
+
+        Args:
+            timestamp (datetime): The time stamp
+
+        Returns:
+            str: The id of the raster map layer with the earliest start time
+                 or None if no raster map layer is valid
+        """
+        found = None
+        position = bisect_right(self.start_times, timestamp) - 1
+        while position >= 0:
+            if self.max_end_times[position] < timestamp:
+                break
+            end_time = self.end_times[position]
+            if end_time is None:
+                valid = self.start_times[position] == timestamp
+            else:
+                valid = end_time > timestamp
+            if valid is True:
+                found = self.ids[position]
+            position -= 1
+        return found
+
+    def get_maps_digest(self, end):
+        """Create a digest of the raster map layers with start_time <= end,
+        the digest changes if raster map layers are registered or
+        unregistered in this time range
+
+        Args:
+            end (datetime): The end of the time range
+
+        Returns:
+            str: The SHA-1 hex digest of the sorted raster map layer ids
+        """
+        ids = sorted(self.ids[:bisect_right(self.start_times, end)])
+        return hashlib.sha1("\n".join(ids).encode()).hexdigest()
+
+    def select(self, start=None, end=None):
+        """Select the raster map layers with start <= start_time < end
+
+        Args:
+            start (datetime): The start of the time range or None
+            end (datetime): The end of the time range or None
+
+        Returns:
+            list: A list of (raster map layer id, start time) tuples ordered
+                  by start time, the start time in the format
+                  YYYY-MM-DDTHH:MM:SS
+        """
+        first = 0 if start is None else bisect_left(self.start_times, start)
+        last = (
+            len(self.ids) if end is None
+            else bisect_left(self.start_times, end)
+        )
+        return [
+            (self.ids[position], self.start_times[position].isoformat())
+            for position in range(first, last)
+        ]
+
+
+def _parse_time(value):
+    """Parse a time stamp of the temporal database"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def read_temporal_index(database_path, strds_id):
+    """Read the temporal index of a STRDS with absolute time from a SQLite
+    temporal database
+
+    Args:
+        database_path (str): The path of the temporal database
+        strds_id (str): The STRDS id name@mapset
+
+    Returns:
+        STRDSTemporalIndex: The index or None if the STRDS is not
+                            registered with absolute time
+    """
+    connection = sqlite3.connect(
+        pathlib.Path(database_path).absolute().as_uri() + "?mode=ro",
+        uri=True,
+    )
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT strds_base.temporal_type, strds_metadata.raster_register, "
+            "strds_base.modification_time "
+            "FROM strds_base JOIN strds_metadata "
+            "ON strds_base.id = strds_metadata.id WHERE strds_base.id = ?",
+            (strds_id,),
+        )
+        row = cursor.fetchone()
+        if row is None or row[0] != "absolute":
+            return None
+        register = row[1]
+        modification_time = None if row[2] is None else str(row[2])
+        if register is None:
+            return STRDSTemporalIndex([], modification_time)
+        # The register table name is part of the statement
+        if re.match(r"^\w+$", register) is None:
+            return None
+        cursor.execute(
+            "SELECT register.id, times.start_time, times.end_time "
+            "FROM %s AS register JOIN raster_absolute_time AS times "
+            "ON register.id = times.id "
+            "ORDER BY times.start_time, register.id" % register
+        )
+        maps = [
+            (item[0], _parse_time(item[1]), _parse_time(item[2]))
+            for item in cursor.fetchall()
+        ]
+    finally:
+        connection.close()
+    return STRDSTemporalIndex(maps, modification_time)
+
+
+def get_tgis_database_path(rdc, mapset_name):
+    """Return the path of the SQLite temporal database of a mapset in the
+    user or the global GRASS GIS database
+
+    Args:
+        rdc (ResourceDataContainer): The resource data container
+        mapset_name (str): The mapset of the STRDS
+
+    Returns:
+        str: The path or None if the mapset has no SQLite temporal database
+    """
+    mapset_paths = [
+        os.path.join(
+            rdc.grass_user_data_base,
+            rdc.user_group,
+            rdc.project_name,
+            mapset_name,
+        ),
+        os.path.join(rdc.grass_data_base, rdc.project_name, mapset_name),
+    ]
+    for mapset_path in mapset_paths:
+        database_path = os.path.join(mapset_path, "tgis", "sqlite.db")
+        if os.path.isfile(database_path):
+            return database_path
+    return None
+
+
+def get_temporal_index(database_path, strds_id):
+    """Return the temporal index of a STRDS, the index is read again if the
+    temporal database was modified. At most TEMPORAL_INDEX_CACHE_SIZE
+    indexes are kept, the least recently used indexes are evicted.
+
+    Args:
+        database_path (str): The path of the temporal database
+        strds_id (str): The STRDS id name@mapset
+
+    Returns:
+        STRDSTemporalIndex: The index or None
+    """
+    try:
+        mtime = os.path.getmtime(database_path)
+    except OSError:
+        return None
+    key = (database_path, strds_id)
+    entry = _temporal_indexes.get(key)
+    if entry is not None and entry[0] == mtime:
+        _temporal_indexes.move_to_end(key)
+        return entry[1]
+    try:
+        index = read_temporal_index(database_path, strds_id)
+    except (sqlite3.Error, ValueError):
+        # The lookup falls back to the temporal modules
+        index = None
+    _temporal_indexes[key] = (mtime, index)
+    _temporal_indexes.move_to_end(key)
+    while len(_temporal_indexes) > max(1, TEMPORAL_INDEX_CACHE_SIZE):
+        _temporal_indexes.popitem(last=False)
+    return index
+
+
+def get_strds_temporal_index(rdc):
+    """Return the temporal index of the STRDS of a request
+
+    Args:
+        rdc (ResourceDataContainer): The resource data container with the
+                                     STRDS name as map name
+
+    Returns:
+        STRDSTemporalIndex: The index or None
+    """
+    database_path = get_tgis_database_path(rdc, rdc.mapset_name)
+    if database_path is None:
+        return None
+    return get_temporal_index(
+        database_path, "%s@%s" % (rdc.map_name, rdc.mapset_name)
+    )
+
+
+def select_time_range(index, time_range):
+    """Select the raster map layers of a time range with the index
+
+    Args:
+        index (STRDSTemporalIndex): The index or None
+        time_range (dict): The time range from strds_utils.parse_time_range()
+
+    Returns:
+        list: A list of (raster map layer id, start time) tuples ordered by
+              start time or None if the index can not answer the time range,
+              the where statement is evaluated by the temporal modules
+    """
+    if index is None or time_range.get("where"):
+        return None
+    return index.select(
+        _parse_time(time_range.get("start")),
+        _parse_time(time_range.get("end")),
+    )
+
+
+def select_sampling_window(index, window):
+    """Select the start times of the raster map layers of the time window of
+    a sampling request with the index
+
+    Args:
+        index (STRDSTemporalIndex): The index or None
+        window (dict): The time window from
+                       strds_utils.parse_sampling_window()
+
+    Returns:
+        list: The start times as datetime ordered by start time, reduced to
+              the granularity of the window, or None if there is no index
+    """
+    if index is None:
+        return None
+    first = 0
+    last = len(index.ids)
+    if window.get("start"):
+        first = bisect_left(index.start_times, _parse_time(window["start"]))
+    if window.get("end"):
+        last = bisect_left(index.start_times, _parse_time(window["end"]))
+    start_times = []
+    for start_time in index.start_times[first:last]:
+        if not start_times or start_times[-1] != start_time:
+            start_times.append(start_time)
+    return select_granularity_steps(start_times, window)
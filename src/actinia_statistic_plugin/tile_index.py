@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed per-tile category histograms of integer raster map layers
+
+The cell grid of a raster map layer is divided into square tiles. For each
+tile the number of cells of each category is stored in a compressed numpy
+file in the resource storage of actinia, the mapsets of the raster map layers
+may be read-only. Area statistics
+sum the histograms of the tiles that are completely inside of the polygon
+and only read the cells of the tiles that are crossed by the polygon
+boundary.
+"""
+
+import math
+import os
+import tempfile
+import numpy as np
+from .geojson_utils import rasterize_features
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+TILE_INDEX_FILE_NAME = "statistic_tile_index.npz"
+
+# The directory of the tile indexes in the resource storage
+TILE_INDEX_DIR_NAME = "statistic_tile_index"
+
+# The grid of the raster map layer the index was built for
+_GRID_KEYS = ["north", "west", "nsres", "ewres", "rows", "cols"]
+
+
+def get_tile_index_path(resource_dir, user_group, project, mapset, name):
+    """Return the path of the tile index file of a raster map layer
+
+    The indexes are stored per user group, the user groups have separate
+    user mapsets with the same names.
+
+    Args:
+        resource_dir (str): The resource storage directory of actinia
+        user_group (str): The user group of the request
+        project (str): The project of the raster map layer
+        mapset (str): The mapset of the raster map layer
+        name (str): The name of the raster map layer
+
+    Returns:
+        str: The path of the index file
+    """
+    return os.path.join(
+        resource_dir,
+        TILE_INDEX_DIR_NAME,
+        user_group,
+        project,
+        mapset,
+        name,
+        TILE_INDEX_FILE_NAME,
+    )
+
+
+def get_raster_data_mtime(mapset_path, name):
+    """Return the last modification time of the cell header and the cell
+    data of a raster map layer
+
+    Args:
+        mapset_path (str): The path to the mapset of the raster map layer
+        name (str): The name of the raster map layer
+
+    Returns:
+        float: The modification time or None if the raster map layer does
+               not exist
+    """
+    mtimes = []
+    for element in ["cellhd", "cell", "fcell"]:
+        path = os.path.join(mapset_path, element, name)
+        if os.path.exists(path):
+            mtimes.append(os.path.getmtime(path))
+    if not mtimes:
+        return None
+    return max(mtimes)
+
+
+def get_header_grid(header):
+    """Return the grid of a raster header from read_raster_header() with the
+    keys of a region
+
+    Args:
+        header (dict): The raster header
+
+    Returns:
+        dict: The grid with the keys north, west, nsres, ewres, rows and cols
+    """
+    return {
+        "north": header["north"],
+        "west": header["west"],
+        "nsres": header["n-s resol"],
+        "ewres": header["e-w resol"],
+        "rows": header["rows"],
+        "cols": header["cols"],
+    }
+
+
+def compute_band_histograms(values, tile_size, null_value):
+    """Compute the category histograms of the tiles of a row band
+
+    Args:
+        values (numpy.ndarray): The int32 cells of the band, at most
+                                tile_size rows starting at a tile border
+        tile_size (int): The number of rows and columns of a tile
+        null_value (int): The value of NULL cells, they are not counted
+
+    Returns:
+        tuple: (tile columns, categories, counts) sorted by tile column and
+               category
+    """
+    tile_cols = np.arange(values.shape[1], dtype=np.int64) // tile_size
+    tile_cols = np.broadcast_to(tile_cols, values.shape)
+    valid = values != null_value
+    # Tile column and category are combined into a single sortable key
+    keys = (tile_cols[valid] << 32) | (
+        values[valid].astype(np.int64) & 0xFFFFFFFF
+    )
+    keys, counts = np.unique(keys, return_counts=True)
+    categories = (keys & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+    return keys >> 32, categories, counts.astype(np.int64)
+
+
+def create_tile_index(grid, tile_size, band_histograms, data_mtime):
+    """Create the tile index from the histograms of all row bands
+
+    Args:
+        grid (dict): The grid of the raster map layer, see get_header_grid()
+        tile_size (int): The number of rows and columns of a tile
+        band_histograms (list): The compute_band_histograms() result of each
+                                row band, from north to south
+        data_mtime (float): The modification time of the raster data
+
+    Returns:
+        dict: The index arrays
+    """
+    tile_rows = int(math.ceil(grid["rows"] / tile_size))
+    tile_cols = int(math.ceil(grid["cols"] / tile_size))
+
+    tiles = []
+    categories = []
+    counts = []
+    for tile_row, (band_cols, band_cats, band_counts) in enumerate(
+        band_histograms
+    ):
+        tiles.append(tile_row * tile_cols + band_cols)
+        categories.append(band_cats)
+        counts.append(band_counts)
+    tiles = np.concatenate(tiles) if tiles else np.array([], dtype=np.int64)
+
+    # The histogram of tile t are the entries offsets[t]:offsets[t + 1]
+    offsets = np.zeros(tile_rows * tile_cols + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(
+        np.bincount(tiles, minlength=tile_rows * tile_cols)
+    )
+
+    index = {key: np.array(grid[key]) for key in _GRID_KEYS}
+    index["tile_size"] = np.array(tile_size)
+    index["data_mtime"] = np.array(data_mtime)
+    index["offsets"] = offsets
+    index["categories"] = (
+        np.concatenate(categories) if categories else np.array([], np.int32)
+    )
+    index["counts"] = (
+        np.concatenate(counts) if counts else np.array([], np.int64)
+    )
+    return index
+
+
+def write_tile_index(path, index):
+    """Write the tile index, an existing index is replaced atomically
+
+    Args:
+        path (str): The path of the index file
+        index (dict): The index from create_tile_index()
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    index_file = tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".npz", delete=False
+    )
+    try:
+        with index_file:
+            np.savez_compressed(index_file, **index)
+        os.replace(index_file.name, path)
+    except Exception:
+        os.remove(index_file.name)
+        raise
+
+
+def read_tile_index(path, grid, data_mtime):
+    """Read the tile index of a raster map layer
+
+    Args:
+        path (str): The path of the index file
+        grid (dict): The current grid of the raster map layer
+        data_mtime (float): The modification time of the raster data
+
+    Returns:
+        dict: The index arrays or None if there is no index or if the index
+              is outdated
+    """
+    if not os.path.isfile(path):
+        return None
+    with np.load(path) as index_file:
+        index = {key: index_file[key] for key in index_file.files}
+    if data_mtime is None or float(index["data_mtime"]) < data_mtime:
+        return None
+    for key in _GRID_KEYS:
+        if not np.isclose(float(index[key]), grid[key], rtol=0, atol=1e-9):
+            return None
+    return index
+
+
+def get_tile_window(index, region):
+    """Return the tiles of the index that overlap a region aligned to the
+    grid of the raster map layer
+
+    Args:
+        index (dict): The tile index
+        region (dict): The aligned region from align_region()
+
+    Returns:
+        tuple: (first tile row, end tile row, first tile col, end tile col),
+               empty if the region is outside of the raster map layer
+    """
+    tile_size = int(index["tile_size"])
+    rows = int(index["rows"])
+    cols = int(index["cols"])
+    first_row = int(
+        round((float(index["north"]) - region["north"]) / region["nsres"])
+    )
+    first_col = int(
+        round((region["west"] - float(index["west"])) / region["ewres"])
+    )
+    end_row = min(first_row + region["rows"], rows)
+    end_col = min(first_col + region["cols"], cols)
+    first_row = max(first_row, 0)
+    first_col = max(first_col, 0)
+    if end_row <= first_row or end_col <= first_col:
+        return (0, 0, 0, 0)
+    return (
+        first_row // tile_size,
+        (end_row - 1) // tile_size + 1,
+        first_col // tile_size,
+        (end_col - 1) // tile_size + 1,
+    )
+
+
+def classify_tiles(feature_rings, index, window):
+    """Classify the tiles of a window into tiles completely inside of the
+    features and tiles that are crossed by the boundary of a feature
+
+    A tile that is not crossed by a ring has all cell centers on the same
+    side of the boundary, its tile center decides whether it is inside.
+
+    Args:
+        feature_rings (list): For each feature a list of rings, see
+                              get_polygon_rings()
+        index (dict): The tile index
+        window (tuple): The tile window from get_tile_window()
+
+    Returns:
+        tuple: (inside, boundary) boolean arrays of the shape of the window
+    """
+    first_row, end_row, first_col, end_col = window
+    tile_size = int(index["tile_size"])
+    tile_nsres = float(index["nsres"]) * tile_size
+    tile_ewres = float(index["ewres"]) * tile_size
+    north = float(index["north"]) - first_row * tile_nsres
+    west = float(index["west"]) + first_col * tile_ewres
+    shape = (end_row - first_row, end_col - first_col)
+
+    boundary = np.zeros(shape, dtype=bool)
+    rings = [ring for rings in feature_rings for ring in rings]
+    for ring in rings:
+        # The ring in fractional tile coordinates of the window
+        col = (ring[:, 0] - west) / tile_ewres
+        row = (north - ring[:, 1]) / tile_nsres
+        # Split the edges into pieces shorter than half a tile, each piece
+        # is covered by the at most 2x2 tiles of its bounding box
+        length = np.hypot(np.diff(col), np.diff(row))
+        steps = np.maximum(np.ceil(length * 2.0), 1).astype(np.int64)
+        edges = np.repeat(np.arange(len(steps)), steps)
+        fraction = (
+            np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        ) / steps[edges]
+        col_start = col[edges] + fraction * (col[edges + 1] - col[edges])
+        row_start = row[edges] + fraction * (row[edges + 1] - row[edges])
+        col_end = col[edges] + (fraction + 1.0 / steps[edges]) * (
+            col[edges + 1] - col[edges]
+        )
+        row_end = row[edges] + (fraction + 1.0 / steps[edges]) * (
+            row[edges + 1] - row[edges]
+        )
+        for tile_row in [
+            np.floor(np.minimum(row_start, row_end)),
+            np.floor(np.maximum(row_start, row_end)),
+        ]:
+            for tile_col in [
+                np.floor(np.minimum(col_start, col_end)),
+                np.floor(np.maximum(col_start, col_end)),
+            ]:
+                valid = (
+                    (tile_row >= 0)
+                    & (tile_row < shape[0])
+                    & (tile_col >= 0)
+                    & (tile_col < shape[1])
+                )
+                boundary[
+                    tile_row[valid].astype(np.int64),
+                    tile_col[valid].astype(np.int64),
+                ] = True
+
+    # Rasterize the features with tiles as cells to test the tile centers
+    tile_region = {
+        "north": north,
+        "west": west,
+        "nsres": tile_nsres,
+        "ewres": tile_ewres,
+        "rows": shape[0],
+        "cols": shape[1],
+    }
+    inside = (rasterize_features(feature_rings, tile_region) > 0) & ~boundary
+    return inside, boundary
+
+
+def sum_tile_histograms(index, window, tiles):
+    """Sum the histograms of the selected tiles of a window
+
+    Args:
+        index (dict): The tile index
+        window (tuple): The tile window from get_tile_window()
+        tiles (numpy.ndarray): The boolean tile selection of the window
+
+    Returns:
+        tuple: (categories, counts)
+    """
+    first_row, _, first_col, _ = window
+    tile_cols = int(math.ceil(int(index["cols"]) / int(index["tile_size"])))
+    rows, cols = np.nonzero(tiles)
+    tile_ids = (rows + first_row) * tile_cols + cols + first_col
+
+    offsets = index["offsets"]
+    starts = offsets[tile_ids]
+    lengths = offsets[tile_ids + 1] - starts
+    entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    entries = entries + np.arange(lengths.sum())
+    return merge_histograms(
+        [index["categories"][entries]], [index["counts"][entries]]
+    )
+
+
+def get_tiles_region(index, window, tiles):
+    """Return the region that covers the selected tiles of a window and the
+    cell mask of the selected tiles in this region
+
+    The cells of all selected tiles are read with a single raster export of
+    the region, the mask selects the cells of the tiles.
+
+    Args:
+        index (dict): The tile index
+        window (tuple): The tile window from get_tile_window()
+        tiles (numpy.ndarray): The boolean tile selection of the window
+
+    Returns:
+        tuple: (region, mask) or (None, None) if no tile is selected
+    """
+    rows, cols = np.nonzero(tiles)
+    if rows.size == 0:
+        return None, None
+    tile_size = int(index["tile_size"])
+    nsres = float(index["nsres"])
+    ewres = float(index["ewres"])
+    first_row = (window[0] + int(rows.min())) * tile_size
+    end_row = min((window[0] + int(rows.max()) + 1) * tile_size,
+                  int(index["rows"]))
+    first_col = (window[2] + int(cols.min())) * tile_size
+    end_col = min((window[2] + int(cols.max()) + 1) * tile_size,
+                  int(index["cols"]))
+    region = {
+        "north": float(index["north"]) - first_row * nsres,
+        "south": float(index["north"]) - end_row * nsres,
+        "west": float(index["west"]) + first_col * ewres,
+        "east": float(index["west"]) + end_col * ewres,
+        "nsres": nsres,
+        "ewres": ewres,
+        "rows": end_row - first_row,
+        "cols": end_col - first_col,
+    }
+    selection = tiles[rows.min():rows.max() + 1, cols.min():cols.max() + 1]
+    mask = np.repeat(np.repeat(selection, tile_size, axis=0), tile_size, 1)
+    return region, mask[:region["rows"], :region["cols"]]
+
+
+def merge_histograms(categories_list, counts_list):
+    """Merge category histograms
+
+    Args:
+        categories_list (list): The category arrays of the histograms
+        counts_list (list): The count arrays of the histograms
+
+    Returns:
+        tuple: (categories, counts) sorted by category
+    """
+    if not categories_list:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    categories, inverse = np.unique(
+        np.concatenate(categories_list).astype(np.int64), return_inverse=True
+    )
+    counts = np.bincount(
+        inverse.ravel(),
+        weights=np.concatenate(counts_list),
+        minlength=len(categories),
+    )
+    return categories, counts.astype(np.int64)
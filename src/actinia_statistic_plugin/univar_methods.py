@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+The univariate statistics methods of the area statistics resources and the
+planner that selects the cheapest r.univar computation for a set of methods.
+"""
+
+import math
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+# The methods in the order of the AreaUnivarResultModel, the field of a
+# method is raster_<method>
+UNIVAR_METHODS = [
+    "number",
+    "minimum",
+    "maximum",
+    "range",
+    "average",
+    "median",
+    "stddev",
+    "sum",
+    "variance",
+    "coeff_var",
+]
+
+# Methods that need all cell values in memory to sort them, all other
+# methods are computed from streaming moments
+ORDER_STATISTICS = ["median"]
+
+# The query parameters of the univariate statistics resources
+UNIVAR_QUERY_PARAMETERS = [
+    {
+        "name": "methods",
+        "description": "Comma separated list of the univariate statistics "
+        "to compute, by default all. The median requires sorting all cell "
+        "values, the other methods are computed in a single streaming pass. "
+        "Supported methods: " + ", ".join(UNIVAR_METHODS),
+        "required": False,
+        "in": "query",
+        "type": "string",
+    },
+    {
+        "name": "approximate",
+        "description": "Set to true to approximate the median and the "
+        "percentiles with a streaming histogram sketch while the raster map "
+        "layer is scanned in row bands. The maximum absolute error is "
+        "reported as raster_quantile_error. Requires a GeoJSON definition in "
+        "the coordinate reference system of the project, otherwise the exact "
+        "statistics are computed.",
+        "required": False,
+        "in": "query",
+        "type": "boolean",
+        "default": False,
+    },
+    {
+        "name": "percentiles",
+        "description": "Comma separated list of percentiles between 0 and "
+        "100 that are approximated and reported as raster_percentiles. "
+        "Requires approximate=true.",
+        "required": False,
+        "in": "query",
+        "type": "string",
+    },
+]
+
+# The r.univar -t column of each method
+R_UNIVAR_COLUMNS = {
+    "number": "non_null_cells",
+    "minimum": "min",
+    "maximum": "max",
+    "range": "range",
+    "average": "mean",
+    "median": "median",
+    "stddev": "stddev",
+    "sum": "sum",
+    "variance": "variance",
+    "coeff_var": "coeff_var",
+}
+
+# The zonal t.rast.univar column of each method, the range is computed from
+# the minimum and maximum
+T_RAST_UNIVAR_COLUMNS = {
+    "number": "non_null_cells",
+    "minimum": "min",
+    "maximum": "max",
+    "average": "mean",
+    "median": "median",
+    "stddev": "stddev",
+    "sum": "sum",
+    "variance": "variance",
+    "coeff_var": "coeff_var",
+}
+
+
+def parse_univar_methods(value):
+    """Parse the comma separated list of univariate statistics methods
+
+    Args:
+        value (str): The methods or None for all methods
+
+    Raises:
+        ValueError: In case of an empty list or unknown methods
+
+    Returns:
+        list: The methods in the order of UNIVAR_METHODS
+    """
+    if value is None:
+        return list(UNIVAR_METHODS)
+    methods = [method.strip() for method in value.split(",")]
+    methods = [method for method in methods if method]
+    if not methods:
+        raise ValueError("No univariate statistics method requested")
+    unknown = [method for method in methods if method not in UNIVAR_METHODS]
+    if unknown:
+        raise ValueError(
+            "Unknown methods <%s>, supported methods are: %s"
+            % (", ".join(unknown), ", ".join(UNIVAR_METHODS))
+        )
+    return [method for method in UNIVAR_METHODS if method in methods]
+
+
+def parse_percentiles(value):
+    """Parse the comma separated list of percentiles
+
+    Args:
+        value (str): The percentiles between 0 and 100 or None
+
+    Raises:
+        ValueError: In case of invalid percentiles
+
+    Returns:
+        list: The sorted percentiles as float
+    """
+    if value is None:
+        return []
+    percentiles = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            percentile = float(item)
+        except ValueError:
+            raise ValueError("Invalid percentile <%s>" % item.strip())
+        if not 0.0 <= percentile <= 100.0:
+            raise ValueError(
+                "Percentile <%s> is not between 0 and 100" % item.strip()
+            )
+        percentiles.append(percentile)
+    return sorted(set(percentiles))
+
+
+def format_percentile(percentile):
+    """Return the key of a percentile in the raster_percentiles result,
+    for example "90" or "97.5"
+    """
+    return "%g" % percentile
+
+
+def plan_univar(methods):
+    """Select the cheapest r.univar computation that covers the methods
+
+    Order statistics need the extended r.univar computation that keeps all
+    cell values in memory and sorts them. All other methods are computed
+    in a single streaming pass over the cells.
+
+    Args:
+        methods (list): The methods from parse_univar_methods()
+
+    Returns:
+        str: The r.univar flags, "et" for the extended and "t" for the
+             streaming computation
+    """
+    if any([method in ORDER_STATISTICS for method in methods]):
+        return "et"
+    return "t"
+
+
+def parse_t_rast_univar_values(values, methods):
+    """Select the requested methods from a parsed line of the zonal
+    t.rast.univar output
+
+    Args:
+        values (dict): The values of the line by column name
+        methods (list): The methods from parse_univar_methods()
+
+    Returns:
+        dict: The valid numbers by result field raster_<method>, methods
+              without a valid number, for example of a zone without cells,
+              are skipped
+    """
+    result = {}
+    for method in methods:
+        try:
+            if method == "range":
+                value = float(values["max"]) - float(values["min"])
+            else:
+                value = float(values[T_RAST_UNIVAR_COLUMNS[method]])
+        except (KeyError, ValueError):
+            continue
+        if math.isnan(value) is False:
+            result["raster_" + method] = value
+    return result
+
+
+def parse_univar_options(args):
+    """Parse the univariate statistics query parameters methods,
+    approximate and percentiles of a request
+
+    Args:
+        args (dict): The query parameters of the request
+
+    Raises:
+        ValueError: In case of invalid parameters
+
+    Returns:
+        dict: The options methods, approximate and percentiles
+    """
+    methods = parse_univar_methods(args.get("methods"))
+    approximate = args.get("approximate", "false").lower() == "true"
+    percentiles = parse_percentiles(args.get("percentiles"))
+    if percentiles and approximate is False:
+        raise ValueError("Percentiles require approximate=true")
+    return {
+        "methods": methods,
+        "approximate": approximate,
+        "percentiles": percentiles,
+    }
@@ -9,4 +9,10 @@
 """
 from __future__ import print_function, absolute_import, division
 
+import os
+
+# The area statistics result cache is disabled by default, the cache tests
+# need it in the server and in the forked worker processes
+os.environ.setdefault("ACTINIA_STATISTIC_AREA_STATS_CACHE_SIZE", "10000")
+
 # import pytest
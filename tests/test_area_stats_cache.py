@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from actinia_statistic_plugin.area_stats_cache import create_cache_key
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+GEOJSON = {
+    "type": "Polygon",
+    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+}
+
+
+class AreaStatsCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data_base = tempfile.TemporaryDirectory()
+        for project in ["project_a", "project_b"]:
+            cellhd = os.path.join(
+                self.data_base.name, project, "PERMANENT", "cellhd"
+            )
+            os.makedirs(cellhd)
+            with open(os.path.join(cellhd, "landuse"), "w") as cellhd_file:
+                cellhd_file.write("rows: 1\n")
+            os.utime(os.path.join(cellhd, "landuse"), (1000, 1000))
+
+    def tearDown(self):
+        self.data_base.cleanup()
+
+    def _create_rdc(self, project_name, user_group):
+        return SimpleNamespace(
+            request_data=GEOJSON,
+            grass_user_data_base=os.path.join(self.data_base.name, "user"),
+            grass_data_base=self.data_base.name,
+            user_group=user_group,
+            project_name=project_name,
+            mapset_name="PERMANENT",
+            map_name="landuse",
+        )
+
+    def test_cache_key_isolation(self):
+        key = create_cache_key(
+            self._create_rdc("project_a", "group_a"), "area_stats"
+        )
+        self.assertIsNotNone(key)
+        self.assertEqual(
+            key,
+            create_cache_key(
+                self._create_rdc("project_a", "group_a"), "area_stats"
+            ),
+        )
+        # Identical mapset and raster map names in other projects or user
+        # groups with the same modification time use other keys
+        self.assertNotEqual(
+            key,
+            create_cache_key(
+                self._create_rdc("project_b", "group_a"), "area_stats"
+            ),
+        )
+        self.assertNotEqual(
+            key,
+            create_cache_key(
+                self._create_rdc("project_a", "group_b"), "area_stats"
+            ),
+        )
+
+    def test_cache_disabled(self):
+        with patch(
+            "actinia_statistic_plugin.area_stats_cache.AREA_STATS_CACHE_SIZE",
+            0,
+        ):
+            self.assertIsNone(
+                create_cache_key(
+                    self._create_rdc("project_a", "group_a"), "area_stats"
+                )
+            )
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+import tempfile
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.geojson_utils import (
+    create_geojson_import_pc,
+    geojson_to_grass_ascii,
+    get_bbox,
+    get_features,
+    get_geojson_epsg,
+    get_interior_point,
+    get_polygon_rings,
+    rasterize_features,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]],
+}
+SQUARE_WITH_HOLE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]],
+        [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+    ],
+}
+REGION = {
+    "north": 10.0,
+    "south": 0.0,
+    "east": 10.0,
+    "west": 0.0,
+    "nsres": 1.0,
+    "ewres": 1.0,
+    "rows": 10,
+    "cols": 10,
+}
+
+
+class GeoJSONUtilsTestCase(unittest.TestCase):
+    def test_get_geojson_epsg(self):
+        for name in [
+            "urn:ogc:def:crs:EPSG::3358",
+            "urn:ogc:def:crs:EPSG:6.6:3358",
+            "urn:x-ogc:def:crs:EPSG:3358",
+            "EPSG:3358",
+        ]:
+            geojson = {"crs": {"type": "name", "properties": {"name": name}}}
+            self.assertEqual(get_geojson_epsg(geojson), 3358)
+
+        self.assertEqual(get_geojson_epsg({"type": "Polygon"}), 4326)
+        crs84 = {"properties": {"name": "urn:ogc:def:crs:OGC:1.3:CRS84"}}
+        self.assertEqual(get_geojson_epsg({"crs": crs84}), 4326)
+        unknown = {"properties": {"name": "unknown"}}
+        self.assertIsNone(get_geojson_epsg({"crs": unknown}))
+
+    def test_get_features(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [{"type": "Feature", "geometry": SQUARE}] * 2,
+        }
+        self.assertEqual(len(get_features(collection)), 2)
+        self.assertEqual(get_features(SQUARE)[0]["geometry"], SQUARE)
+
+    def test_get_bbox(self):
+        rings = get_polygon_rings(SQUARE)
+        self.assertEqual(get_bbox([rings]), (0, 0, 10, 10))
+        self.assertIsNone(get_bbox([[]]))
+
+    def test_rasterize_square(self):
+        zones = rasterize_features([get_polygon_rings(SQUARE)], REGION)
+        self.assertEqual(zones.shape, (10, 10))
+        self.assertTrue((zones == 1).all())
+
+    def test_rasterize_hole(self):
+        zones = rasterize_features(
+            [get_polygon_rings(SQUARE_WITH_HOLE)], REGION
+        )
+        self.assertEqual((zones == 1).sum(), 96)
+        self.assertTrue((zones[4:6, 4:6] == 0).all())
+
+    def test_rasterize_cell_centers(self):
+        # Cells are covered if the cell center is inside or on the left
+        # boundary of the triangle
+        triangle = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [10, 0], [10, 10], [0, 0]]],
+        }
+        zones = rasterize_features([get_polygon_rings(triangle)], REGION)
+        y = 9.5 - np.arange(10)[:, np.newaxis]
+        x = 0.5 + np.arange(10)[np.newaxis, :]
+        np.testing.assert_array_equal(zones == 1, x >= y)
+
+    def test_rasterize_multiple_features(self):
+        west = {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [0, 10], [5, 10], [5, 0], [0, 0]]],
+        }
+        east = {
+            "type": "MultiPolygon",
+            "coordinates": [
+                [[[5, 0], [5, 10], [10, 10], [10, 0], [5, 0]]],
+            ],
+        }
+        zones = rasterize_features(
+            [get_polygon_rings(west), get_polygon_rings(east)], REGION
+        )
+        self.assertTrue((zones[:, :5] == 1).all())
+        self.assertTrue((zones[:, 5:] == 2).all())
+
+    def test_rasterize_outside_region(self):
+        outside = {
+            "type": "Polygon",
+            "coordinates": [[[20, 20], [20, 30], [30, 30], [20, 20]]],
+        }
+        zones = rasterize_features([get_polygon_rings(outside)], REGION)
+        self.assertFalse(zones.any())
+
+    def test_get_interior_point(self):
+        x, y = get_interior_point(get_polygon_rings(SQUARE_WITH_HOLE))
+        self.assertTrue(0 < x < 10 and 0 < y < 10)
+        self.assertFalse(4 <= x <= 6 and 4 <= y <= 6)
+
+        # U shape, the center of the bounding box is outside
+        u_shape = {
+            "type": "Polygon",
+            "coordinates": [
+                [[0, 0], [3, 0], [3, 8], [7, 8], [7, 0], [10, 0], [10, 10],
+                 [0, 10], [0, 0]]
+            ],
+        }
+        x, y = get_interior_point(get_polygon_rings(u_shape))
+        self.assertFalse(3 <= x <= 7 and y <= 8)
+
+    def test_geojson_to_grass_ascii_points(self):
+        points = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": {
+                    "type": "Point", "coordinates": [1.5, 2.0]}},
+                {"type": "Feature", "geometry": {
+                    "type": "Point", "coordinates": [3.0, 4.0]}},
+            ],
+        }
+        self.assertEqual(
+            geojson_to_grass_ascii(points),
+            "P  1 1\n 1.5 2\n 1 1\nP  1 1\n 3 4\n 1 2\n",
+        )
+
+    def test_geojson_to_grass_ascii_polygons(self):
+        lines = geojson_to_grass_ascii(SQUARE_WITH_HOLE).splitlines()
+        self.assertEqual(lines[0], "B  5")
+        self.assertEqual(lines[6], "B  5")
+        self.assertEqual(lines[12], "C  1 1")
+        self.assertEqual(lines[14], " 1 1")
+
+        # Touching polygons need topology cleaning
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": SQUARE},
+                {"type": "Feature", "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [[10, 0], [10, 10], [20, 10], [20, 0], [10, 0]]
+                    ],
+                }},
+            ],
+        }
+        self.assertIsNone(geojson_to_grass_ascii(collection))
+
+        line = {"type": "LineString", "coordinates": [[0, 0], [1, 1]]}
+        self.assertIsNone(geojson_to_grass_ascii(line))
+
+    def test_create_geojson_import_pc(self):
+        geojson = dict(SQUARE)
+        geojson["crs"] = {
+            "type": "name",
+            "properties": {"name": "urn:ogc:def:crs:EPSG::3358"},
+        }
+        with tempfile.TemporaryDirectory() as temp_file_path:
+            pc, ascii_import = create_geojson_import_pc(
+                geojson, 3358, temp_file_path, "polygon", "v_import_1"
+            )
+            self.assertTrue(ascii_import)
+            self.assertEqual(pc["module"], "v.in.ascii")
+
+            pc, ascii_import = create_geojson_import_pc(
+                geojson, 4326, temp_file_path, "polygon", "v_import_1"
+            )
+            self.assertFalse(ascii_import)
+            self.assertEqual(pc["module"], "v.import")
+
+
+if __name__ == "__main__":
+    unittest.main()
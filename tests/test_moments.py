@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import math
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.moments import MomentAccumulator
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class MomentAccumulatorTestCase(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(42)
+        # A large offset makes the naive sum of squares inaccurate
+        self.values = generator.normal(1.0e6, 0.5, size=10000)
+
+    def test_add(self):
+        accumulator = MomentAccumulator()
+        accumulator.add(self.values)
+        statistics = accumulator.get_statistics()
+        self.assertEqual(statistics["number"], 10000.0)
+        self.assertAlmostEqual(statistics["average"], self.values.mean())
+        self.assertAlmostEqual(
+            statistics["variance"], self.values.var(), places=9
+        )
+        self.assertEqual(statistics["minimum"], self.values.min())
+        self.assertEqual(statistics["maximum"], self.values.max())
+        self.assertAlmostEqual(
+            statistics["coeff_var"],
+            100.0 * self.values.std() / self.values.mean(),
+        )
+
+    def test_merge(self):
+        accumulator = MomentAccumulator()
+        accumulator.add(self.values)
+        merged = MomentAccumulator()
+        for chunk in np.array_split(self.values, 13):
+            partial = MomentAccumulator()
+            partial.add(chunk)
+            merged.merge(partial)
+        merged.merge(MomentAccumulator())
+
+        self.assertEqual(merged.count, accumulator.count)
+        self.assertAlmostEqual(merged.mean, accumulator.mean)
+        self.assertAlmostEqual(merged.variance, accumulator.variance)
+        self.assertEqual(merged.minimum, accumulator.minimum)
+        self.assertEqual(merged.maximum, accumulator.maximum)
+
+    def test_empty(self):
+        accumulator = MomentAccumulator()
+        accumulator.add(np.array([]))
+        self.assertEqual(accumulator.count, 0)
+        self.assertTrue(math.isnan(accumulator.variance))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.point_sampling import (
+    compute_cell_indices,
+    deduplicate_points,
+    expand_sample_rows,
+    format_coordinates,
+    get_cell_centers,
+    get_points_region,
+    parse_r_what_values,
+    parse_sample_points,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+GRID = {
+    "north": 100.0,
+    "west": 0.0,
+    "nsres": 10.0,
+    "ewres": 5.0,
+    "rows": 10,
+    "cols": 20,
+}
+
+
+class PointSamplingTestCase(unittest.TestCase):
+    def test_parse_sample_points(self):
+        ids, coordinates = parse_sample_points(
+            [["a", "1.5", "2"], ["b", 3, 4.25]]
+        )
+        self.assertEqual(ids, ["a", "b"])
+        np.testing.assert_array_equal(coordinates, [[1.5, 2.0], [3.0, 4.25]])
+        self.assertRaises(ValueError, parse_sample_points, [["a", "1"]])
+        self.assertRaises(ValueError, parse_sample_points, [["a", "x", "1"]])
+
+    def test_cell_indices(self):
+        coordinates = np.array(
+            [[0.0, 100.0], [99.9, 0.1], [12.0, 55.0], [100.0, 50.0]]
+        )
+        rows, cols, inside = compute_cell_indices(GRID, coordinates)
+        np.testing.assert_array_equal(rows[:3], [0, 9, 4])
+        np.testing.assert_array_equal(cols[:3], [0, 19, 2])
+        # The east border is outside of the grid
+        np.testing.assert_array_equal(inside, [True, True, True, False])
+        centers = get_cell_centers(GRID, rows[inside], cols[inside])
+        np.testing.assert_array_equal(
+            centers, [[2.5, 95.0], [97.5, 5.0], [12.5, 55.0]]
+        )
+        self.assertEqual(
+            format_coordinates(centers[:1]), "2.5,95.0"
+        )
+
+    def test_points_region(self):
+        # A point on a cell border belongs to the cell east or south of it
+        region = get_points_region(
+            GRID, np.array([[12.0, 55.0], [15.0, 50.0]])
+        )
+        self.assertEqual(
+            (region["north"], region["south"], region["west"],
+             region["east"]),
+            (60.0, 40.0, 10.0, 20.0),
+        )
+        # Points outside of the grid extend the region
+        region = get_points_region(GRID, np.array([[-3.0, 105.0]]))
+        self.assertEqual(
+            (region["north"], region["south"], region["west"],
+             region["east"]),
+            (110.0, 100.0, -5.0, 0.0),
+        )
+
+    def test_parse_r_what_values(self):
+        stdout = "2.5|95||1|*\n97.5|5||3|4\n"
+        values = parse_r_what_values(stdout, 2, 2)
+        self.assertEqual(values.tolist(), [["1", "*"], ["3", "4"]])
+        self.assertRaises(ValueError, parse_r_what_values, stdout, 3, 2)
+
+    def test_deduplicate_points(self):
+        coordinates = np.array(
+            [[1.0, 99.0], [2.0, 98.0], [1.0, 99.0], [200.0, 0.0],
+             [200.0, 0.0], [12.0, 55.0]]
+        )
+        unique, inverse = deduplicate_points(coordinates)
+        self.assertEqual(unique.tolist(), [0, 1, 3, 5])
+        self.assertEqual(inverse.tolist(), [0, 1, 0, 2, 2, 3])
+        # The first three points are in the same cell
+        unique, inverse = deduplicate_points(coordinates, GRID)
+        self.assertEqual(unique.tolist(), [0, 3, 5])
+        self.assertEqual(inverse.tolist(), [0, 0, 0, 1, 1, 2])
+
+    def test_expand_sample_rows(self):
+        rows = [
+            ["start_time", "end_time", "a", "c"],
+            ["2016-01-01", "2016-02-01", "1", "*"],
+        ]
+        expanded = list(
+            expand_sample_rows(
+                iter(rows), ["a", "b", "c", "d"], np.array([0, 0, 1, 1])
+            )
+        )
+        self.assertEqual(
+            expanded,
+            [
+                ["start_time", "end_time", "a", "b", "c", "d"],
+                ["2016-01-01", "2016-02-01", "1", "1", "*", "*"],
+            ],
+        )
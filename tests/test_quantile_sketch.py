@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import math
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.quantile_sketch import QuantileSketch
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+def nearest_rank(values, q):
+    values = np.sort(values)
+    rank = min(max(int(math.ceil(q * len(values))), 1), len(values))
+    return values[rank - 1]
+
+
+class QuantileSketchTestCase(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(42)
+        self.values = generator.normal(100.0, 15.0, size=100000)
+        self.minimum = self.values.min()
+        self.maximum = self.values.max()
+
+    def test_error_bound(self):
+        sketch = QuantileSketch(self.minimum, self.maximum, 1000)
+        sketch.add(self.values)
+        self.assertEqual(sketch.count, len(self.values))
+        for q in [0.0, 0.01, 0.25, 0.5, 0.9, 0.999, 1.0]:
+            self.assertLessEqual(
+                abs(sketch.quantile(q) - nearest_rank(self.values, q)),
+                sketch.error_bound * (1 + 1e-9),
+            )
+
+    def test_merge(self):
+        sketch = QuantileSketch(self.minimum, self.maximum, 1000)
+        sketch.add(self.values)
+        merged = QuantileSketch(self.minimum, self.maximum, 1000)
+        for chunk in np.array_split(self.values, 7):
+            partial = QuantileSketch(self.minimum, self.maximum, 1000)
+            partial.add(chunk)
+            merged.merge(partial)
+        np.testing.assert_array_equal(merged.counts, sketch.counts)
+
+        other = QuantileSketch(self.minimum, self.maximum, 500)
+        self.assertRaises(ValueError, sketch.merge, other)
+
+    def test_integer_exact(self):
+        values = np.array([3, 1, 4, 1, 5, 9, 2, 6], dtype=np.float64)
+        sketch = QuantileSketch(1, 9, 1000, integer=True)
+        sketch.add(values)
+        self.assertEqual(sketch.error_bound, 0.0)
+        self.assertEqual(sketch.quantile(0.5), 3.0)
+        self.assertEqual(sketch.quantile(1.0), 9.0)
+        self.assertIsNone(QuantileSketch(1, 9, 10).quantile(0.5))
+
+    def test_serialization(self):
+        sketch = QuantileSketch(self.minimum, self.maximum, 1000)
+        sketch.add(self.values)
+        copy = QuantileSketch.from_dict(sketch.to_dict())
+        np.testing.assert_array_equal(copy.counts, sketch.counts)
+        self.assertEqual(copy.quantile(0.5), sketch.quantile(0.5))
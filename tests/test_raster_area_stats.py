@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
 import time
+from unittest.mock import patch
 from flask.json import loads as json_load
 from flask.json import dumps as json_dump
 
@@ -10,6 +11,7 @@ except Exception:
     from test_resource_base import ActiniaResourceTestCaseBase, URL_PREFIX
 
 from actinia_core.version import init_versions, G_VERSION
+from actinia_statistic_plugin.config import AREA_STATS_PARALLEL_CELLS
 
 __license__ = "GPLv3"
 __author__ = "Sören Gebbert, Anika Weinmann"
@@ -46,6 +48,48 @@ JSON = {
     ],
 }
 
+JSON_ZONES = {
+    "type": "FeatureCollection",
+    "crs": {
+        "type": "name",
+        "properties": {"name": "urn:ogc:def:crs:EPSG::3358"},
+    },
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"fid": "west"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [630000.0, 215000.0],
+                        [630000.0, 228500.0],
+                        [637500.0, 228500.0],
+                        [637500.0, 215000.0],
+                        [630000.0, 215000.0],
+                    ]
+                ],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"fid": "east"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [637500.0, 215000.0],
+                        [637500.0, 228500.0],
+                        [645000.0, 228500.0],
+                        [645000.0, 215000.0],
+                        [637500.0, 215000.0],
+                    ]
+                ],
+            },
+        },
+    ],
+}
+
 
 class RasterAreaStatsTestCase(ActiniaResourceTestCaseBase):
 
@@ -115,6 +159,306 @@ class RasterAreaStatsTestCase(ActiniaResourceTestCaseBase):
         value_list = json_load(rv.data)["process_results"]
         self.assertEqual(len(value_list), 16)
 
+    def test_sync_raster_area_stats_numpy_engine(self):
+        value_lists = {}
+        for engine in ["r.stats", "numpy"]:
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_sync"
+                f"?engine={engine}",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            self.assertEqual(
+                rv.mimetype,
+                "application/json",
+                "Wrong mimetype %s" % rv.mimetype,
+            )
+            value_lists[engine] = json_load(rv.data)["process_results"]
+
+        self.assertEqual(len(value_lists["numpy"]), 16)
+        for rstats, numpy in zip(value_lists["r.stats"], value_lists["numpy"]):
+            self.assertEqual(rstats["cat"], numpy["cat"])
+            self.assertEqual(rstats["name"], numpy["name"])
+            self.assertEqual(rstats["cell_count"], numpy["cell_count"])
+            self.assertAlmostEqual(rstats["area"], numpy["area"], places=2)
+            self.assertAlmostEqual(
+                rstats["percent"], numpy["percent"], places=1
+            )
+
+    def test_sync_raster_area_stats_error_unknown_engine(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/raster_layers/{RASTER}/area_stats_sync?engine=unknown",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+    def test_sync_raster_area_stats_index_engine(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/raster_layers/{RASTER}/area_stats_index_sync?tile_size=64",
+            headers=self.admin_auth_header,
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        index = json_load(rv.data)["process_results"]
+        self.assertEqual(index["tile_size"], 64)
+        self.assertGreater(index["entries"], 0)
+
+        value_lists = {}
+        for engine in ["numpy", "index"]:
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_sync"
+                f"?engine={engine}",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            value_lists[engine] = json_load(rv.data)["process_results"]
+
+        self.assertEqual(value_lists["index"], value_lists["numpy"])
+
+    def test_sync_raster_area_stats_index_error_user_role(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/raster_layers/{RASTER}/area_stats_index_sync",
+            headers=self.user_auth_header,
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            401,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+    def test_sync_raster_area_stats_parallel(self):
+        value_lists = []
+        for parallel_cells in [AREA_STATS_PARALLEL_CELLS, 0]:
+            with patch.multiple(
+                "actinia_statistic_plugin.ephemeral_raster_area_stats",
+                AREA_STATS_PARALLEL_CELLS=parallel_cells,
+                AREA_STATS_PARALLEL_NPROCS=4,
+            ), patch(
+                "actinia_statistic_plugin.area_stats_cache."
+                "AREA_STATS_CACHE_SIZE",
+                0,
+            ):
+                rv = self.server.post(
+                    f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/"
+                    f"mapsets/{MAPSET}/raster_layers/{RASTER}/"
+                    "area_stats_sync",
+                    headers=self.admin_auth_header,
+                    data=json_dump(JSON),
+                    content_type="application/json",
+                )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            value_lists.append(json_load(rv.data)["process_results"])
+
+        self.assertEqual(len(value_lists[1]), 16)
+        for sequential, parallel in zip(*value_lists):
+            self.assertEqual(sequential["cat"], parallel["cat"])
+            self.assertEqual(sequential["cell_count"], parallel["cell_count"])
+            self.assertAlmostEqual(
+                sequential["percent"], parallel["percent"], places=1
+            )
+
+    def test_sync_raster_area_stats_cache(self):
+        responses = []
+        for _ in range(2):
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_sync",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            responses.append(json_load(rv.data))
+
+        self.assertIn(responses[0]["cache_status"], ["hit", "miss"])
+        self.assertEqual(responses[1]["cache_status"], "hit")
+        self.assertEqual(
+            responses[0]["process_results"], responses[1]["process_results"]
+        )
+
+    def test_sync_raster_area_stats_zonal(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/raster_layers/{RASTER}/area_stats_sync?zonal=true",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON_ZONES),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(len(value_list), 2)
+        self.assertEqual(value_list[0]["cat"], "1")
+        self.assertEqual(value_list[0]["fid"], "west")
+        self.assertEqual(value_list[1]["cat"], "2")
+        self.assertEqual(value_list[1]["fid"], "east")
+        for zone in value_list:
+            percent = sum([stat["percent"] for stat in zone["statistics"]])
+            self.assertAlmostEqual(percent, 100.0, places=3)
+
+    def test_sync_raster_area_stats_zonal_overlap(self):
+        # The first feature covers both other features
+        geojson = dict(
+            JSON_ZONES, features=JSON["features"] + JSON_ZONES["features"]
+        )
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/raster_layers/{RASTER}/area_stats_sync?zonal=true&engine=numpy",
+            headers=self.admin_auth_header,
+            data=json_dump(geojson),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(len(value_list), 3)
+        cell_counts = [
+            sum([stat["cell_count"] for stat in zone["statistics"]])
+            for zone in value_list
+        ]
+        self.assertEqual(cell_counts[0], cell_counts[1] + cell_counts[2])
+
+    def test_sync_raster_area_stats_batch(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            "/raster_layers/area_stats_batch_sync",
+            headers=self.admin_auth_header,
+            data=json_dump({"rasters": [RASTER, RASTER2], "geojson": JSON}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(len(value_list), 2)
+        self.assertEqual(value_list[0]["raster_name"], RASTER)
+        self.assertEqual(len(value_list[0]["statistics"]), 16)
+        self.assertEqual(value_list[1]["raster_name"], RASTER2)
+        self.assertEqual(len(value_list[1]["statistics"]), 16)
+
+    def test_sync_raster_area_stats_batch_qualified_names(self):
+        rasters = [RASTER, f"{RASTER}@{MAPSET}"]
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            "/raster_layers/area_stats_batch_sync",
+            headers=self.admin_auth_header,
+            data=json_dump({"rasters": rasters, "geojson": JSON}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(
+            [value["raster_name"] for value in value_list], rasters
+        )
+        self.assertEqual(
+            value_list[0]["statistics"], value_list[1]["statistics"]
+        )
+
+    def test_sync_raster_area_stats_batch_error_illegal_name(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            "/raster_layers/area_stats_batch_sync",
+            headers=self.admin_auth_header,
+            data=json_dump(
+                {"rasters": [f"../{MAPSET}/cellhd/{RASTER}"], "geojson": JSON}
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+    def test_sync_raster_area_stats_batch_error_empty_raster_list(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            "/raster_layers/area_stats_batch_sync",
+            headers=self.admin_auth_header,
+            data=json_dump({"rasters": [], "geojson": JSON}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
     def test_sync_raster_area_stats_error_wrong_content_type(self):
         rv = self.server.post(
             f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
@@ -94,6 +94,7 @@ class RasterAreaStatsTestCase(ActiniaResourceTestCaseBase):
 
         value_list = json_load(rv.data)["process_results"]
         self.assertEqual(value_list[0]["cat"], "1")
+        self.assertEqual(value_list[0]["fid"], "test")
         self.assertEqual(value_list[0]["raster_number"], 20000.0)
         self.assertEqual(value_list[0]["raster_maximum"], 138.268508911133)
 
@@ -121,6 +122,145 @@ class RasterAreaStatsTestCase(ActiniaResourceTestCaseBase):
         self.assertEqual(value_list[0]["raster_number"], 20000.0)
         self.assertEqual(value_list[0]["raster_maximum"], 359.995971679688)
 
+    def test_sync_raster_area_stats_cache(self):
+        responses = []
+        for _ in range(2):
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_univar_sync",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            responses.append(json_load(rv.data))
+
+        self.assertEqual(responses[1]["cache_status"], "hit")
+        self.assertEqual(
+            responses[0]["process_results"], responses[1]["process_results"]
+        )
+
+    def test_sync_raster_area_stats_r_univar_engine(self):
+        value_lists = {}
+        for engine in ["v.rast.stats", "r.univar"]:
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_univar_sync"
+                f"?engine={engine}",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            value_lists[engine] = json_load(rv.data)["process_results"]
+
+        self.assertEqual(len(value_lists["r.univar"]), 1)
+        v_rast_stats = value_lists["v.rast.stats"][0]
+        r_univar = value_lists["r.univar"][0]
+        self.assertEqual(r_univar["cat"], "1")
+        self.assertEqual(r_univar["fid"], "test")
+        for key in v_rast_stats:
+            if key in ["cat", "fid"]:
+                continue
+            self.assertAlmostEqual(v_rast_stats[key], r_univar[key], places=4)
+
+    def test_sync_raster_area_stats_methods(self):
+        for engine in ["v.rast.stats", "r.univar"]:
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_univar_sync"
+                f"?engine={engine}&methods=average,sum",
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            value_list = json_load(rv.data)["process_results"]
+            self.assertEqual(
+                sorted(value_list[0]),
+                ["cat", "fid", "raster_average", "raster_sum"],
+            )
+
+    def test_sync_raster_area_stats_error_unknown_method(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}/"
+            f"raster_layers/{RASTER}/area_stats_univar_sync?methods=mode",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+    def test_sync_raster_area_stats_approximate(self):
+        value_lists = {}
+        for query in ["", "?approximate=true&percentiles=10,90"]:
+            rv = self.server.post(
+                f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/"
+                f"{MAPSET}/raster_layers/{RASTER}/area_stats_univar_sync"
+                + query,
+                headers=self.admin_auth_header,
+                data=json_dump(JSON),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            value_lists[query] = json_load(rv.data)["process_results"][0]
+
+        exact = value_lists[""]
+        approximate = value_lists["?approximate=true&percentiles=10,90"]
+        self.assertEqual(approximate["raster_number"], exact["raster_number"])
+        self.assertAlmostEqual(
+            approximate["raster_average"], exact["raster_average"], places=3
+        )
+        error = approximate["raster_quantile_error"]
+        self.assertGreater(error, 0.0)
+        self.assertLessEqual(
+            abs(approximate["raster_median"] - exact["raster_median"]),
+            2 * error,
+        )
+        percentiles = approximate["raster_percentiles"]
+        self.assertEqual(sorted(percentiles), ["10", "90"])
+        self.assertLess(percentiles["10"], percentiles["90"])
+
+    def test_sync_raster_area_stats_error_unknown_engine(self):
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}/"
+            f"raster_layers/{RASTER}/area_stats_univar_sync?engine=unknown",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
     def test_sync_raster_area_stats_error_wrong_content_type(self):
 
         rv = self.server.post(
@@ -141,6 +141,63 @@ class RasterTestCase(ActiniaResourceTestCaseBase):
 
         time.sleep(1)
 
+    def test_sync_sampling_duplicate_points(self):
+
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/nc_spm_08/mapsets/PERMANENT"
+            "/raster_layers/landuse96_28m/sampling_sync",
+            headers=self.user_auth_header,
+            data=json_dump({"points": [["p1", "638684.0", "220210.0"],
+                                       ["p2", "635676.0", "226371.0"],
+                                       ["p3", "638684.0", "220210.0"]]}),
+            content_type="application/json")
+
+        self.assertEqual(
+            rv.status_code, 200, "HTML status code is wrong %i"
+            % rv.status_code)
+
+        value_list = json_load(rv.data)["process_results"]
+
+        self.assertEqual(
+            [list(entry.keys())[0] for entry in value_list],
+            ["p1", "p2", "p3"],
+        )
+        self.assertEqual(value_list[0]["p1"], value_list[2]["p3"])
+        self.assertEqual(value_list[0]["p1"]["value"], "4")
+
+    def test_sync_sampling_npz(self):
+
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/nc_spm_08/mapsets/PERMANENT"
+            "/raster_layers/landuse96_28m/sampling_sync?output_format=npz",
+            headers=self.user_auth_header,
+            data=json_dump({"points": [["p1", "638684.0", "220210.0"],
+                                       ["p2", "635676.0", "226371.0"]]}),
+            content_type="application/json")
+
+        self.assertEqual(
+            rv.status_code, 200, "HTML status code is wrong %i"
+            % rv.status_code)
+
+        resp = json_load(rv.data)
+        self.assertEqual(resp["process_results"], [])
+        self.assertEqual(len(resp["urls"]["resources"]), 1)
+        self.assertTrue(resp["urls"]["resources"][0].endswith(".npz"))
+
+    def test_sync_sampling_wrong_output_format(self):
+
+        rv = self.server.post(
+            f"{URL_PREFIX}/{self.project_url_part}/nc_spm_08/mapsets/PERMANENT"
+            "/raster_layers/landuse96_28m/sampling_sync"
+            "?output_format=ndjson",
+            headers=self.user_auth_header,
+            data=json_dump({"points": [["p1", "638684.0", "220210.0"]]}),
+            content_type="application/json")
+
+        self.assertEqual(
+            rv.status_code, 400, "HTML status code is wrong %i"
+            % rv.status_code)
+
 
 if __name__ == "__main__":
     unittest.main()
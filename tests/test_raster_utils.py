@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from actinia_core.core.common.exceptions import AsyncProcessError
+from actinia_statistic_plugin.point_sampling import compute_cell_indices
+from actinia_statistic_plugin.raster_utils import (
+    align_region,
+    check_raster_name,
+    read_raster_header,
+)
+from actinia_statistic_plugin.tile_index import get_header_grid
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+CELLHD = """proj:       99
+zone:       0
+north:      100
+south:      0
+east:       200
+west:       0
+cols:       20
+rows:       10
+e-w resol:  10
+n-s resol:  10
+format:     0
+compressed: 3
+"""
+
+RECLASS_CELLHD = """reclass
+name: landuse
+mapset: PERMANENT
+#1
+1
+2
+"""
+
+
+class RasterUtilsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.project = tempfile.TemporaryDirectory()
+        self._write_cellhd("PERMANENT", "landuse", CELLHD)
+        self._write_cellhd("user", "landuse_reclass", RECLASS_CELLHD)
+
+    def tearDown(self):
+        self.project.cleanup()
+
+    def _write_cellhd(self, mapset, name, content):
+        path = os.path.join(self.project.name, mapset, "cellhd")
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, name), "w") as cellhd_file:
+            cellhd_file.write(content)
+
+    def test_read_raster_header(self):
+        header = read_raster_header(self.project.name, "PERMANENT", "landuse")
+        self.assertEqual(header["rows"], 10)
+        self.assertEqual(header["e-w resol"], 10.0)
+        self.assertRaises(
+            AsyncProcessError,
+            read_raster_header,
+            self.project.name,
+            "PERMANENT",
+            "missing",
+        )
+
+    def test_sample_reclass_raster(self):
+        # The reclass raster map layer uses the grid of its base map
+        header = read_raster_header(
+            self.project.name, "user", "landuse_reclass"
+        )
+        self.assertEqual(
+            header,
+            read_raster_header(self.project.name, "PERMANENT", "landuse"),
+        )
+
+        grid = get_header_grid(header)
+        rows, cols, inside = compute_cell_indices(
+            grid, np.array([[15.0, 95.0], [105.0, 5.0]])
+        )
+        self.assertEqual(rows.tolist(), [0, 9])
+        self.assertEqual(cols.tolist(), [1, 10])
+        self.assertTrue(inside.all())
+        region = align_region(header, (15.0, 5.0, 105.0, 95.0))
+        self.assertEqual(
+            (region["west"], region["south"], region["east"],
+             region["north"]),
+            (10.0, 0.0, 110.0, 100.0),
+        )
+
+    def test_check_raster_name(self):
+        check_raster_name("landuse96_28m", "PERMANENT")
+        for name, mapset in [
+            ("../landuse", "PERMANENT"),
+            ("landuse", ".."),
+            ("a/b", "user"),
+            (".hidden", "user"),
+            ("landuse", ""),
+        ]:
+            self.assertRaises(
+                AsyncProcessError, check_raster_name, name, mapset
+            )
+        self.assertRaises(
+            AsyncProcessError,
+            read_raster_header,
+            self.project.name,
+            "..",
+            "landuse",
+        )
+
+    def test_invalid_headers(self):
+        self._write_cellhd("user", "broken", "proj: 99\n")
+        self.assertRaises(
+            AsyncProcessError,
+            read_raster_header,
+            self.project.name,
+            "user",
+            "broken",
+        )
+        self._write_cellhd(
+            "user", "cycle", "reclass\nname: cycle\nmapset: user\n"
+        )
+        # A reclass header must not reference files outside of the project
+        self._write_cellhd(
+            "user", "escape", "reclass\nname: ../../landuse\nmapset: user\n"
+        )
+        self.assertRaises(
+            AsyncProcessError,
+            read_raster_header,
+            self.project.name,
+            "user",
+            "escape",
+        )
+        self.assertRaises(
+            AsyncProcessError,
+            read_raster_header,
+            self.project.name,
+            "user",
+            "cycle",
+        )
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.result_formats import (
+    RASTER_OUTPUT_FORMAT_DESCRIPTIONS,
+    create_output_format_parameters,
+    iter_ndjson_chunks,
+    parse_dtype,
+    parse_output_format,
+    write_ndjson,
+    write_raster_sample_npz,
+    write_strds_sample_npz,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class ResultFormatsTestCase(unittest.TestCase):
+    def test_parse_output_format(self):
+        self.assertEqual(parse_output_format({}), "json")
+        self.assertEqual(
+            parse_output_format({"output_format": "ndjson"}), "ndjson"
+        )
+        self.assertRaises(
+            ValueError, parse_output_format, {"output_format": "csv"}
+        )
+        self.assertRaises(
+            ValueError,
+            parse_output_format,
+            {"output_format": "ndjson"},
+            ["json", "npz"],
+        )
+
+    def test_output_format_parameters(self):
+        output_format, dtype = create_output_format_parameters()
+        self.assertEqual(output_format["enum"], ["json", "ndjson", "npz"])
+        self.assertIn("time stamps", output_format["description"])
+        self.assertEqual(dtype["name"], "dtype")
+
+        output_format, _ = create_output_format_parameters(
+            ["json", "npz"], RASTER_OUTPUT_FORMAT_DESCRIPTIONS
+        )
+        self.assertEqual(output_format["enum"], ["json", "npz"])
+        self.assertIn("easting, northing", output_format["description"])
+        self.assertNotIn("time stamps", output_format["description"])
+
+    def test_parse_dtype(self):
+        self.assertEqual(parse_dtype({}), "float64")
+        self.assertEqual(parse_dtype({"dtype": "float32"}), "float32")
+        self.assertRaises(ValueError, parse_dtype, {"dtype": "int8"})
+
+    def test_ndjson(self):
+        rows = (
+            [str(row), "2016-01-01 00:00:00", "1.5"] for row in range(5)
+        )
+        ndjson_file = io.StringIO()
+        count, first, last = write_ndjson(rows, ndjson_file)
+        self.assertEqual(count, 5)
+        self.assertEqual(first[0], "0")
+        self.assertEqual(last[0], "4")
+
+        ndjson_file.seek(0)
+        chunks = list(iter_ndjson_chunks(ndjson_file, chunk_lines=2))
+        self.assertEqual(len(chunks), 3)
+        lines = "".join(chunks).splitlines()
+        self.assertEqual(
+            json.loads(lines[4]), ["4", "2016-01-01 00:00:00", "1.5"]
+        )
+        self.assertEqual(write_ndjson([], io.StringIO()), (0, None, None))
+
+    def test_strds_sample_npz(self):
+        rows = [
+            ["start_time", "end_time", "p1", "p2"],
+            ["2016-01-01 00:00:00", "2016-02-01 00:00:00", "1.5", "*"],
+            ["2016-02-01 00:00:00", "None", "2", "3"],
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sampling.npz")
+            count, header, last = write_strds_sample_npz(
+                iter(rows), file_path, "float32"
+            )
+            self.assertEqual((count, header, last), (3, rows[0], rows[2]))
+            with np.load(file_path) as result:
+                values = result["values"]
+                self.assertEqual(values.dtype, np.float32)
+                self.assertEqual(values.shape, (2, 2))
+                self.assertEqual(values[0, 0], 1.5)
+                self.assertTrue(np.isnan(values[0, 1]))
+                self.assertEqual(
+                    result["start_time"][1],
+                    np.datetime64("2016-02-01T00:00:00", "us"),
+                )
+                self.assertTrue(np.isnat(result["end_time"][1]))
+                self.assertEqual(list(result["point_id"]), ["p1", "p2"])
+
+    def test_raster_sample_npz(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "sampling.npz")
+            write_raster_sample_npz(
+                file_path,
+                ["a", "b"],
+                ["10.5", "20.5"],
+                ["30.5", "40.5"],
+                ["7", "*"],
+            )
+            with np.load(file_path) as result:
+                self.assertEqual(list(result["point_id"]), ["a", "b"])
+                self.assertEqual(list(result["easting"]), [10.5, 20.5])
+                self.assertEqual(result["value"][0], 7.0)
+                self.assertTrue(np.isnan(result["value"][1]))
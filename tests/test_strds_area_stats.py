@@ -58,6 +58,8 @@ BASE_URL = f"{URL_PREFIX}/{PROJECT_URL_PART}/{PROJECT}/mapsets/{MAPSET}" \
     f"/strds/{STRDS}/timestamp/{TIMESTAMP}"
 ASYNC_URL = f"{BASE_URL}/area_stats_async"
 SYNC_URL = f"{BASE_URL}/area_stats_sync"
+TIME_SERIES_URL = f"{URL_PREFIX}/{PROJECT_URL_PART}/{PROJECT}/mapsets/" \
+    f"{MAPSET}/strds/{STRDS}/area_stats_sync"
 
 
 class STRDSAreaStatsTestCase(ActiniaResourceTestCaseBase):
@@ -128,6 +130,28 @@ class STRDSAreaStatsTestCase(ActiniaResourceTestCaseBase):
         value_list = json_load(rv.data)["process_results"]
         self.assertEqual(len(value_list), 93)
 
+    def test_sync_raster_area_stats_timestamp_in_interval(self):
+
+        # The map of January 2016 is valid in the middle of the month
+        rv = self.server.post(
+            SYNC_URL.replace(TIMESTAMP, "2016-01-15T12:00:00"),
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(len(value_list), 93)
+
     def test_sync_raster_area_stats_error_no_map_found(self):
 
         newer_timestamp = "2021-01-01T00:00:00"
@@ -218,6 +242,102 @@ class STRDSAreaStatsTestCase(ActiniaResourceTestCaseBase):
             rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
         )
 
+    def test_sync_raster_area_stats_time_series(self):
+
+        rv = self.server.post(
+            f"{TIME_SERIES_URL}?start=2016-01-01T00:00:00"
+            "&end=2016-04-01T00:00:00",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(
+            [value["start_time"] for value in value_list],
+            [
+                "2016-01-01T00:00:00",
+                "2016-02-01T00:00:00",
+                "2016-03-01T00:00:00",
+            ],
+        )
+        # The first map equals the single time stamp statistics
+        self.assertEqual(len(value_list[0]["statistics"]), 93)
+
+    def test_sync_raster_area_stats_time_series_error_no_map_found(self):
+
+        rv = self.server.post(
+            f"{TIME_SERIES_URL}?start=2021-01-01T00:00:00",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+    def test_async_raster_area_stats_error_no_map_found(self):
+
+        rv = self.server.post(
+            ASYNC_URL.replace(TIMESTAMP, "2030-01-01T00:00:00"),
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        resp = json_load(rv.data)
+
+        # The rejected resource is not left in the accepted state
+        rv = self.server.get(
+            f"{URL_PREFIX}/resources/{resp['user_id']}/"
+            f"{resp['resource_id']}",
+            headers=self.admin_auth_header,
+        )
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(json_load(rv.data)["status"], "error")
+
+    def test_sync_raster_area_stats_time_series_error_wrong_timestamp(self):
+
+        rv = self.server.post(
+            f"{TIME_SERIES_URL}?end=2016-01-01T00.00.00",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
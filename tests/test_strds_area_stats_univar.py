@@ -112,6 +112,27 @@ class STRDSAreaStatsUnivarTestCase(ActiniaResourceTestCaseBase):
         self.assertEqual(value_list[0]["raster_maximum"], 13781.)
         self.assertEqual(value_list[0]["raster_number"], 1.0)
 
+    def test_sync_raster_area_stats_methods(self):
+        rv = self.server.post(
+            URL_PREFIX + f"/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/strds/{STRDS}/timestamp/{TIMESTAMP}/"
+            "area_stats_univar_sync?methods=maximum,number",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(value_list[0]["raster_maximum"], 13781.)
+        self.assertEqual(value_list[0]["raster_number"], 1.0)
+        self.assertNotIn("raster_median", value_list[0])
+
     def test_sync_raster_area_stats_2(self):
         rv = self.server.post(
             URL_PREFIX + f"/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
@@ -212,6 +233,59 @@ class STRDSAreaStatsUnivarTestCase(ActiniaResourceTestCaseBase):
             rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
         )
 
+    def test_sync_raster_area_stats_time_series(self):
+        rv = self.server.post(
+            URL_PREFIX + f"/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/strds/{STRDS}/area_stats_univar_sync?methods=maximum,number"
+            "&start=2016-01-01T00:00:00&end=2016-04-01T00:00:00",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+        self.assertEqual(
+            [value["start_time"] for value in value_list],
+            [
+                "2016-01-01T00:00:00",
+                "2016-02-01T00:00:00",
+                "2016-03-01T00:00:00",
+            ],
+        )
+        # The first map equals the single time stamp statistics
+        statistics = value_list[0]["statistics"][0]
+        self.assertEqual(statistics["raster_maximum"], 13781.)
+        self.assertEqual(statistics["raster_number"], 1.0)
+        self.assertNotIn("raster_median", statistics)
+
+    def test_sync_raster_area_stats_time_series_error_no_map_found(self):
+        rv = self.server.post(
+            URL_PREFIX + f"/{self.project_url_part}/{PROJECT}/mapsets/{MAPSET}"
+            f"/strds/{STRDS}/area_stats_univar_sync"
+            "?start=2021-01-01T00:00:00",
+            headers=self.admin_auth_header,
+            data=json_dump(JSON),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(
+            rv.mimetype, "application/json", "Wrong mimetype %s" % rv.mimetype
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -173,6 +173,322 @@ class STRDSTestCase(ActiniaResourceTestCaseBase):
         self.assertEqual(value_list[0][3], "b")
         self.assertEqual(value_list[0][4], "c")
 
+    def test_sync_sampling_time_window(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync"
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump(
+                {
+                    "points": POINT_LIST,
+                    "start_time": "2016-01-01T00:00:00",
+                    "end_time": "2016-07-01T00:00:00",
+                    "granularity": "2 months",
+                }
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        value_list = json_load(rv.data)["process_results"]
+
+        self.assertEqual(
+            value_list[0], ["start_time", "end_time", "a", "b", "c"]
+        )
+        self.assertEqual(
+            [row[0][:10] for row in value_list[1:]],
+            ["2016-01-01", "2016-03-01", "2016-05-01"],
+        )
+
+    def test_sync_sampling_wrong_time_window(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync"
+        for window in [
+            {"start_time": "2016-01-01"},
+            {"granularity": "one month"},
+            {"start_time": "1900-01-01T00:00:00",
+             "end_time": "1901-01-01T00:00:00"},
+        ]:
+            rv = self.server.post(
+                url,
+                headers=self.user_auth_header,
+                data=json_dump(dict(window, points=POINT_LIST)),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                400,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            resp = json_load(rv.data)
+
+            # The rejected resource is not left in the accepted state
+            rv = self.server.get(
+                f"{URL_PREFIX}/resources/{resp['user_id']}/"
+                f"{resp['resource_id']}",
+                headers=self.user_auth_header,
+            )
+            self.assertEqual(json_load(rv.data)["status"], "error")
+
+    def test_sync_sampling_cursor(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync"
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump({"points": POINT_LIST}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        resp = json_load(rv.data)
+        cursor = resp["cursor"]
+        self.assertEqual(cursor["start_time"], resp["process_results"][-1][0])
+        self.assertIsNotNone(cursor["modification_time"])
+        self.assertIsNotNone(cursor["maps_digest"])
+        # The modification time is read from the temporal index
+        self.assertNotIn(
+            "t_info_cursor", [entry["id"] for entry in resp["process_log"]]
+        )
+
+        # No raster map layer was registered since the first request
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump({"points": POINT_LIST, "cursor": cursor}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        resp = json_load(rv.data)
+        self.assertEqual(
+            resp["process_results"],
+            [["start_time", "end_time", "a", "b", "c"]],
+        )
+        self.assertEqual(resp["cursor"], cursor)
+
+    def test_sync_sampling_ndjson(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync" \
+            "?output_format=ndjson"
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump({"points": POINT_LIST}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        resp = json_load(rv.data)
+        header = ["start_time", "end_time", "a", "b", "c"]
+        self.assertEqual(resp["process_results"], [header])
+        self.assertEqual(len(resp["urls"]["resources"]), 1)
+
+        rv = self.server.get(
+            f"{URL_PREFIX}/sampling_results/{resp['user_id']}/"
+            f"{resp['resource_id']}/ndjson",
+            headers=self.user_auth_header,
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+        self.assertEqual(rv.mimetype, "application/x-ndjson")
+        rows = [json_load(line) for line in rv.data.splitlines()]
+        self.assertEqual(rows[0], header)
+        self.assertTrue(len(rows) > 1)
+        self.assertEqual(resp["cursor"]["start_time"], rows[-1][0])
+
+    def test_sync_sampling_npz(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync" \
+            "?output_format=npz&dtype=float32"
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump({"points": POINT_LIST}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            200,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
+        resp = json_load(rv.data)
+        header = ["start_time", "end_time", "a", "b", "c"]
+        self.assertEqual(resp["process_results"], [header])
+        self.assertEqual(len(resp["urls"]["resources"]), 1)
+        self.assertTrue(resp["urls"]["resources"][0].endswith(".npz"))
+
+    def test_sync_sampling_nprocs(self):
+
+        value_lists = []
+        process_logs = []
+        # Split the STRDS into time chunks of two raster map layers, so
+        # that the parallel t.rast.sample processes are used with nprocs=4
+        for nprocs in [1, 4]:
+            url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+                f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync" \
+                f"?nprocs={nprocs}&chunk_maps=2"
+            rv = self.server.post(
+                url,
+                headers=self.user_auth_header,
+                data=json_dump({"points": POINT_LIST}),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            resp = json_load(rv.data)
+            value_lists.append(resp["process_results"])
+            process_logs.append([entry["id"] for entry in resp["process_log"]])
+
+        self.assertNotIn("t_rast_sample_chunk_1", process_logs[0])
+        # More than one time chunk was sampled
+        chunk_ids = [
+            process_id for process_id in process_logs[1]
+            if process_id.startswith("t_rast_sample_chunk_")
+        ]
+        self.assertTrue(len(chunk_ids) > 1)
+        # The time chunks were selected with the temporal index
+        self.assertNotIn("t_rast_list_chunks", process_logs[1])
+        sequential, parallel = value_lists
+        self.assertEqual(
+            parallel[0], ["start_time", "end_time", "a", "b", "c"]
+        )
+        self.assertTrue(len(sequential) > 4)
+        # The chunked result is identical to the result of a single
+        # t.rast.sample run
+        self.assertEqual(parallel, sequential)
+
+    def test_sync_sampling_r_what(self):
+
+        value_lists = []
+        for engine in ["t.rast.sample", "r.what"]:
+            url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+                f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync" \
+                f"?engine={engine}"
+            rv = self.server.post(
+                url,
+                headers=self.user_auth_header,
+                data=json_dump({"points": POINT_LIST, "where": WHERE}),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+            self.assertEqual(
+                rv.mimetype,
+                "application/json",
+                "Wrong mimetype %s" % rv.mimetype,
+            )
+            value_lists.append(json_load(rv.data)["process_results"])
+
+        t_rast_sample, r_what = value_lists
+        self.assertEqual(
+            r_what[0], ["start_time", "end_time", "a", "b", "c"]
+        )
+        self.assertTrue(len(r_what) > 1)
+        # Both engines sample the same values of the same raster map layers
+        self.assertEqual(len(r_what), len(t_rast_sample))
+        self.assertEqual(r_what[0], t_rast_sample[0])
+        for r_what_row, t_rast_sample_row in zip(
+            r_what[1:], t_rast_sample[1:]
+        ):
+            self.assertEqual(r_what_row[:2], t_rast_sample_row[:2])
+            for r_what_value, t_rast_sample_value in zip(
+                r_what_row[2:], t_rast_sample_row[2:]
+            ):
+                if "*" in [r_what_value, t_rast_sample_value]:
+                    self.assertEqual(r_what_value, t_rast_sample_value)
+                else:
+                    self.assertAlmostEqual(
+                        float(r_what_value), float(t_rast_sample_value)
+                    )
+
+    def test_sync_sampling_duplicate_points(self):
+
+        points = POINT_LIST + [["d", "330000.0", "65000.0"]]
+        for engine in ["t.rast.sample", "r.what"]:
+            url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+                f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync" \
+                f"?engine={engine}"
+            rv = self.server.post(
+                url,
+                headers=self.user_auth_header,
+                data=json_dump({"points": points, "where": WHERE}),
+                content_type="application/json",
+            )
+
+            self.assertEqual(
+                rv.status_code,
+                200,
+                "HTML status code is wrong %i" % rv.status_code,
+            )
+
+            value_list = json_load(rv.data)["process_results"]
+
+            self.assertEqual(
+                value_list[0], ["start_time", "end_time", "a", "b", "c", "d"]
+            )
+            self.assertTrue(len(value_list) > 1)
+            for row in value_list[1:]:
+                self.assertEqual(row[2], row[5])
+
+    def test_sync_sampling_wrong_engine(self):
+
+        url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
+            f"mapsets/{MAPSET}/strds/{STRDS}/sampling_sync?engine=unknown"
+        rv = self.server.post(
+            url,
+            headers=self.user_auth_header,
+            data=json_dump({"points": POINT_LIST}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            rv.status_code,
+            400,
+            "HTML status code is wrong %i" % rv.status_code,
+        )
+
     def test_sync_sampling_geojson(self):
 
         url = f"{URL_PREFIX}/{self.project_url_part}/{PROJECT}/" \
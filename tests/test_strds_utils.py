@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from datetime import datetime, timedelta
+
+from actinia_statistic_plugin.strds_utils import (
+    add_granularity,
+    create_cursor_where,
+    create_sampling_cursor,
+    create_sampling_where,
+    create_sampling_wheres,
+    create_time_chunk_where,
+    create_time_range_where,
+    is_cursor_backfilled,
+    create_timestamp_where,
+    iter_sample_rows,
+    parse_chunk_maps,
+    parse_nprocs,
+    parse_granularity,
+    parse_modification_time,
+    parse_raster_map_list,
+    parse_sampling_cursor,
+    parse_sampling_window,
+    parse_time_range,
+    select_granularity_steps,
+    split_time_chunks,
+    stitch_sample_outputs,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class STRDSUtilsTestCase(unittest.TestCase):
+    def test_time_range_where(self):
+        time_range = parse_time_range(
+            {"start": "2016-01-01T00:00:00", "end": "2016-04-01T12:30:00"}
+        )
+        self.assertEqual(
+            create_time_range_where(time_range),
+            "start_time >= '2016-01-01 00:00:00' AND "
+            "start_time < '2016-04-01 12:30:00'",
+        )
+        time_range = parse_time_range({"where": "end_time > '2016-02-01'"})
+        self.assertEqual(
+            create_time_range_where(time_range), "(end_time > '2016-02-01')"
+        )
+        self.assertIsNone(create_time_range_where(parse_time_range({})))
+        self.assertRaises(
+            ValueError, parse_time_range, {"end": "2016-01-01T00.00.00"}
+        )
+
+    def test_timestamp_where(self):
+        self.assertEqual(
+            create_timestamp_where("2016-01-15T00:00:00"),
+            "start_time <= '2016-01-15 00:00:00' AND "
+            "(end_time > '2016-01-15 00:00:00' OR (end_time IS NULL AND "
+            "start_time = '2016-01-15 00:00:00'))",
+        )
+
+    def test_parse_raster_map_list(self):
+        stdout = (
+            "LST_1@modis_lst|2016-01-01 00:00:00\n"
+            "LST_2@modis_lst|2016-02-01 00:00:00\n"
+        )
+        self.assertEqual(
+            parse_raster_map_list(stdout),
+            [
+                ("LST_1@modis_lst", "2016-01-01T00:00:00"),
+                ("LST_2@modis_lst", "2016-02-01T00:00:00"),
+            ],
+        )
+        self.assertEqual(parse_raster_map_list(""), [])
+
+    def test_parse_nprocs(self):
+        self.assertEqual(parse_nprocs({}, 8), 8)
+        self.assertEqual(parse_nprocs({"nprocs": "2"}, 8), 2)
+        self.assertEqual(parse_nprocs({"nprocs": "16"}, 8), 8)
+        self.assertEqual(parse_nprocs({}, 0), 1)
+        self.assertRaises(ValueError, parse_nprocs, {"nprocs": "0"}, 8)
+        self.assertRaises(ValueError, parse_nprocs, {"nprocs": "two"}, 8)
+
+    def test_parse_chunk_maps(self):
+        self.assertEqual(parse_chunk_maps({}, 100), 100)
+        self.assertEqual(parse_chunk_maps({"chunk_maps": "2"}, 100), 2)
+        self.assertEqual(parse_chunk_maps({}, 0), 1)
+        self.assertRaises(
+            ValueError, parse_chunk_maps, {"chunk_maps": "0"}, 100
+        )
+        self.assertRaises(
+            ValueError, parse_chunk_maps, {"chunk_maps": "two"}, 100
+        )
+
+    def test_time_chunks(self):
+        start_times = ["2016-01", "2016-02", "2016-02", "2016-03", "2016-04"]
+        self.assertEqual(
+            split_time_chunks(start_times, 2),
+            [("2016-01", "2016-02"), ("2016-03", "2016-04")],
+        )
+        self.assertEqual(
+            split_time_chunks(start_times, 10),
+            [
+                ("2016-01", "2016-01"),
+                ("2016-02", "2016-02"),
+                ("2016-03", "2016-03"),
+                ("2016-04", "2016-04"),
+            ],
+        )
+        self.assertEqual(
+            create_time_chunk_where(("2016-01", "2016-02"), "name = 'a'"),
+            "start_time >= '2016-01' AND start_time <= '2016-02' AND "
+            "(name = 'a')",
+        )
+
+    def test_iter_sample_rows(self):
+        outputs = iter(
+            [
+                iter(["start_time|end_time|a\n", "2016-01|2016-02|1\n"]),
+                iter(["start_time|end_time|a\n", "2016-02|2016-03|2\n"]),
+            ]
+        )
+        self.assertEqual(
+            list(iter_sample_rows(outputs)),
+            [
+                ["start_time", "end_time", "a"],
+                ["2016-01", "2016-02", "1"],
+                ["2016-02", "2016-03", "2"],
+            ],
+        )
+
+    def test_stitch_sample_outputs(self):
+        outputs = [
+            ["start_time|end_time|a\n", "2016-01|2016-02|1\n"],
+            [],
+            ["start_time|end_time|a\n", "2016-02|2016-03|2\n", "\n"],
+        ]
+        self.assertEqual(
+            stitch_sample_outputs(outputs),
+            [
+                ["start_time", "end_time", "a"],
+                ["2016-01", "2016-02", "1"],
+                ["2016-02", "2016-03", "2"],
+            ],
+        )
+
+    def test_granularity(self):
+        self.assertEqual(parse_granularity("1 month"), (1, "month"))
+        self.assertEqual(parse_granularity("10 days"), (10, "day"))
+        self.assertRaises(ValueError, parse_granularity, "month")
+        self.assertRaises(ValueError, parse_granularity, "0 days")
+        self.assertRaises(ValueError, parse_granularity, "2 fortnights")
+        self.assertEqual(
+            add_granularity(datetime(2016, 1, 31), (1, "month")),
+            datetime(2016, 2, 29),
+        )
+        self.assertEqual(
+            add_granularity(datetime(2016, 1, 31), (2, "year")),
+            datetime(2018, 1, 31),
+        )
+        self.assertEqual(
+            add_granularity(datetime(2016, 1, 31), (2, "week")),
+            datetime(2016, 2, 14),
+        )
+
+    def test_sampling_window(self):
+        self.assertIsNone(parse_sampling_window({"points": []}))
+        self.assertIsNone(parse_sampling_window("{}"))
+        window = parse_sampling_window(
+            {
+                "start_time": "2016-01-01T00:00:00",
+                "end_time": "2016-07-01T00:00:00",
+                "granularity": "2 months",
+            }
+        )
+        self.assertEqual(
+            window,
+            {
+                "start": "2016-01-01 00:00:00",
+                "end": "2016-07-01 00:00:00",
+                "granularity": (2, "month"),
+            },
+        )
+        self.assertRaises(
+            ValueError, parse_sampling_window, {"start_time": "2016-01-01"}
+        )
+        self.assertRaises(
+            ValueError,
+            parse_sampling_window,
+            {
+                "start_time": "2016-02-01T00:00:00",
+                "end_time": "2016-01-01T00:00:00",
+            },
+        )
+
+        start_times = [datetime(2016, month, 1) for month in range(1, 7)]
+        selected = select_granularity_steps(start_times, window)
+        self.assertEqual(
+            selected,
+            [datetime(2016, 1, 1), datetime(2016, 3, 1), datetime(2016, 5, 1)],
+        )
+        self.assertEqual(
+            create_sampling_where(window, "name = 'a'", selected[:2]),
+            "start_time IN ('2016-01-01 00:00:00', '2016-03-01 00:00:00') "
+            "AND (name = 'a')",
+        )
+        self.assertEqual(
+            create_sampling_where(window),
+            "start_time >= '2016-01-01 00:00:00' AND "
+            "start_time < '2016-07-01 00:00:00'",
+        )
+
+    def test_sampling_wheres(self):
+        window = parse_sampling_window({"granularity": "1 day"})
+        start_times = [
+            datetime(2000, 1, 1) + timedelta(days=day) for day in range(2500)
+        ]
+        wheres = create_sampling_wheres(window, "name = 'a'", start_times)
+        self.assertEqual(len(wheres), 3)
+        self.assertEqual(
+            sum(where.count("'") // 2 - 1 for where in wheres), 2500
+        )
+        for where in wheres:
+            # Below the maximum argument length of 128 KiB
+            self.assertLess(len(where), 131072)
+            self.assertTrue(where.endswith("AND (name = 'a')"))
+        self.assertIn("'2006-11-04 00:00:00')", wheres[-1])
+        self.assertEqual(create_sampling_wheres(window), [None])
+
+    def test_sampling_cursor(self):
+        self.assertIsNone(parse_sampling_cursor({"points": []}))
+        cursor = parse_sampling_cursor(
+            {
+                "cursor": {
+                    "start_time": "2016-03-01 00:00:00",
+                    "modification_time": "2017-05-10T14:21:05.413302",
+                }
+            }
+        )
+        self.assertEqual(
+            cursor,
+            {
+                "start_time": "2016-03-01 00:00:00",
+                "modification_time": "2017-05-10 14:21:05.413302",
+                "maps_digest": None,
+            },
+        )
+        self.assertEqual(
+            create_cursor_where(cursor, "name = 'a'"),
+            "(name = 'a') AND start_time > '2016-03-01 00:00:00'",
+        )
+        self.assertEqual(
+            create_cursor_where(cursor, "name = 'a'", backfilled=True),
+            "name = 'a'",
+        )
+        self.assertRaises(
+            ValueError, parse_sampling_cursor, {"cursor": "2016-03-01"}
+        )
+        self.assertRaises(
+            ValueError,
+            parse_sampling_cursor,
+            {"cursor": {"start_time": "March", "modification_time": "2017"}},
+        )
+        self.assertRaises(
+            ValueError,
+            parse_sampling_cursor,
+            {"cursor": {"modification_time": "2017-05-10", "maps_digest": 1}},
+        )
+
+        stdout = "id=LST@modis_lst\nmodification_time='2017-06-01 10:00:00'\n"
+        modification_time = parse_modification_time(stdout)
+        self.assertEqual(modification_time, "2017-06-01 10:00:00")
+        output_list = [
+            ["start_time", "end_time", "a"],
+            ["2016-04-01 00:00:00", "2016-05-01 00:00:00", "1"],
+        ]
+        self.assertEqual(
+            create_sampling_cursor(output_list, cursor, modification_time),
+            {
+                "start_time": "2016-04-01 00:00:00",
+                "modification_time": "2017-06-01 10:00:00",
+            },
+        )
+        # Without new raster map layers the start time of the cursor is kept
+        self.assertEqual(
+            create_sampling_cursor(output_list[:1], cursor, modification_time)[
+                "start_time"
+            ],
+            "2016-03-01 00:00:00",
+        )
+
+    def test_cursor_backfilled(self):
+        cursor = {
+            "start_time": "2016-03-01 00:00:00",
+            "modification_time": "2017-05-10 14:21:05.413302",
+            "maps_digest": "abc",
+        }
+        # The STRDS was not modified since the cursor
+        self.assertFalse(
+            is_cursor_backfilled(cursor, "2017-05-10 14:21:05.413302", "def")
+        )
+        # Raster map layers were only appended after the start time
+        self.assertFalse(
+            is_cursor_backfilled(cursor, "2017-06-01 10:00:00", "abc")
+        )
+        # A raster map layer registered earlier in the temporal database
+        # was added at an earlier start time
+        self.assertTrue(
+            is_cursor_backfilled(cursor, "2017-06-01 10:00:00", "def")
+        )
+        self.assertTrue(
+            is_cursor_backfilled(cursor, "2017-06-01 10:00:00", None)
+        )
+        self.assertTrue(is_cursor_backfilled(cursor, None, "abc"))
+        self.assertFalse(
+            is_cursor_backfilled(
+                dict(cursor, start_time=None), "2017-06-01 10:00:00"
+            )
+        )
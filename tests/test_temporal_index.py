@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import tempfile
+import unittest
+from collections import OrderedDict
+from datetime import datetime
+from unittest.mock import patch
+
+from actinia_statistic_plugin import temporal_index
+from actinia_statistic_plugin.temporal_index import (
+    STRDSTemporalIndex,
+    get_temporal_index,
+    select_sampling_window,
+    select_time_range,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+STRDS = "LST_Day_monthly@modis_lst"
+
+
+def create_tgis_database(path, maps, temporal_type="absolute"):
+    """Create the tables of a SQLite temporal database that are read by the
+    temporal index"""
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE strds_base (id VARCHAR, temporal_type VARCHAR, "
+        "modification_time TIMESTAMP);"
+        "CREATE TABLE strds_metadata (id VARCHAR, raster_register VARCHAR);"
+        "CREATE TABLE raster_absolute_time "
+        "(id VARCHAR, start_time TIMESTAMP, end_time TIMESTAMP);"
+        "CREATE TABLE raster_map_register_1 (id VARCHAR);"
+    )
+    connection.execute(
+        "INSERT INTO strds_base VALUES (?, ?, ?)",
+        (STRDS, temporal_type, "2017-05-10 14:21:05.413302"),
+    )
+    connection.execute(
+        "INSERT INTO strds_metadata VALUES (?, ?)",
+        (STRDS, "raster_map_register_1"),
+    )
+    for map_id, start_time, end_time in maps:
+        connection.execute(
+            "INSERT INTO raster_absolute_time VALUES (?, ?, ?)",
+            (map_id, start_time, end_time),
+        )
+        connection.execute(
+            "INSERT INTO raster_map_register_1 VALUES (?)", (map_id,)
+        )
+    connection.commit()
+    connection.close()
+
+
+class TemporalIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = STRDSTemporalIndex(
+            [
+                ("jan", datetime(2016, 1, 1), datetime(2016, 2, 1)),
+                ("feb", datetime(2016, 2, 1), datetime(2016, 3, 1)),
+                ("instance", datetime(2016, 3, 15), None),
+                ("apr", datetime(2016, 4, 1), datetime(2016, 6, 1)),
+                ("may", datetime(2016, 5, 1), datetime(2016, 5, 2)),
+            ]
+        )
+
+    def test_find(self):
+        self.assertEqual(self.index.find(datetime(2016, 1, 1)), "jan")
+        self.assertEqual(self.index.find(datetime(2016, 1, 31, 23)), "jan")
+        self.assertEqual(self.index.find(datetime(2016, 2, 1)), "feb")
+        self.assertEqual(self.index.find(datetime(2016, 3, 15)), "instance")
+        # The gap between the maps and the extent
+        self.assertIsNone(self.index.find(datetime(2016, 3, 10)))
+        self.assertIsNone(self.index.find(datetime(2015, 12, 31)))
+        self.assertIsNone(self.index.find(datetime(2016, 6, 1)))
+        # Overlapping maps, the map with the earliest start time is valid
+        self.assertEqual(self.index.find(datetime(2016, 5, 1, 12)), "apr")
+
+    def test_select(self):
+        self.assertEqual(
+            self.index.select(datetime(2016, 2, 1), datetime(2016, 4, 1)),
+            [
+                ("feb", "2016-02-01T00:00:00"),
+                ("instance", "2016-03-15T00:00:00"),
+            ],
+        )
+        self.assertEqual(len(self.index.select()), 5)
+        self.assertEqual(
+            select_time_range(
+                self.index, {"start": "2016-04-01 00:00:00", "end": None}
+            ),
+            [("apr", "2016-04-01T00:00:00"), ("may", "2016-05-01T00:00:00")],
+        )
+        self.assertIsNone(
+            select_time_range(self.index, {"where": "name = 'jan'"})
+        )
+
+    def test_maps_digest(self):
+        digest = self.index.get_maps_digest(datetime(2016, 3, 15))
+        self.assertEqual(
+            digest, self.index.get_maps_digest(datetime(2016, 3, 31))
+        )
+        self.assertNotEqual(
+            digest, self.index.get_maps_digest(datetime(2016, 4, 1))
+        )
+        # A raster map layer added at an earlier start time
+        index = STRDSTemporalIndex(
+            [("dec", datetime(2015, 12, 1), datetime(2016, 1, 1))]
+            + list(
+                zip(self.index.ids, self.index.start_times,
+                    self.index.end_times)
+            )
+        )
+        self.assertNotEqual(
+            digest, index.get_maps_digest(datetime(2016, 3, 15))
+        )
+
+    def test_select_sampling_window(self):
+        self.assertEqual(
+            select_sampling_window(
+                self.index,
+                {
+                    "start": "2016-02-01 00:00:00",
+                    "end": None,
+                    "granularity": (2, "month"),
+                },
+            ),
+            [datetime(2016, 2, 1), datetime(2016, 4, 1)],
+        )
+        self.assertEqual(
+            select_sampling_window(
+                self.index,
+                {"start": None, "end": "2016-03-01 00:00:00",
+                 "granularity": None},
+            ),
+            [datetime(2016, 1, 1), datetime(2016, 2, 1)],
+        )
+        self.assertIsNone(select_sampling_window(None, {}))
+
+    def test_get_temporal_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sqlite.db")
+            create_tgis_database(
+                path,
+                [
+                    ("feb", "2016-02-01 00:00:00", "2016-03-01 00:00:00"),
+                    ("jan", "2016-01-01 00:00:00", "2016-02-01 00:00:00"),
+                ],
+            )
+            os.utime(path, (1000.0, 1000.0))
+            index = get_temporal_index(path, STRDS)
+            self.assertEqual(index.ids, ["jan", "feb"])
+            self.assertEqual(
+                index.modification_time, "2017-05-10 14:21:05.413302"
+            )
+            self.assertIs(get_temporal_index(path, STRDS), index)
+            self.assertIsNone(get_temporal_index(path, "other@modis_lst"))
+
+            # A modified temporal database invalidates the index
+            connection = sqlite3.connect(path)
+            connection.execute(
+                "INSERT INTO raster_absolute_time VALUES "
+                "('mar', '2016-03-01 00:00:00', '2016-04-01 00:00:00')"
+            )
+            connection.execute(
+                "INSERT INTO raster_map_register_1 VALUES ('mar')"
+            )
+            connection.commit()
+            connection.close()
+            os.utime(path, (2000.0, 2000.0))
+            self.assertEqual(
+                get_temporal_index(path, STRDS).find(datetime(2016, 3, 2)),
+                "mar",
+            )
+
+    def test_special_characters_in_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "a?b#c%20d", "sqlite.db")
+            os.mkdir(os.path.dirname(path))
+            create_tgis_database(
+                path,
+                [("jan", "2016-01-01 00:00:00", "2016-02-01 00:00:00")],
+            )
+            self.assertEqual(get_temporal_index(path, STRDS).ids, ["jan"])
+
+    def test_cache_size(self):
+        with tempfile.TemporaryDirectory() as directory, patch.object(
+            temporal_index, "TEMPORAL_INDEX_CACHE_SIZE", 2
+        ), patch.object(temporal_index, "_temporal_indexes", OrderedDict()):
+            paths = []
+            for number in range(3):
+                paths.append(os.path.join(directory, "%i.db" % number))
+                create_tgis_database(paths[-1], [])
+            get_temporal_index(paths[0], STRDS)
+            get_temporal_index(paths[1], STRDS)
+            # The first index is used again and the second one is evicted
+            get_temporal_index(paths[0], STRDS)
+            get_temporal_index(paths[2], STRDS)
+            self.assertEqual(
+                list(temporal_index._temporal_indexes),
+                [(paths[0], STRDS), (paths[2], STRDS)],
+            )
+
+    def test_relative_time(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sqlite.db")
+            create_tgis_database(path, [], temporal_type="relative")
+            self.assertIsNone(get_temporal_index(path, STRDS))
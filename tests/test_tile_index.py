@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from actinia_statistic_plugin.geojson_utils import (
+    get_polygon_rings,
+    rasterize_features,
+)
+from actinia_statistic_plugin.tile_index import (
+    classify_tiles,
+    compute_band_histograms,
+    create_tile_index,
+    get_tile_index_path,
+    get_tile_window,
+    get_tiles_region,
+    merge_histograms,
+    read_tile_index,
+    sum_tile_histograms,
+    write_tile_index,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+NULL_CELL = -2147483648
+TILE_SIZE = 8
+GRID = {
+    "north": 100.0,
+    "west": 0.0,
+    "nsres": 1.0,
+    "ewres": 1.0,
+    "rows": 100,
+    "cols": 90,
+}
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [
+        [[3.3, 2.2], [80.5, 10.1], [85.2, 95.7], [10.4, 70.3], [3.3, 2.2]],
+        [[30.0, 30.0], [50.0, 30.0], [50.0, 50.0], [30.0, 50.0], [30.0, 30.0]],
+    ],
+}
+
+
+def create_index(values):
+    band_histograms = []
+    for row in range(0, values.shape[0], TILE_SIZE):
+        band_histograms.append(
+            compute_band_histograms(
+                values[row:row + TILE_SIZE], TILE_SIZE, NULL_CELL
+            )
+        )
+    return create_tile_index(GRID, TILE_SIZE, band_histograms, 1.0)
+
+
+class TileIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(42)
+        self.values = generator.integers(
+            -3, 5, size=(GRID["rows"], GRID["cols"])
+        ).astype(np.int32)
+        self.values[self.values == -3] = NULL_CELL
+        self.index = create_index(self.values)
+
+    def test_tile_histograms(self):
+        window = get_tile_window(self.index, dict(GRID, south=0.0, east=90.0))
+        self.assertEqual(window, (0, 13, 0, 12))
+        tiles = np.zeros((13, 12), dtype=bool)
+        tiles[12, 11] = True
+        categories, counts = sum_tile_histograms(self.index, window, tiles)
+        # The last tile has 4 rows and 2 columns
+        tile = self.values[96:, 88:]
+        expected, expected_counts = np.unique(
+            tile[tile != NULL_CELL], return_counts=True
+        )
+        np.testing.assert_array_equal(categories, expected)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+        region, mask = get_tiles_region(self.index, window, tiles)
+        self.assertEqual(
+            (region["north"], region["west"], region["rows"], region["cols"]),
+            (4.0, 88.0, 4, 2),
+        )
+        self.assertTrue(mask.all())
+        self.assertEqual(
+            get_tiles_region(self.index, window, tiles & False), (None, None)
+        )
+
+    def test_inside_and_boundary_tiles(self):
+        feature_rings = [get_polygon_rings(POLYGON)]
+        zones = rasterize_features(feature_rings, GRID)
+        inside_values = self.values[(zones > 0) & (self.values != NULL_CELL)]
+        expected, expected_counts = np.unique(
+            inside_values, return_counts=True
+        )
+
+        window = get_tile_window(self.index, dict(GRID, south=0.0, east=90.0))
+        inside, boundary = classify_tiles(feature_rings, self.index, window)
+        self.assertFalse((inside & boundary).any())
+        self.assertTrue(inside.any())
+        # The tiles of the hole are outside
+        self.assertFalse(inside[7, 5] or boundary[7, 5])
+
+        categories_list = []
+        counts_list = []
+        categories, counts = sum_tile_histograms(self.index, window, inside)
+        categories_list.append(categories)
+        counts_list.append(counts)
+        # The boundary tiles are read with a single window
+        region, mask = get_tiles_region(self.index, window, boundary)
+        first_row = int(round(GRID["north"] - region["north"]))
+        first_col = int(round(region["west"] - GRID["west"]))
+        values = self.values[
+            first_row:first_row + region["rows"],
+            first_col:first_col + region["cols"],
+        ]
+        self.assertEqual(mask.shape, values.shape)
+        boundary_values = values[
+            mask & (rasterize_features(feature_rings, region) > 0)
+            & (values != NULL_CELL)
+        ]
+        categories, counts = np.unique(boundary_values, return_counts=True)
+        categories_list.append(categories)
+        counts_list.append(counts)
+
+        categories, counts = merge_histograms(categories_list, counts_list)
+        np.testing.assert_array_equal(categories, expected)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+    def test_read_tile_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = get_tile_index_path(
+                directory, "group", "nc", "PERMANENT", "map"
+            )
+            self.assertTrue(path.startswith(directory))
+            write_tile_index(path, self.index)
+            index = read_tile_index(path, GRID, 1.0)
+            np.testing.assert_array_equal(
+                index["counts"], self.index["counts"]
+            )
+            # Outdated raster data or a changed grid invalidate the index
+            self.assertIsNone(read_tile_index(path, GRID, 2.0))
+            self.assertIsNone(
+                read_tile_index(path, dict(GRID, rows=99), 1.0)
+            )
+            self.assertIsNone(
+                read_tile_index(os.path.join(directory, "x"), GRID, 1.0)
+            )
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from actinia_statistic_plugin.univar_methods import (
+    UNIVAR_METHODS,
+    parse_percentiles,
+    parse_t_rast_univar_values,
+    parse_univar_methods,
+    parse_univar_options,
+    plan_univar,
+)
+
+__license__ = "GPLv3"
+__author__ = "mundialis GmbH & Co. KG"
+__copyright__ = "Copyright 2026, mundialis GmbH & Co. KG"
+
+
+class UnivarMethodsTestCase(unittest.TestCase):
+    def test_parse_univar_methods(self):
+        self.assertEqual(parse_univar_methods(None), UNIVAR_METHODS)
+        self.assertEqual(
+            parse_univar_methods("sum, average,sum"), ["average", "sum"]
+        )
+        self.assertRaises(ValueError, parse_univar_methods, "")
+        self.assertRaises(ValueError, parse_univar_methods, "mode,sum")
+
+    def test_plan_univar(self):
+        self.assertEqual(plan_univar(["number", "average", "sum"]), "t")
+        self.assertEqual(plan_univar(["average", "median"]), "et")
+        self.assertEqual(plan_univar(UNIVAR_METHODS), "et")
+
+    def test_parse_percentiles(self):
+        self.assertEqual(parse_percentiles(None), [])
+        self.assertEqual(parse_percentiles("90,10,97.5"), [10.0, 90.0, 97.5])
+        self.assertRaises(ValueError, parse_percentiles, "101")
+        self.assertRaises(ValueError, parse_percentiles, "p90")
+
+    def test_parse_univar_options(self):
+        options = parse_univar_options(
+            {"approximate": "true", "percentiles": "90"}
+        )
+        self.assertEqual(options["methods"], UNIVAR_METHODS)
+        self.assertTrue(options["approximate"])
+        self.assertEqual(options["percentiles"], [90.0])
+        self.assertRaises(
+            ValueError, parse_univar_options, {"percentiles": "90"}
+        )
+
+    def test_parse_t_rast_univar_values(self):
+        values = {
+            "zone": "1",
+            "min": "2",
+            "max": "7.5",
+            "mean": "nan",
+            "non_null_cells": "4",
+        }
+        self.assertEqual(
+            parse_t_rast_univar_values(
+                values, ["number", "range", "average", "median"]
+            ),
+            {"raster_number": 4.0, "raster_range": 5.5},
+        )